@@ -1,10 +1,9 @@
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import SessionLocal, engine, get_read_db
 from app.models.user import User
 
 SECRET_KEY = "CHANGE_THIS_TO_A_REAL_SECRET"
@@ -14,7 +13,11 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+# python-jose (and the cryptography backend it loads) is imported on the
+# first token issued or checked, not at startup.
 def create_access_token(user: User):
+    from jose import jwt
+
     payload = {
         "sub": user.email,
         "role": user.role,
@@ -24,10 +27,9 @@ def create_access_token(user: User):
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-):
+def user_from_token(token: str, db: Session) -> User:
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email = payload.get("sub")
@@ -53,6 +55,23 @@ def get_current_user(
     return user
 
 
+# Same get_read_db session as the route's own (FastAPI resolves a dependency
+# once per request), so a replica-served read never also opens the primary.
+# Approval / deactivation reach the replica within its allowed lag.
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        return user_from_token(token, db)
+    except HTTPException as e:
+        if e.status_code != 401 or db.get_bind() is engine:
+            raise
+    # Signed up a moment ago: not replicated yet
+    with SessionLocal() as primary:
+        return user_from_token(token, primary)
+
+
 def require_admin(user: User = Depends(get_current_user)):
     if user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -1,9 +1,16 @@
-from passlib.context import CryptContext
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _pwd_context():
+    # passlib + argon2 load on the first login / signup, not at import
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["argon2"], deprecated="auto")
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 def hash_password(password: str):
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
\ No newline at end of file
+    return _pwd_context().verify(plain, hashed)
@@ -0,0 +1,103 @@
+# app/core/cache_policy.py
+"""
+Per-route HTTP cache headers for GET responses.
+
+Every API response is per user (bearer token), so policies are always
+`private`: browsers may cache, shared proxies may not.
+
+- Catalog lists change whenever an admin edits a product or component and
+  the admin pages re-read them right after saving, so they are never served
+  stale: `no-cache` plus an ETag, and an unchanged list comes back as an
+  empty 304 instead of the full body.
+- Reports are daily aggregates; a minute of staleness is fine and
+  stale-while-revalidate keeps dashboard navigation instant.
+
+Routes that set Cache-Control themselves (invoice PDFs) are left alone.
+"""
+import hashlib
+
+# (path prefix, Cache-Control, add ETag / answer If-None-Match); longest prefix wins
+CACHE_POLICIES = (
+    ("/products", "private, no-cache", True),
+    ("/components", "private, no-cache", True),
+    ("/admin/components", "private, no-cache", True),
+    ("/catalog/changes", "private, no-cache", True),
+    ("/billing/my-bills", "private, no-cache", True),
+    ("/admin/reports", "private, max-age=60, stale-while-revalidate=300", True),
+)
+
+
+def policy_for(path: str):
+    best = None
+    for prefix, cache_control, etag in CACHE_POLICIES:
+        if path.startswith(prefix) and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, cache_control, etag)
+    return best
+
+
+def _etag(body: bytes) -> bytes:
+    return b'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest().encode() + b'"'
+
+
+class CachePolicyMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+
+        policy = policy_for(scope["path"])
+        if policy is None:
+            return await self.app(scope, receive, send)
+        _, cache_control, use_etag = policy
+
+        if_none_match = None
+        for name, value in scope.get("headers", ()):
+            if name == b"if-none-match":
+                if_none_match = value
+                break
+
+        start_message = None
+        passthrough = False
+
+        async def send_with_policy(message):
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                names = {k for k, _ in headers}
+                if message["status"] != 200 or b"cache-control" in names:
+                    passthrough = True
+                    return await send(message)
+                headers.append((b"cache-control", cache_control.encode()))
+                message = {**message, "headers": headers}
+                if not use_etag or b"etag" in names:
+                    passthrough = True
+                    return await send(message)
+                start_message = message
+                return
+
+            if passthrough or start_message is None or message["type"] != "http.response.body":
+                return await send(message)
+
+            start, start_message = start_message, None
+            if message.get("more_body", False):
+                passthrough = True
+                await send(start)
+                return await send(message)
+
+            body = message.get("body", b"")
+            etag = _etag(body)
+            if if_none_match and etag in [t.strip() for t in if_none_match.split(b",")]:
+                headers = [
+                    (k, v) for k, v in start["headers"]
+                    if k not in (b"content-length", b"content-type")
+                ]
+                await send({**start, "status": 304, "headers": headers + [(b"etag", etag)]})
+                return await send({"type": "http.response.body", "body": b""})
+
+            await send({**start, "headers": start["headers"] + [(b"etag", etag)]})
+            await send(message)
+
+        await self.app(scope, receive, send_with_policy)
@@ -0,0 +1,157 @@
+# app/core/compression.py
+"""
+Response compression (gzip, plus brotli / zstd when those packages are
+installed).
+
+Catalog and admin list responses are large and repetitive JSON, so they
+compress 10-20x. Bodies under COMPRESS_MIN_BYTES are sent as they are:
+below roughly one packet the CPU time buys nothing.
+
+Skipped: responses that already carry a Content-Encoding, streams
+(text/event-stream – compressing would hold events back), and formats that
+are compressed already (PDF, zip, images).
+"""
+import gzip
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=settings.COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+_ENCODERS = {"gzip": _gzip}
+if brotli is not None:
+    # Quality 4-5 is the usual sweet spot for dynamic responses
+    _ENCODERS["br"] = lambda body: brotli.compress(body, quality=settings.COMPRESS_BROTLI_QUALITY)
+if zstandard is not None:
+    _ENCODERS["zstd"] = lambda body: zstandard.ZstdCompressor(level=settings.COMPRESS_ZSTD_LEVEL).compress(body)
+
+# Server preference when the client accepts several equally
+_PREFERENCE = ("br", "zstd", "gzip")
+
+_SKIP_TYPES = (
+    b"text/event-stream",
+    b"application/pdf",
+    b"application/zip",
+    b"image/",
+    b"video/",
+    b"audio/",
+)
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Best encoding we support from an Accept-Encoding header, honouring q=0."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name] = q
+
+    wildcard = accepted.get("*")
+    best, best_q = None, 0.0
+    for name in _PREFERENCE:
+        if name not in _ENCODERS:
+            continue
+        q = accepted.get(name, wildcard or 0.0)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressionMiddleware:
+    """Plain ASGI: buffers single-message bodies only; streams pass through."""
+
+    def __init__(self, app, minimum_size: int | None = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESS_MIN_BYTES if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = None
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                encoding = choose_encoding(value.decode("latin-1"))
+                break
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", ()))
+                content_type = headers.get(b"content-type", b"")
+                if b"content-encoding" in headers or content_type.startswith(_SKIP_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message  # held until we see the body
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                return await send(message)
+
+            body = message.get("body", b"")
+            if start_message is None:
+                return await send(message)
+            start, start_message = start_message, None
+
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streaming or small: send as is
+                passthrough = True
+                await send({**start, "headers": _vary(start.get("headers", []))})
+                return await send(message)
+
+            compressed = _ENCODERS[encoding](body)
+            headers = [
+                (k, v)
+                for k, v in start.get("headers", [])
+                if k not in (b"content-length", b"etag")
+            ]
+            # Strong validators must change with the encoding; weak ones may stay
+            etag = dict(start.get("headers", [])).get(b"etag")
+            if etag:
+                headers.append((b"etag", etag if etag.startswith(b"W/") else b"W/" + etag))
+            headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+            ]
+            await send({**start, "headers": _vary(headers)})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def _vary(headers):
+    headers = list(headers)
+    for i, (k, v) in enumerate(headers):
+        if k == b"vary":
+            if b"accept-encoding" not in v.lower():
+                headers[i] = (k, v + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
@@ -1,59 +1,85 @@
-import smtplib
+import logging
 import pathlib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from functools import lru_cache
+from typing import Iterable
 from app.core.config import settings
 from app.models.user import User
 
-# Path to templates folder
-TEMPLATE_PATH = pathlib.Path(__file__).parent / "email_templates"
+logger = logging.getLogger(__name__)
+
+# Path to templates folder (app/email_templates)
+TEMPLATE_PATH = pathlib.Path(__file__).parent.parent / "email_templates"
+
+@lru_cache(maxsize=None)
+def _load_template(name: str) -> str:
+    return (TEMPLATE_PATH / name).read_text(encoding="utf-8")
 
 def render_template(template_name: str, **kwargs) -> str:
     """Load HTML template and replace placeholders."""
-    base_html_path = TEMPLATE_PATH / "base.html"
-    template_path = TEMPLATE_PATH / template_name
-
-    base_html = base_html_path.read_text(encoding="utf-8")
-    html = template_path.read_text(encoding="utf-8")
+    base_html = _load_template("base.html")
+    html = _load_template(template_name)
 
     for key, value in kwargs.items():
         html = html.replace(f"{{{{{key}}}}}", str(value))
 
     return base_html.replace("{{content}}", html)
 
-def _send_email(to_email: str, subject: str, html: str) -> None:
-    """Send HTML email using SMTP or print when config missing."""
+def _send_emails(messages: list[tuple[str, str, str]]) -> int:
+    """
+    Send (to_email, subject, html) messages over a single SMTP session, or
+    only log them when config missing. Returns how many were sent.
+    """
+    if not messages:
+        return 0
+
     if not (settings.EMAIL_SENDER and settings.EMAIL_PASSWORD and settings.EMAIL_HOST):
-        print("\n📭 [EMAIL DRY RUN] (No SMTP Enabled)")
-        print("To:", to_email)
-        print("Subject:", subject)
-        print("HTML:\n", html)
-        print("📭 [/EMAIL DRY RUN]\n")
-        return
+        for to_email, subject, html in messages:
+            logger.info("email dry run (SMTP not configured)", extra={"to": to_email, "subject": subject})
+            # Bodies only at DEBUG – they are large
+            logger.debug("email body", extra={"to": to_email, "html": html})
+        return 0
 
-    msg = MIMEMultipart("alternative")
-    msg["From"] = settings.EMAIL_SENDER
-    msg["To"] = to_email
-    msg["Subject"] = subject
-    msg.attach(MIMEText(html, "html"))
+    # Only the process that actually sends mail pays for these imports
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
 
+    sent = 0
     try:
         server = smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT)
         if settings.EMAIL_USE_TLS:
             server.starttls()
         server.login(settings.EMAIL_SENDER, settings.EMAIL_PASSWORD)
-        server.sendmail(settings.EMAIL_SENDER, to_email, msg.as_string())
+
+        for to_email, subject, html in messages:
+            msg = MIMEMultipart("alternative")
+            msg["From"] = settings.EMAIL_SENDER
+            msg["To"] = to_email
+            msg["Subject"] = subject
+            msg.attach(MIMEText(html, "html"))
+            try:
+                server.sendmail(settings.EMAIL_SENDER, to_email, msg.as_string())
+                sent += 1
+            except smtplib.SMTPRecipientsRefused as e:
+                # One bad address must not stop the rest of the batch
+                logger.warning("email recipient refused", extra={"to": to_email, "error": str(e)})
+
         server.quit()
-        print(f"[EMAIL SENT] to {to_email}")
-    except Exception as e:
-        print("[EMAIL ERROR]", e)
-        print("Failed HTML:")
-        print(html)
+    except Exception:
+        logger.exception("email batch failed", extra={"sent": sent, "failed": len(messages) - sent})
+        return sent
+
+    logger.info("emails sent", extra={"sent": sent, "batch": len(messages)})
+    return sent
+
+def _send_email(to_email: str, subject: str, html: str) -> None:
+    """Send HTML email using SMTP or print when config missing."""
+    _send_emails([(to_email, subject, html)])
 
 def send_new_user_request_email(user: User) -> None:
     """Notify ADMIN — A new user has registered"""
     if not settings.ADMIN_EMAIL:
-        print("[SKIP] ADMIN_EMAIL not set")
+        logger.info("ADMIN_EMAIL not set, skipping signup notification")
         return
 
     html = render_template(
@@ -79,4 +105,18 @@ def send_user_approved_email(user: User) -> None:
     html = render_template("user_approved.html", name=user.first_name)
 
     _send_email(user.email,
-                "🎉 Your Account is Approved | BillSwift", html)
\ No newline at end of file
+                "🎉 Your Account is Approved | BillSwift", html)
+
+def send_user_approved_emails(users: Iterable[User]) -> int:
+    """
+    Notify many approved USERS over one SMTP session. Accepts anything with
+    `email` and `first_name` (e.g. rows from a bulk UPDATE ... RETURNING).
+    """
+    return _send_emails([
+        (
+            user.email,
+            "🎉 Your Account is Approved | BillSwift",
+            render_template("user_approved.html", name=user.first_name),
+        )
+        for user in users
+    ])
@@ -0,0 +1,286 @@
+# app/core/events.py
+"""
+In-process event bus for live admin updates.
+
+Routes publish small events after they commit:
+
+    event_bus.publish("bill.created", {...})
+
+and every connected /admin/events/stream client receives them. With more
+than one worker the events travel through a backend so every worker sees
+every event (EVENT_BACKEND):
+
+    local     single worker, no fan-out (default)
+    postgres  LISTEN/NOTIFY on the primary database
+    unix      one datagram socket per worker in EVENT_SOCKET_DIR
+              (local multi-worker runs and tests, no database needed)
+"""
+import asyncio
+import glob
+import logging
+import os
+import select
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+
+import orjson
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "billswift_events"
+# NOTIFY payloads are capped at 8000 bytes; events carry ids and list rows only
+MAX_PAYLOAD_BYTES = 7900
+
+
+class Subscription:
+    """One connected stream: a bounded queue on the stream's event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # Set when events were dropped; the client must refetch
+        self.overflowed = False
+
+    def _put(self, event: dict):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def deliver(self, event: dict):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # loop closed; the stream is gone
+
+
+# BACKENDS
+class LocalBackend:
+    def __init__(self, bus: "EventBus"):
+        self.bus = bus
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def send(self, payload: bytes):
+        self.bus.dispatch(payload)
+
+
+class PostgresBackend:
+    """NOTIFY on publish; one LISTEN connection per worker."""
+
+    def __init__(self, bus: "EventBus"):
+        from app.db.session import engine
+
+        self.bus = bus
+        self.engine = engine
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._listen, name="event-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def send(self, payload: bytes):
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHANNEL, "payload": payload.decode()},
+            )
+
+    def _listen(self):
+        backoff = 1
+        while not self._stop.is_set():
+            conn = None
+            try:
+                raw = self.engine.raw_connection()
+                raw.detach()  # held for the worker's lifetime, not the pool's
+                conn = raw.dbapi_connection
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {CHANNEL}")
+                backoff = 1
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.bus.dispatch(conn.notifies.pop(0).payload.encode())
+            except Exception:
+                logger.warning("event listener connection lost", exc_info=True)
+                # Anything published meanwhile is lost; tell clients to refetch
+                self.bus.resync()
+                failed = True
+            else:
+                failed = False
+            finally:
+                # Detached: the pool will never close it, so each reconnect
+                # (and shutdown) must, or the server keeps a backend per retry
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            if failed:
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+
+
+class UnixSocketBackend:
+    """
+    Every worker binds <dir>/<pid>.sock; publishing sends one datagram to
+    each socket in the directory, including our own.
+    """
+
+    def __init__(self, bus: "EventBus", directory: str):
+        self.bus = bus
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.sock")
+        self._sock: socket.socket | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.settimeout(1)
+        self._thread = threading.Thread(target=self._listen, name="event-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._sock:
+            self._sock.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def send(self, payload: bytes):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as out:
+            for peer in glob.glob(os.path.join(self.directory, "*.sock")):
+                try:
+                    out.sendto(payload, peer)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Worker exited without cleaning up
+                    try:
+                        os.unlink(peer)
+                    except FileNotFoundError:
+                        pass
+
+    def _listen(self):
+        while not self._stop.is_set():
+            try:
+                payload = self._sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.bus.dispatch(payload)
+
+
+# BUS
+class EventBus:
+    def __init__(self, queue_size: int = 100, history: int = 256):
+        self.queue_size = queue_size
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+        # Recent events for Last-Event-ID replay after a reconnect
+        self._history: deque[dict] = deque(maxlen=history)
+        self._backend = LocalBackend(self)
+        self._started = False
+
+    # LIFECYCLE
+    def start(self):
+        if self._started:
+            return
+        kind = settings.EVENT_BACKEND
+        if kind == "postgres":
+            self._backend = PostgresBackend(self)
+        elif kind == "unix":
+            self._backend = UnixSocketBackend(self, settings.EVENT_SOCKET_DIR)
+        elif kind != "local":
+            raise ValueError(f"Unknown EVENT_BACKEND: {kind}")
+        self._backend.start()
+        self._started = True
+
+    def stop(self):
+        if self._started:
+            self._backend.stop()
+            self._backend = LocalBackend(self)
+            self._started = False
+
+    # PUBLISH
+    def publish(self, type: str, data: dict) -> None:
+        """
+        Send an event to every worker. Call after the commit; failures are
+        logged, never raised into the request.
+        """
+        event = {"id": uuid.uuid4().hex, "type": type, "ts": time.time(), "data": data}
+        payload = dumps(event)
+        if len(payload) > MAX_PAYLOAD_BYTES:
+            payload = dumps({**event, "data": {"id": data.get("id")}, "truncated": True})
+        try:
+            self._backend.send(payload)
+        except Exception:
+            logger.warning("event publish failed", extra={"event": type}, exc_info=True)
+
+    # DELIVERY (called from listener threads or request threads)
+    def dispatch(self, payload: bytes) -> None:
+        event = orjson.loads(payload)
+        with self._lock:
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.deliver(event)
+
+    def resync(self) -> None:
+        with self._lock:
+            self._history.clear()
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.deliver({"id": uuid.uuid4().hex, "type": "resync", "ts": time.time(), "data": {}})
+
+    # SUBSCRIBE
+    def subscribe(self, last_event_id: str | None = None) -> tuple[Subscription, list[dict] | None]:
+        """
+        Register a stream on the running loop. Returns the subscription and
+        the events missed since `last_event_id`, or None when they are no
+        longer in history (the client must refetch).
+        """
+        sub = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.add(sub)
+            missed: list[dict] | None = []
+            if last_event_id:
+                ids = [e["id"] for e in self._history]
+                missed = list(self._history)[ids.index(last_event_id) + 1:] if last_event_id in ids else None
+        return sub, missed
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+event_bus = EventBus()
@@ -0,0 +1,35 @@
+# app/core/fields.py
+from typing import Iterable
+
+from fastapi import HTTPException, Query
+
+from app.db.types import as_units
+
+# Sparse fieldsets: list endpoints accept ?fields=id,name and then select and
+# return only those columns. Without the parameter they return everything.
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma separated list of fields to return, e.g. fields=id,name",
+)
+
+
+def parse_fields(fields: str | None, allowed: Iterable[str]) -> list[str]:
+    """Requested fields in declaration order; all of `allowed` when not given."""
+    allowed = list(allowed)
+    if not fields:
+        return allowed
+
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return [f for f in allowed if f in requested]
+
+
+def select_columns(columns: dict, fields: list[str]) -> list:
+    """Labelled column expressions for the requested fields (money in units)."""
+    return [as_units(columns[f]).label(f) for f in fields]
@@ -0,0 +1,33 @@
+# app/core/lazy.py
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy module that is imported on first attribute access:
+
+        np = LazyModule("numpy")
+
+    Keeps `import app.main` (worker boot, test collection) from paying for
+    modules that only some requests use. Thread-safe: sync routes run in a
+    thread pool and may touch it concurrently.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._module or self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
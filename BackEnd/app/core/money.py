@@ -0,0 +1,59 @@
+# app/core/money.py
+"""
+Money as integer minor units (paise / cents).
+
+Amounts are Numeric(12, 2) in the database and ints in Python
+(app.db.types.Cents), so billing arithmetic is plain int addition and
+multiplication: exact, and no Decimal objects per line. Conversion only
+happens at the edges:
+
+    to_cents(value)     request input in currency units -> int cents
+    from_cents(cents)   int cents -> float units for JSON responses
+"""
+import math
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+# Numeric(12, 2): anything at or above 10**10 units does not fit the column
+MAX_CENTS = 10**12 - 1
+
+
+def to_cents(value) -> int:
+    """
+    Currency units (int, float, str or Decimal) to cents, rounding half up.
+    Anything else, NaN / Infinity and amounts too large for the columns
+    raise ValueError, which request validation reports as a 422.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float, str, Decimal)):
+        raise ValueError(f"not a money amount: {value!r}")
+    if isinstance(value, int):
+        cents = value * 100
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"not a money amount: {value!r}")
+        # Any float written with at most two decimals lands within a hair of
+        # an integer number of cents; only longer inputs need Decimal rounding
+        scaled = value * 100
+        cents = round(scaled)
+        if abs(scaled - cents) >= 1e-6:
+            cents = _decimal_cents(repr(value))
+    else:
+        cents = _decimal_cents(value)
+    if abs(cents) > MAX_CENTS:
+        raise ValueError(f"money amount out of range: {value!r}")
+    return int(cents)
+
+
+def _decimal_cents(value) -> int:
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"not a money amount: {value!r}") from None
+    # Also rules out exponents so large that scaling them would not finish
+    if not number.is_finite() or number.adjusted() > 12:
+        raise ValueError(f"not a money amount: {value!r}")
+    return int(number.scaleb(2).to_integral_value(ROUND_HALF_UP))
+
+
+def from_cents(cents) -> float:
+    # Correctly rounded division: 1234 -> 12.34 exactly as printed
+    return int(cents) / 100
@@ -0,0 +1,41 @@
+# app/core/responses.py
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any):
+    """orjson fallback for types it does not handle natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """JSON-encode the way API responses are encoded."""
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class for the API.
+
+    orjson serializes datetimes, dates and numpy arrays natively and Decimal
+    money values through _default, so routes can hand over ORM values
+    without converting each one in Python first.
+
+    List endpoints return this class directly with plain dicts, which skips
+    FastAPI's response_model revalidation and jsonable_encoder pass; the
+    response_model then only documents the shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
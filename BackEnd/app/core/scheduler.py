@@ -0,0 +1,369 @@
+# app/core/scheduler.py
+"""
+In-process scheduler for periodic maintenance.
+
+Jobs are registered before start() (see app/services/maintenance.py):
+
+    scheduler.add_job("catalog.prune_tombstones", prune_tombstones, cron="15 3 * * *")
+    scheduler.add_job("pricing.warm_matrix", warm_price_matrix, every=30, leader=False)
+
+Every worker runs the scheduler. A `leader` job (the default) only runs on
+the worker that takes its row in scheduler_locks: the lease is taken with
+a conditional UPDATE and lasts until the job's next due time, so among
+many workers the first one to reach a slot runs it and the others skip
+it. While the job runs the lease is also kept SCHEDULER_LEASE_SECONDS
+ahead of now and renewed, so a run longer than its interval is not
+started again elsewhere; when it ends the lease is cut back to the next
+due time. If that worker dies the lease simply runs out. Jobs with
+leader=False run on every worker (per-process caches).
+
+Cron expressions are the usual five fields, minute hour day month weekday,
+in UTC, with *, */n, a-b, a-b/n and lists. When both day and weekday are
+restricted either may match, as in cron.
+
+One thread waits for the next due job and hands it to a small thread pool,
+where the lease is taken (the loop thread never touches the database);
+a job still running on this worker is not started again. stop() waits up
+to SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS for running jobs to finish.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# CRON
+_CRON_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+
+def _cron_field(expr: str, low: int, high: int) -> frozenset[int]:
+    values = set()
+    for part in expr.split(","):
+        rng, _, step = part.partition("/")
+        if rng == "*":
+            start, end = low, high
+        elif "-" in rng:
+            start, end = (int(v) for v in rng.split("-", 1))
+        else:
+            start = int(rng)
+            end = high if step else start
+        if not (low <= start <= end <= high):
+            raise ValueError(f"cron field out of range: {part!r}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return frozenset(values)
+
+
+class Cron:
+    """Five-field cron schedule; next_after() gives the next match in UTC."""
+
+    def __init__(self, expr: str):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron needs 5 fields: {expr!r}")
+        self.expr = expr
+        # Weekday 7 is Sunday too
+        fields[4] = fields[4].replace("7", "0")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _cron_field(f, low, high) for f, (low, high) in zip(fields, _CRON_RANGES)
+        )
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day = dt.day in self.days
+        weekday = (dt.weekday() + 1) % 7 in self.weekdays  # cron: 0 = Sunday
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, dt: datetime) -> datetime:
+        dt = dt.astimezone(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months or not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"cron never matches: {self.expr!r}")
+
+
+# JOBS
+class Job:
+    def __init__(self, name: str, func, every: float | None, cron: str | None, leader: bool):
+        if (every is None) == (cron is None):
+            raise ValueError("a job needs exactly one of every= or cron=")
+        self.name = name
+        self.func = func
+        self.every = every
+        self.cron = Cron(cron) if cron else None
+        self.leader = leader
+
+        self.next_run: datetime | None = None
+        self.running = False
+        # Metrics
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms: float | None = None
+        self.last_started_at: datetime | None = None
+        self.last_error: str | None = None
+
+    @property
+    def schedule(self) -> str:
+        return self.cron.expr if self.cron else f"every {self.every:g}s"
+
+    def next_after(self, dt: datetime) -> datetime:
+        if self.cron:
+            return self.cron.next_after(dt)
+        return dt + timedelta(seconds=self.every)
+
+    def metrics(self) -> dict:
+        return {
+            "name": self.name,
+            "schedule": self.schedule,
+            "leader": self.leader,
+            "running": self.running,
+            "next_run_at": self.next_run,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_started_at": self.last_started_at,
+            "last_duration_ms": None if self.last_ms is None else round(self.last_ms, 1),
+            "avg_duration_ms": round(self.total_ms / self.runs, 1) if self.runs else None,
+            "max_duration_ms": round(self.max_ms, 1),
+            "last_error": self.last_error,
+        }
+
+
+# LEADER LOCK
+class LeaseLock:
+    """
+    One scheduler_locks row per leader job, leased until its next due time
+    or while the owner runs it, whichever is later.
+    """
+
+    def __init__(self, owner: str):
+        self.owner = owner
+
+    def ensure(self, names: list[str]) -> None:
+        from app.db.session import engine
+        from app.models.scheduler import SchedulerLock
+
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        for name in names:
+            try:
+                with engine.begin() as conn:
+                    exists = conn.execute(
+                        select(SchedulerLock.name).where(SchedulerLock.name == name)
+                    ).first()
+                    if not exists:
+                        conn.execute(insert(SchedulerLock).values(name=name, owner="", locked_until=epoch))
+            except IntegrityError:
+                pass  # another worker inserted it first
+
+    def acquire(self, name: str, now: datetime, until: datetime) -> bool:
+        from app.db.session import engine
+        from app.models.scheduler import SchedulerLock
+
+        with engine.begin() as conn:
+            result = conn.execute(
+                update(SchedulerLock)
+                .where(
+                    SchedulerLock.name == name,
+                    (SchedulerLock.locked_until <= now) | (SchedulerLock.owner == self.owner),
+                )
+                .values(owner=self.owner, locked_until=until, acquired_at=now)
+            )
+        return result.rowcount == 1
+
+    def renew(self, name: str, until: datetime) -> bool:
+        """Move this owner's lease to `until`; False if it is no longer ours."""
+        from app.db.session import engine
+        from app.models.scheduler import SchedulerLock
+
+        with engine.begin() as conn:
+            result = conn.execute(
+                update(SchedulerLock)
+                .where(SchedulerLock.name == name, SchedulerLock.owner == self.owner)
+                .values(locked_until=until)
+            )
+        return result.rowcount == 1
+
+
+# SCHEDULER
+def _owner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class Scheduler:
+    def __init__(self):
+        self.owner = _owner_id()
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pool: ThreadPoolExecutor | None = None
+        self._leases = LeaseLock(self.owner)
+
+    def add_job(self, name: str, func, every: float | None = None, cron: str | None = None,
+                leader: bool = True) -> Job:
+        """Register (or, for a name already known, replace) a job."""
+        job = Job(name, func, every, cron, leader)
+        self._jobs[name] = job
+        return job
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    # LIFECYCLE
+    def start(self):
+        if self._thread is not None:
+            return
+        # A forked worker must not share the parent's lease identity
+        self.owner = self._leases.owner = _owner_id()
+        self._leases.ensure([j.name for j in self._jobs.values() if j.leader])
+
+        now = datetime.now(timezone.utc)
+        for job in self._jobs.values():
+            job.next_run = job.next_after(now)
+
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(max_workers=settings.SCHEDULER_WORKERS, thread_name_prefix="job")
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+        logger.info("scheduler started", extra={"owner": self.owner, "jobs": len(self._jobs)})
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+        # Let running jobs finish, up to the timeout; queued ones are dropped
+        deadline = time.monotonic() + settings.SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        while any(j.running for j in self._jobs.values()) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        still_running = [j.name for j in self._jobs.values() if j.running]
+        if still_running:
+            logger.warning("scheduler stopped with jobs still running", extra={"jobs": still_running})
+        self._pool = None
+
+    # LOOP
+    def _loop(self):
+        while not self._stop.is_set():
+            now = datetime.now(timezone.utc)
+            due = [j for j in self._jobs.values() if j.next_run <= now]
+            for job in due:
+                job.next_run = job.next_after(now)
+                self._dispatch(job, now)
+
+            upcoming = min((j.next_run for j in self._jobs.values()), default=None)
+            timeout = 60 if upcoming is None else (upcoming - datetime.now(timezone.utc)).total_seconds()
+            self._wake.wait(max(timeout, 0.05))
+            self._wake.clear()
+
+    def _dispatch(self, job: Job, now: datetime):
+        with self._lock:
+            if job.running:
+                job.skipped += 1
+                return
+            job.running = True
+        try:
+            future = self._pool.submit(self._run, job, now, job.next_run)
+            future.add_done_callback(lambda f, job=job: self._release_cancelled(job, f))
+        except Exception:
+            job.running = False
+            logger.warning("job dispatch failed", extra={"job": job.name}, exc_info=True)
+
+    @staticmethod
+    def _release_cancelled(job: Job, future):
+        # Queued jobs dropped by stop() never reach _run to clear the flag
+        if future.cancelled():
+            job.running = False
+
+    def _lease_until(self, slot_end: datetime) -> datetime:
+        return max(slot_end, datetime.now(timezone.utc) + timedelta(seconds=settings.SCHEDULER_LEASE_SECONDS))
+
+    def _take_lease(self, job: Job, now: datetime, slot_end: datetime) -> bool:
+        try:
+            if self._leases.acquire(job.name, now, self._lease_until(slot_end)):
+                return True
+        except Exception:
+            logger.warning("job lease failed", extra={"job": job.name}, exc_info=True)
+        job.skipped += 1
+        job.running = False
+        return False
+
+    def _keep_lease(self, job: Job, slot_end: datetime, done: threading.Event):
+        while not done.wait(settings.SCHEDULER_LEASE_SECONDS / 3):
+            try:
+                if not self._leases.renew(job.name, self._lease_until(slot_end)):
+                    logger.warning("job lease lost while running", extra={"job": job.name})
+                    return
+            except Exception:
+                logger.warning("job lease renewal failed", extra={"job": job.name}, exc_info=True)
+
+    def _drop_lease(self, job: Job, slot_end: datetime):
+        # Back to the slot's end: this slot stays taken, the next one is free
+        try:
+            self._leases.renew(job.name, slot_end)
+        except Exception:
+            logger.warning("job lease release failed", extra={"job": job.name}, exc_info=True)
+
+    def _run(self, job: Job, now: datetime, slot_end: datetime):
+        if job.leader:
+            if not self._take_lease(job, now, slot_end):
+                return
+            done = threading.Event()
+            threading.Thread(
+                target=self._keep_lease, args=(job, slot_end, done), name=f"lease:{job.name}", daemon=True
+            ).start()
+        job.last_started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        try:
+            job.func()
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_error = f"{type(e).__name__}: {e}"
+            logger.exception("job failed", extra={"job": job.name})
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            job.runs += 1
+            job.last_ms = elapsed
+            job.total_ms += elapsed
+            job.max_ms = max(job.max_ms, elapsed)
+            if job.leader:
+                done.set()
+                self._drop_lease(job, slot_end)
+            job.running = False
+            logger.info("job finished", extra={"job": job.name, "duration_ms": round(elapsed, 1)})
+
+    # INTROSPECTION
+    def jobs(self) -> list[dict]:
+        return [job.metrics() for job in self._jobs.values()]
+
+
+scheduler = Scheduler()
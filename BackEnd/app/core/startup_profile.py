@@ -0,0 +1,129 @@
+# app/core/startup_profile.py
+"""
+Cold-start profile of the API: where `import app.main` spends its time and
+how long the startup hooks take.
+
+    python -m app.core.startup_profile [--runs 5] [--top 20] [--budget-ms N] [--no-startup]
+
+Every measurement runs in a fresh interpreter, so nothing is already
+imported. Exits with status 1 when the median `import app.main` time is
+over the budget (STARTUP_IMPORT_BUDGET_MS, or --budget-ms). The same
+check runs in the test suite (tests/test_startup.py).
+
+Startup hooks need the database (schema version check), so run it with
+the same DATABASE_URL as the API, or pass --no-startup.
+"""
+import argparse
+import os
+import pathlib
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from app.core.config import settings
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+_IMPORT_WALL = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - t)"
+)
+
+_STARTUP = """
+import asyncio, time
+from app.main import app
+
+async def main():
+    t = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        print(time.perf_counter() - t)
+
+asyncio.run(main())
+"""
+
+# import time:  self [us] | cumulative | imported package (indented by depth)
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    # Quiet logging: startup log lines share stdout with the timings
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+
+
+def import_wall_ms(runs: int) -> list[float]:
+    """Wall time of `import app.main`, one fresh interpreter per run."""
+    samples = []
+    for _ in range(runs):
+        proc = _python("-c", _IMPORT_WALL)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        samples.append(float(proc.stdout.strip().splitlines()[-1]) * 1000)
+    return samples
+
+
+def import_tree() -> list[tuple[str, int, float, float]]:
+    """(module, depth, self ms, cumulative ms) from `python -X importtime`."""
+    proc = _python("-X", "importtime", "-c", "import app.main")
+    modules = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, len(indent) // 2, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return modules
+
+
+def startup_ms() -> float:
+    """Time from lifespan start to the app accepting requests."""
+    proc = _python("-c", _STARTUP)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return float(proc.stdout.strip().splitlines()[-1]) * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="API cold-start profile")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=settings.STARTUP_IMPORT_BUDGET_MS)
+    parser.add_argument("--no-startup", action="store_true", help="skip the startup hooks")
+    args = parser.parse_args(argv)
+
+    modules = import_tree()
+
+    print(f"--- slowest modules (self time, of {len(modules)} imported) ---")
+    for name, _, self_ms, cumulative_ms in sorted(modules, key=lambda m: -m[2])[: args.top]:
+        print(f"{self_ms:9.1f} ms  {cumulative_ms:9.1f} ms cumulative  {name}")
+
+    print("--- by top-level package (self time) ---")
+    packages = defaultdict(float)
+    for name, _, self_ms, _ in modules:
+        packages[name.split(".")[0] if not name.startswith("app.") else ".".join(name.split(".")[:2])] += self_ms
+    for package, ms in sorted(packages.items(), key=lambda p: -p[1])[: args.top]:
+        print(f"{ms:9.1f} ms  {package}")
+
+    if not args.no_startup:
+        try:
+            print(f"--- startup hooks: {startup_ms():.1f} ms ---")
+        except RuntimeError as e:
+            print(f"--- startup hooks failed: {e} ---")
+
+    samples = import_wall_ms(args.runs)
+    median = statistics.median(samples)
+    print(
+        f"--- import app.main: median {median:.0f} ms over {args.runs} runs "
+        f"(min {min(samples):.0f}, max {max(samples):.0f}), budget {args.budget_ms:.0f} ms ---"
+    )
+    if median > args.budget_ms:
+        print("FAIL: import time over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
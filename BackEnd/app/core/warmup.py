@@ -0,0 +1,222 @@
+# app/core/warmup.py
+"""
+Warm-up after startup, so the first real requests do not pay for it.
+
+Started from the app lifespan in a background thread; /ready answers 503
+until every step has run once (GET /health stays a plain liveness check).
+
+    mappers     configure_mappers() – otherwise the first query does it
+    imports     python-jose and passlib/argon2 (a throwaway hash sets up the
+                argon2 parameters)
+    pool        WARMUP_CONNECTIONS connections opened on the primary and the
+                read engine, checked out together so they are distinct
+    statements  the hot route queries run once against empty results, which
+                fills SQLAlchemy's compiled-statement cache (a route that
+                fails is reported under `warnings`, not retried)
+    caches      the price matrix (catalog pricing, loads numpy)
+
+A failed step (e.g. the database is not reachable yet) is logged and the
+whole warm-up retried after WARMUP_RETRY_SECONDS.
+"""
+import inspect
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from types import SimpleNamespace
+
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Stands in for the current user: id 0 owns no bills; a plain user, so the
+# routes take their most common path
+_NOBODY = SimpleNamespace(id=0, role="user", email="warmup@invalid")
+
+
+# STEPS
+def _mappers():
+    from sqlalchemy.orm import configure_mappers
+
+    import app.models  # noqa: F401
+
+    configure_mappers()
+
+
+def _imports():
+    import jose.jwt  # noqa: F401
+
+    from app.auth.security import hash_password
+
+    hash_password("warm-up")
+
+
+def _pool():
+    from app.db.session import engine, read_engine
+
+    engines = [engine] if read_engine is engine else [engine, read_engine]
+    for eng in engines:
+        with ExitStack() as stack:
+            for _ in range(settings.WARMUP_CONNECTIONS):
+                conn = stack.enter_context(eng.connect())
+                conn.execute(text("SELECT 1"))
+
+
+def _route_kwargs(route, db, **given) -> dict:
+    """
+    Arguments FastAPI would pass to `route` for a request without query
+    parameters, read from its signature (so they follow route changes):
+    sessions for get_db / get_read_db, _NOBODY for the user dependency,
+    Query defaults for the rest. `given` fills required parameters.
+    """
+    from fastapi.params import Depends as DependsParam
+    from pydantic.fields import FieldInfo
+
+    from app.db.session import get_db, get_read_db
+
+    kwargs = {}
+    for name, param in inspect.signature(route).parameters.items():
+        default = param.default
+        if name in given:
+            kwargs[name] = given[name]
+        elif isinstance(default, DependsParam):
+            kwargs[name] = db if default.dependency in (get_db, get_read_db) else _NOBODY
+        elif isinstance(default, FieldInfo):
+            if default.is_required():
+                raise TypeError(f"{route.__name__}() needs a value for {name!r}")
+            kwargs[name] = default.get_default(call_default_factory=True)
+        elif default is not inspect.Parameter.empty:
+            kwargs[name] = default
+    return kwargs
+
+
+def _statements() -> list[str]:
+    """
+    Runs the hot read routes once. A route that fails here (say its
+    signature changed in a way _route_kwargs cannot fill) is logged and
+    reported, but does not hold up readiness: it only stays cold.
+    """
+    from app.auth.jwt_handler import create_access_token, user_from_token
+    from app.db.session import ReadSessionLocal, SessionLocal
+    from app.routers import bill, catalog, component, product
+
+    # Auth runs on every request: token decode + user lookup (primary)
+    with SessionLocal() as db:
+        try:
+            user_from_token(create_access_token(_NOBODY), db)
+        except HTTPException:
+            pass  # no such user, as intended
+
+    routes = (
+        (product.list_products, {}),
+        (product.nearest_product, {"kw": 0}),
+        (component.list_components_user, {}),
+        (bill.get_my_bills, {}),
+        (catalog.get_catalog_changes, {"since": 2**62}),
+    )
+    failed = []
+    with ReadSessionLocal() as db:
+        for route, given in routes:
+            try:
+                route(**_route_kwargs(route, db, **given))
+            except HTTPException:
+                pass  # e.g. 404 on an empty catalog; the statements ran
+            except Exception:
+                db.rollback()
+                failed.append(route.__name__)
+                logger.warning("warm-up route failed", extra={"route": route.__name__}, exc_info=True)
+    return failed
+
+
+def _caches():
+    from app.db.session import ReadSessionLocal
+    from app.services.pricing import warm_price_matrix
+
+    with ReadSessionLocal() as db:
+        warm_price_matrix(db)
+
+
+_STEPS = (
+    ("mappers", _mappers),
+    ("imports", _imports),
+    ("pool", _pool),
+    ("statements", _statements),
+    ("caches", _caches),
+)
+
+
+# STATE
+class Warmup:
+    def __init__(self):
+        self.status = "pending"  # pending | running | ready | failed
+        self.steps_ms: dict[str, float] = {}
+        self.error: str | None = None
+        # Steps that finished with parts that did not warm up, e.g. a route
+        self.warnings: dict[str, list[str]] = {}
+        self.attempts = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def start(self):
+        if self._thread is not None:
+            return
+        if not settings.WARMUP_ENABLED:
+            self.status = "ready"
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.attempts += 1
+            self.status = "running"
+            started = time.perf_counter()
+            try:
+                for name, step in _STEPS:
+                    t = time.perf_counter()
+                    skipped = step()
+                    self.steps_ms[name] = round((time.perf_counter() - t) * 1000, 1)
+                    if skipped:
+                        self.warnings[name] = skipped
+            except Exception as e:
+                self.status = "failed"
+                self.error = f"{name}: {type(e).__name__}: {e}"
+                logger.warning("warm-up failed, retrying", extra={"step": name, "attempt": self.attempts},
+                               exc_info=True)
+                self._stop.wait(settings.WARMUP_RETRY_SECONDS)
+                continue
+
+            self.error = None
+            self.status = "ready"
+            logger.info(
+                "warm-up finished",
+                extra={"ms": round((time.perf_counter() - started) * 1000, 1), "steps": self.steps_ms},
+            )
+            return
+
+    def state(self) -> dict:
+        return {
+            "ready": self.ready,
+            "status": self.status,
+            "attempts": self.attempts,
+            "steps_ms": self.steps_ms,
+            "warnings": self.warnings,
+            "error": self.error,
+        }
+
+
+warmup = Warmup()
@@ -0,0 +1,302 @@
+# app/db/index_audit.py
+"""
+Index audit: compares the indexes we have with the ones our queries need.
+
+1. Record the SQL a run actually issues (e.g. a local session or test run):
+
+       INDEX_AUDIT_LOG=queries.log python -m uvicorn app.main:app
+
+   Every distinct statement is appended once to the log file.
+
+2. Audit:
+
+       python -m app.db.index_audit --queries queries.log
+       python -m app.db.index_audit --queries queries.log --live --write-migration
+
+   Reports foreign keys without a supporting index, indexes made redundant
+   by the primary key or a longer index, and (from the log) filter / sort
+   patterns that no index serves. --write-migration emits the next
+   app/db/migrations module with the suggested changes.
+"""
+import argparse
+import pathlib
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from sqlalchemy import MetaData, event
+from sqlalchemy.engine import Engine
+
+
+# QUERY RECORDER
+def install_query_recorder(engine: Engine, path: str) -> None:
+    seen: set[str] = set()
+    lock = threading.Lock()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        sql = " ".join(statement.split())
+        if sql in seen:
+            return
+        with lock:
+            if sql in seen:
+                return
+            seen.add(sql)
+            with open(path, "a", encoding="utf-8") as fh:
+                fh.write(sql + "\n")
+
+
+# QUERY PATTERNS
+_FROM_RE = re.compile(r"\bFROM\s+(\w+)(?:\s+AS\s+(\w+))?", re.I)
+_JOIN_RE = re.compile(r"\bJOIN\s+(\w+)(?:\s+AS\s+(\w+))?", re.I)
+_WHERE_RE = re.compile(r"\bWHERE\b(.*?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|\bRETURNING\b|$)", re.I)
+_ORDER_RE = re.compile(r"\bORDER BY\b(.*?)(?:\bLIMIT\b|\bOFFSET\b|\bFOR UPDATE\b|$)", re.I)
+_EQ_RE = re.compile(r"(\w+)\.(\w+)\s*(?:=|\bIN\b|\bIS\b)", re.I)
+_RANGE_RE = re.compile(r"(\w+)\.(\w+)\s*(?:<=|>=|<|>|\bBETWEEN\b|\bLIKE\b)", re.I)
+# Skips columns wrapped in a function call, e.g. ORDER BY sum(t.amount)
+_ORDER_COL_RE = re.compile(r"(?<![\w(])(\w+)\.(\w+)(\s+DESC)?", re.I)
+
+
+@dataclass(frozen=True)
+class QueryPattern:
+    table: str
+    equality: tuple[str, ...]
+    range_or_sort: tuple[str, ...]
+
+    @property
+    def wanted_columns(self) -> tuple[str, ...]:
+        """Equality columns first, then the first range / sort column –
+        an index cannot use anything after a range."""
+        rest = [c for c in self.range_or_sort if c.split()[0] not in self.equality]
+        return self.equality + tuple(rest[:1])
+
+
+def parse_queries(lines: list[str]) -> list[QueryPattern]:
+    """Crude SELECT/UPDATE/DELETE parser – good enough for SQLAlchemy's output."""
+    patterns = set()
+    for sql in lines:
+        if not sql.upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            continue
+
+        aliases = {}
+        for m in list(_FROM_RE.finditer(sql)) + list(_JOIN_RE.finditer(sql)):
+            aliases[m.group(2) or m.group(1)] = m.group(1)
+
+        where = _WHERE_RE.search(sql)
+        where_sql = where.group(1) if where else ""
+        order = _ORDER_RE.search(sql)
+        order_sql = order.group(1) if order else ""
+
+        eq = defaultdict(list)
+        rng = defaultdict(list)
+        for t, c in _EQ_RE.findall(where_sql):
+            if c not in eq[aliases.get(t, t)]:
+                eq[aliases.get(t, t)].append(c)
+        for t, c in _RANGE_RE.findall(where_sql):
+            rng[aliases.get(t, t)].append(c)
+        for t, c, desc in _ORDER_COL_RE.findall(order_sql):
+            rng[aliases.get(t, t)].append(f"{c} DESC" if desc else c)
+
+        for table in set(eq) | set(rng):
+            patterns.add(
+                QueryPattern(
+                    table=table,
+                    equality=tuple(eq.get(table, ())),
+                    range_or_sort=tuple(dict.fromkeys(rng.get(table, ()))),
+                )
+            )
+    return sorted(patterns, key=lambda p: (p.table, p.wanted_columns))
+
+
+# AUDIT
+@dataclass
+class AuditReport:
+    missing: list[tuple[str, tuple[str, ...], str]] = field(default_factory=list)  # table, cols, reason
+    redundant: list[tuple[str, str, str]] = field(default_factory=list)  # table, index, reason
+
+    def add_missing(self, table, cols, reason):
+        if all((t, c) != (table, cols) for t, c, _ in self.missing):
+            self.missing.append((table, cols, reason))
+
+
+def _bare(col: str) -> str:
+    return col.split()[0]
+
+
+def _index_where(idx) -> str | None:
+    """
+    The WHERE predicate of a partial index (postgresql_where / sqlite_where,
+    also as reflected), normalized for comparison; None for a full index.
+    """
+    for dialect in ("postgresql", "sqlite"):
+        where = idx.dialect_options[dialect].get("where") if dialect in idx.dialect_options else None
+        if where is not None:
+            sql = str(where.compile(compile_kwargs={"literal_binds": True})) if hasattr(where, "compile") else str(where)
+            # Reflected predicates are bare and parenthesized differently
+            sql = re.sub(r"\b\w+\.(\w+)", r"\1", sql)
+            return " ".join(sql.replace("(", " ").replace(")", " ").lower().split())
+    return None
+
+
+def _table_indexes(table) -> list[tuple[str, tuple[str, ...], bool, str | None]]:
+    """(name, columns, unique, partial-index predicate) for every index-like structure on the table."""
+    result = []
+    pk = tuple(c.name for c in table.primary_key.columns)
+    if pk:
+        result.append(("PRIMARY KEY", pk, True, None))
+    for idx in table.indexes:
+        cols = []
+        for expr in idx.expressions:
+            name = getattr(expr, "name", None) or str(expr)
+            cols.append(_bare(name.split(".")[-1]))
+        result.append((idx.name, tuple(cols), bool(idx.unique), _index_where(idx)))
+    for cons in table.constraints:
+        if cons.__class__.__name__ == "UniqueConstraint":
+            result.append((cons.name or "unique", tuple(c.name for c in cons.columns), True, None))
+    return result
+
+
+def _covered(existing, cols: tuple[str, ...]) -> bool:
+    """
+    True when an existing full index starts with exactly these columns. A
+    partial index only serves queries that repeat its predicate, so it
+    never counts.
+    """
+    want = tuple(_bare(c) for c in cols)
+    return any(idx_cols[: len(want)] == want for _, idx_cols, _, where in existing if where is None)
+
+
+def _composite_name(table: str, cols: tuple[str, ...]) -> str:
+    return f"ix_{table}_" + "_".join(_bare(c) for c in cols)
+
+
+def audit(metadata: MetaData, patterns: list[QueryPattern] | None = None) -> AuditReport:
+    report = AuditReport()
+
+    for table in metadata.sorted_tables:
+        existing = _table_indexes(table)
+        pk_cols = tuple(c.name for c in table.primary_key.columns)
+
+        # Redundant: duplicates the PK, or a strict prefix of a longer index
+        # with the same predicate. Partial and full indexes never cover each
+        # other: a partial index holds only some rows, and a full one is what
+        # serves queries that do not repeat the predicate.
+        for name, cols, unique, where in existing:
+            if name == "PRIMARY KEY" or name is None:
+                continue
+            if where is None and cols == pk_cols[: len(cols)]:
+                report.redundant.append((table.name, name, f"covered by primary key {pk_cols}"))
+                continue
+            if unique:
+                continue
+            for other_name, other_cols, _, other_where in existing:
+                if (
+                    other_name != name
+                    and other_where == where
+                    and len(other_cols) > len(cols)
+                    and other_cols[: len(cols)] == cols
+                ):
+                    report.redundant.append((table.name, name, f"prefix of {other_name} {other_cols}"))
+                    break
+
+        # Missing: foreign keys without a leading index (joins, ON DELETE checks)
+        for fk in table.foreign_keys:
+            col = (fk.parent.name,)
+            if not _covered(existing, col):
+                report.add_missing(table.name, col, f"foreign key → {fk.target_fullname}")
+
+    # Missing: recorded filter + sort patterns with no matching index
+    tables = {t.name: t for t in metadata.sorted_tables}
+    for p in patterns or []:
+        table = tables.get(p.table)
+        if table is None or not p.wanted_columns:
+            continue
+        cols = p.wanted_columns
+        if _covered(_table_indexes(table), cols):
+            continue
+        # An equality-only lookup on the PK is already served
+        pk_cols = tuple(c.name for c in table.primary_key.columns)
+        if tuple(_bare(c) for c in cols)[: len(pk_cols)] == pk_cols:
+            continue
+        report.add_missing(p.table, cols, "query pattern")
+
+    # A composite suggestion makes a single-column suggestion on its prefix redundant
+    composite = [(t, c) for t, c, _ in report.missing if len(c) > 1]
+    report.missing = [
+        (t, c, r)
+        for t, c, r in report.missing
+        if not any(t == ct and len(cc) > len(c) and tuple(map(_bare, cc[: len(c)])) == tuple(map(_bare, c)) for ct, cc in composite)
+    ]
+    return report
+
+
+def format_report(report: AuditReport) -> str:
+    lines = ["--- Missing indexes ---"]
+    for table, cols, reason in report.missing:
+        lines.append(f"  {table} ({', '.join(cols)})  [{reason}]")
+    if not report.missing:
+        lines.append("  none")
+    lines.append("--- Redundant indexes ---")
+    for table, name, reason in report.redundant:
+        lines.append(f"  {table}.{name}  [{reason}]")
+    if not report.redundant:
+        lines.append("  none")
+    return "\n".join(lines)
+
+
+def render_migration(report: AuditReport, version: int) -> str:
+    creates = "\n".join(
+        f'    ops.create_index(conn, "{_composite_name(t, c)}", "{t}", {list(c)!r})'
+        for t, c, _ in report.missing
+    )
+    drops = "\n".join(f'    ops.drop_index(conn, "{name}")' for _, name, _ in report.redundant)
+    body = "\n".join(x for x in (creates, drops) if x) or "    pass"
+    return f'''# Generated by app.db.index_audit – review before committing.
+from app.db.migrations import ops
+
+VERSION = {version}
+NAME = "index audit"
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+{body}
+'''
+
+
+def main(argv: list[str] | None = None) -> None:
+    from app.db.base import Base
+    from app.db.migrations import load_migrations
+    import app.models  # noqa: F401 – register every table
+
+    parser = argparse.ArgumentParser(description="Index audit")
+    parser.add_argument("--queries", help="query log written via INDEX_AUDIT_LOG")
+    parser.add_argument("--live", action="store_true", help="audit the database instead of the models")
+    parser.add_argument("--write-migration", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.live:
+        from app.db.session import engine
+
+        metadata = MetaData()
+        metadata.reflect(bind=engine)
+    else:
+        metadata = Base.metadata
+
+    patterns = []
+    if args.queries:
+        patterns = parse_queries(pathlib.Path(args.queries).read_text(encoding="utf-8").splitlines())
+
+    report = audit(metadata, patterns)
+    print(format_report(report))
+
+    if args.write_migration and (report.missing or report.redundant):
+        version = load_migrations()[-1].VERSION + 1
+        path = pathlib.Path(__file__).parent / "migrations" / f"m{version:04d}_index_audit.py"
+        path.write_text(render_migration(report, version), encoding="utf-8")
+        print(f"--- Wrote {path} ---")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# app/db/migrate.py
+"""
+Versioned schema migrations.
+
+    python -m app.db.migrate            # apply all pending migrations
+    python -m app.db.migrate --status   # show current / head version
+    python -m app.db.migrate --target 3 # stop after version 3
+
+App startup only calls verify_schema_version(), a single-row lookup, so
+workers never race each other creating tables or the default admin.
+"""
+import argparse
+import logging
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.db.migrations import load_migrations
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key so concurrent `migrate` runs on Postgres queue up instead of
+# applying the same step twice.
+MIGRATION_LOCK_KEY = 7_271_026
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def head_version() -> int:
+    migrations = load_migrations()
+    return migrations[-1].VERSION if migrations else 0
+
+
+def current_version(conn: Connection) -> int:
+    try:
+        version = conn.execute(select(func.max(schema_migrations.c.version))).scalar()
+    except DBAPIError:
+        # schema_migrations does not exist yet → nothing applied
+        conn.rollback()
+        return 0
+    return version or 0
+
+
+def _apply(engine: Engine, migration) -> None:
+    if migration.TRANSACTIONAL:
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(
+                insert(schema_migrations).values(
+                    version=migration.VERSION, name=migration.NAME
+                )
+            )
+        return
+
+    # Steps like CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    # They must be written to be re-runnable (IF NOT EXISTS) because a crash
+    # between upgrade() and the bookkeeping insert leaves them half-recorded.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        migration.upgrade(conn)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(schema_migrations).values(
+                version=migration.VERSION, name=migration.NAME
+            )
+        )
+
+
+def migrate(engine: Engine, target: int | None = None) -> list[int]:
+    """Apply pending migrations up to `target` (default: head). Returns versions applied."""
+    schema_migrations.create(bind=engine, checkfirst=True)
+
+    applied = []
+    with engine.connect() as lock_conn:
+        if lock_conn.dialect.name == "postgresql":
+            lock_conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": MIGRATION_LOCK_KEY})
+            lock_conn.commit()
+
+        try:
+            with engine.connect() as conn:
+                version = current_version(conn)
+
+            for migration in load_migrations():
+                if migration.VERSION <= version:
+                    continue
+                if target is not None and migration.VERSION > target:
+                    break
+
+                logger.info("Applying migration %04d: %s", migration.VERSION, migration.NAME)
+                _apply(engine, migration)
+                applied.append(migration.VERSION)
+        finally:
+            if lock_conn.dialect.name == "postgresql":
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": MIGRATION_LOCK_KEY})
+                lock_conn.commit()
+
+    return applied
+
+
+def verify_schema_version(engine: Engine) -> int:
+    """Fail fast when the database is behind the code. Used at app startup."""
+    with engine.connect() as conn:
+        version = current_version(conn)
+
+    head = head_version()
+    if version < head:
+        raise SchemaVersionError(
+            f"Database schema is at version {version}, code expects {head}. "
+            "Run `python migrate_db.py` before starting the API."
+        )
+    return version
+
+
+def main(argv: list[str] | None = None) -> None:
+    from app.db.session import engine
+    from app.db.seed import create_default_admin
+
+    parser = argparse.ArgumentParser(description="BillSwift schema migrations")
+    parser.add_argument("--target", type=int, default=None, help="stop after this version")
+    parser.add_argument("--status", action="store_true", help="print versions and exit")
+    parser.add_argument("--no-seed", action="store_true", help="skip default admin creation")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.status:
+        with engine.connect() as conn:
+            print(f"current: {current_version(conn)}  head: {head_version()}")
+        return
+
+    applied = migrate(engine, target=args.target)
+    if applied:
+        print(f"--- Applied migrations: {', '.join(str(v) for v in applied)} ---")
+    else:
+        print("--- Database already up to date ---")
+
+    if not args.no_seed:
+        create_default_admin()
+
+
+if __name__ == "__main__":
+    main()
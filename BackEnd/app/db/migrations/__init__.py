@@ -0,0 +1,28 @@
+# app/db/migrations/__init__.py
+import importlib
+import pkgutil
+from types import ModuleType
+
+# Each migration is a module named mNNNN_<slug>.py exposing:
+#   VERSION: int          – strictly increasing
+#   NAME: str             – human readable summary
+#   TRANSACTIONAL: bool   – False for steps that must run outside a
+#                           transaction (e.g. CREATE INDEX CONCURRENTLY)
+#   upgrade(conn)         – applies the change on the given connection
+
+
+def load_migrations() -> list[ModuleType]:
+    """Import every migration module in this package, ordered by VERSION."""
+    modules = []
+    for info in pkgutil.iter_modules(__path__):
+        if not info.name.startswith("m"):
+            continue
+        modules.append(importlib.import_module(f"{__name__}.{info.name}"))
+
+    modules.sort(key=lambda m: m.VERSION)
+
+    versions = [m.VERSION for m in modules]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+
+    return modules
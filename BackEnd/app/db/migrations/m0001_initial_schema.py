@@ -0,0 +1,122 @@
+# app/db/migrations/m0001_initial_schema.py
+"""
+Baseline schema, frozen as it was when create_all() ran at startup.
+
+Tables are declared on a private MetaData (not app.models) so later model
+changes never leak back into this step. checkfirst=True lets databases that
+were created by the old startup hook adopt the migration history as-is.
+"""
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
+
+from app.db.migrations import ops
+
+VERSION = 1
+NAME = "initial schema"
+TRANSACTIONAL = True
+
+metadata = MetaData()
+
+Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("first_name", String(100), nullable=False),
+    Column("last_name", String(100), nullable=False),
+    Column("email", String(255), unique=True, index=True, nullable=False),
+    Column("password_hash", String(255), nullable=False),
+    Column("employee_code", String(50), unique=True, index=True, nullable=False),
+    Column("team", String(100), nullable=True),
+    Column("role", String(20), nullable=False),
+    Column("is_approved", Boolean, nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "components",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(150), nullable=False),
+    Column("brand_name", String(150), nullable=False),
+    Column("model", String(150), nullable=True),
+    Column("base_unit_price", Numeric(12, 2), nullable=False),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    UniqueConstraint("name", "brand_name", "model", name="uq_component_identity"),
+)
+
+Table(
+    "products",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("starter_type", String(50), nullable=False, index=True),
+    Column("rating_kw", Numeric(10, 2), nullable=False, index=True),
+    Column("base_price", Numeric(12, 2), nullable=False),
+    Column("total_price", Numeric(12, 2), nullable=False),
+    Column("device_name", String(150), nullable=True, index=True),
+    Column("brand_name", String(150), nullable=True, index=True),
+    Column("model", String(150), nullable=True, index=True),
+    Column("price", Numeric(12, 2), nullable=True),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "product_components",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("product_id", Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False),
+    Column("component_id", Integer, ForeignKey("components.id", ondelete="RESTRICT"), nullable=False),
+    Column("quantity", Integer, nullable=False),
+    Column("unit_price_override", Numeric(12, 2), nullable=True),
+)
+
+Table(
+    "bills",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("bill_number", String(100), unique=True, index=True, nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("subtotal_amount", Numeric(12, 2), nullable=False),
+    Column("discount_amount", Numeric(12, 2), nullable=False),
+    Column("total_amount", Numeric(12, 2), nullable=False),
+    Column("notes", Text, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "bill_items",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("bill_id", Integer, ForeignKey("bills.id", ondelete="CASCADE"), nullable=False),
+    Column("product_id", Integer, ForeignKey("products.id", ondelete="RESTRICT"), nullable=False),
+    Column("quantity", Integer, nullable=False),
+    Column("unit_price", Numeric(12, 2), nullable=False),
+    Column("line_total", Numeric(12, 2), nullable=False),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(bind=conn, checkfirst=True)
+
+    # Databases created before approvals existed (see the old migrate_db.py)
+    # lack is_approved; anyone already active was approved back then.
+    if not ops.has_column(conn, "users", "is_approved"):
+        ops.add_column(conn, "users", "is_approved", "BOOLEAN DEFAULT false NOT NULL")
+        conn.execute(text("UPDATE users SET is_approved = true WHERE is_active = true"))
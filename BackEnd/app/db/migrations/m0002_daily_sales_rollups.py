@@ -0,0 +1,40 @@
+# app/db/migrations/m0002_daily_sales_rollups.py
+"""
+Daily sales rollup tables. Run `python -m app.services.rollups backfill`
+afterwards to populate them from existing bills.
+"""
+from sqlalchemy import Column, Date, Index, Integer, MetaData, Numeric, String, Table
+
+VERSION = 2
+NAME = "daily sales rollups"
+TRANSACTIONAL = True
+
+metadata = MetaData()
+
+Table(
+    "daily_user_sales",
+    metadata,
+    Column("day", Date, primary_key=True),
+    Column("user_id", Integer, primary_key=True),
+    Column("team", String(100), nullable=True),
+    Column("bills_count", Integer, nullable=False),
+    Column("subtotal_amount", Numeric(14, 2), nullable=False),
+    Column("discount_amount", Numeric(14, 2), nullable=False),
+    Column("total_amount", Numeric(14, 2), nullable=False),
+    Index("ix_daily_user_sales_user_day", "user_id", "day"),
+    Index("ix_daily_user_sales_team_day", "team", "day"),
+)
+
+Table(
+    "daily_product_sales",
+    metadata,
+    Column("day", Date, primary_key=True),
+    Column("product_id", Integer, primary_key=True),
+    Column("units", Integer, nullable=False),
+    Column("revenue", Numeric(14, 2), nullable=False),
+    Index("ix_daily_product_sales_product_day", "product_id", "day"),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(bind=conn, checkfirst=True)
@@ -0,0 +1,12 @@
+# app/db/migrations/m0003_where_used_indexes.py
+"""Indexes behind the where-used lookups and EXISTS delete guards."""
+from app.db.migrations import ops
+
+VERSION = 3
+NAME = "where-used indexes"
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    ops.create_index(conn, "ix_product_components_component_id", "product_components", ["component_id"])
+    ops.create_index(conn, "ix_bill_items_product_id", "bill_items", ["product_id"])
@@ -0,0 +1,36 @@
+# app/db/migrations/m0004_index_audit.py
+"""
+First index audit (python -m app.db.index_audit):
+
+- foreign keys / hot filters without an index: bills.user_id (plus the
+  created_at sort of my-bills), bill_items.bill_id, product_components.product_id
+- redundant single-column indexes on primary keys
+"""
+from app.db.migrations import ops
+
+VERSION = 4
+NAME = "index audit: foreign keys and redundant id indexes"
+TRANSACTIONAL = False
+
+REDUNDANT = [
+    "ix_users_id",
+    "ix_components_id",
+    "ix_products_id",
+    "ix_product_components_id",
+    "ix_bills_id",
+    "ix_bill_items_id",
+]
+
+
+def upgrade(conn):
+    ops.create_index(conn, "ix_bills_user_id_created_at", "bills", ["user_id", "created_at DESC"])
+    ops.create_index(conn, "ix_bill_items_bill_id", "bill_items", ["bill_id"])
+    ops.create_index(
+        conn,
+        "ix_product_components_product_id_component_id",
+        "product_components",
+        ["product_id", "component_id"],
+    )
+
+    for name in REDUNDANT:
+        ops.drop_index(conn, name)
@@ -0,0 +1,17 @@
+# app/db/migrations/m0005_catalog_filter_index.py
+"""Partial index for filtered catalog queries and the nearest-rating lookup."""
+from app.db.migrations import ops
+
+VERSION = 5
+NAME = "catalog filter index"
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    ops.create_index(
+        conn,
+        "ix_products_active_starter_rating",
+        "products",
+        ["starter_type", "rating_kw"],
+        where="is_active = true",
+    )
@@ -0,0 +1,65 @@
+# app/db/migrations/m0006_catalog_change_tracking.py
+"""
+Row versions + tombstones for catalog delta sync.
+
+Existing rows start at version 1 so a client syncing from since=0 gets the
+whole catalog.
+"""
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    text,
+)
+
+from app.db.migrations import ops
+
+VERSION = 6
+NAME = "catalog change tracking"
+TRANSACTIONAL = True
+
+metadata = MetaData()
+
+Table(
+    "catalog_version",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("value", BigInteger, nullable=False),
+    Column("pruned_through", BigInteger, nullable=False),
+)
+
+Table(
+    "catalog_tombstones",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("entity", String(20), nullable=False),
+    Column("entity_id", Integer, nullable=False),
+    Column("row_version", BigInteger, nullable=False, index=True),
+    Column("deleted_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(bind=conn, checkfirst=True)
+
+    ops.add_column(conn, "products", "row_version", "BIGINT NOT NULL DEFAULT 1")
+    ops.add_column(conn, "components", "row_version", "BIGINT NOT NULL DEFAULT 1")
+    # SQLite cannot ADD COLUMN with a non-constant default; backfill instead.
+    # Same declared type as DateTime(timezone=True) creates on each dialect
+    ops.add_column(conn, "components", "updated_at", "TIMESTAMPTZ" if ops.is_postgres(conn) else "DATETIME")
+    conn.execute(text("UPDATE components SET updated_at = created_at WHERE updated_at IS NULL"))
+
+    ops.create_index(conn, "ix_products_row_version", "products", ["row_version"])
+    ops.create_index(conn, "ix_components_row_version", "components", ["row_version"])
+
+    conn.execute(
+        text(
+            "INSERT INTO catalog_version (id, value, pruned_through) "
+            "SELECT 1, 1, 0 WHERE NOT EXISTS (SELECT 1 FROM catalog_version WHERE id = 1)"
+        )
+    )
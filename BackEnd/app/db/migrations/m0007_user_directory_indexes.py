@@ -0,0 +1,24 @@
+# app/db/migrations/m0007_user_directory_indexes.py
+"""Indexes for the paginated, searchable admin user directory."""
+from app.db.migrations import ops
+
+VERSION = 7
+NAME = "user directory indexes"
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    ops.create_index(
+        conn,
+        "ix_users_pending",
+        "users",
+        ["id"],
+        where="is_approved = false AND role = 'user'",
+    )
+    ops.create_index(conn, "ix_users_team_id", "users", ["team", "id"])
+
+    # Prefix search runs lower(col) LIKE 'abc%'; Postgres needs
+    # text_pattern_ops for that unless the database collation is C
+    pattern_ops = " text_pattern_ops" if ops.is_postgres(conn) else ""
+    for col in ("first_name", "last_name", "email", "employee_code"):
+        ops.create_index(conn, f"ix_users_lower_{col}", "users", [f"lower({col}){pattern_ops}"])
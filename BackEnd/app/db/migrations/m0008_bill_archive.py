@@ -0,0 +1,75 @@
+# app/db/migrations/m0008_bill_archive.py
+"""
+Archive tables for bills of closed years (see app/services/archive.py).
+
+On Postgres they are partitioned by range on the bill date; the archival
+job creates one partition per year before moving it.
+"""
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    Text,
+    func,
+)
+
+from app.db.migrations import ops
+
+VERSION = 8
+NAME = "bill archive"
+TRANSACTIONAL = True
+
+metadata = MetaData()
+
+Table(
+    "bills_archive",
+    metadata,
+    Column("created_at", DateTime(timezone=True), primary_key=True),
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("bill_number", String(100), nullable=False),
+    Column("user_id", Integer, nullable=False),
+    Column("subtotal_amount", Numeric(12, 2), nullable=False),
+    Column("discount_amount", Numeric(12, 2), nullable=False),
+    Column("total_amount", Numeric(12, 2), nullable=False),
+    Column("notes", Text, nullable=True),
+    Column("archived_at", DateTime(timezone=True), server_default=func.now()),
+    Index("ix_bills_archive_id", "id"),
+    Index("ix_bills_archive_bill_number", "bill_number"),
+    Index("ix_bills_archive_user_id_created_at", "user_id", "created_at"),
+    postgresql_partition_by="RANGE (created_at)",
+)
+
+Table(
+    "bill_items_archive",
+    metadata,
+    Column("bill_created_at", DateTime(timezone=True), primary_key=True),
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("bill_id", Integer, nullable=False),
+    Column("product_id", Integer, nullable=False),
+    Column("quantity", Integer, nullable=False),
+    Column("unit_price", Numeric(12, 2), nullable=False),
+    Column("line_total", Numeric(12, 2), nullable=False),
+    Index("ix_bill_items_archive_bill_id", "bill_id"),
+    Index("ix_bill_items_archive_product_id", "product_id"),
+    postgresql_partition_by="RANGE (bill_created_at)",
+)
+
+Table(
+    "bill_archive_years",
+    metadata,
+    Column("year", Integer, primary_key=True, autoincrement=False),
+    Column("status", String(20), nullable=False),
+    Column("bills_count", Integer, nullable=False),
+    Column("items_count", Integer, nullable=False),
+    Column("archived_at", DateTime(timezone=True), nullable=True),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(bind=conn, checkfirst=True)
+    ops.create_index(conn, "ix_bills_created_at", "bills", ["created_at"])
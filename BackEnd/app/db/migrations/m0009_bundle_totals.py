@@ -0,0 +1,28 @@
+# app/db/migrations/m0009_bundle_totals.py
+"""
+Backfill products.base_price / total_price.
+
+The columns existed but were never written; bundle edits now keep them up
+to date (app.services.pricing.refresh_bundle_totals), this fills in the
+rows created before that.
+"""
+from sqlalchemy import text
+
+VERSION = 9
+NAME = "bundle totals"
+TRANSACTIONAL = True
+
+_LINES_TOTAL = """
+    COALESCE((
+        SELECT SUM(pc.quantity * COALESCE(pc.unit_price_override, c.base_unit_price))
+        FROM product_components pc
+        JOIN components c ON c.id = pc.component_id
+        WHERE pc.product_id = products.id
+    ), 0)
+"""
+
+
+def upgrade(conn):
+    conn.execute(text(
+        f"UPDATE products SET base_price = {_LINES_TOTAL}, total_price = {_LINES_TOTAL}"
+    ))
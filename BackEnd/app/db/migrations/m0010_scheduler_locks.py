@@ -0,0 +1,22 @@
+# app/db/migrations/m0010_scheduler_locks.py
+"""Leader leases for the in-process job scheduler (app/core/scheduler.py)."""
+from sqlalchemy import Column, DateTime, MetaData, String, Table
+
+VERSION = 10
+NAME = "scheduler locks"
+TRANSACTIONAL = True
+
+metadata = MetaData()
+
+Table(
+    "scheduler_locks",
+    metadata,
+    Column("name", String(100), primary_key=True),
+    Column("owner", String(200), nullable=False),
+    Column("locked_until", DateTime(timezone=True), nullable=False),
+    Column("acquired_at", DateTime(timezone=True), nullable=True),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(bind=conn, checkfirst=True)
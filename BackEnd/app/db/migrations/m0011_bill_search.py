@@ -0,0 +1,54 @@
+# app/db/migrations/m0011_bill_search.py
+"""
+Indexes for the admin bill search (GET /admin/billing/search).
+
+- bill_number prefix: text_pattern_ops on Postgres, so LIKE 'BS-2025-%'
+  can use it under any collation. SQLite searches with GLOB, which uses
+  the existing unique index.
+- amount ranges: (total_amount, id)
+- notes full text: a GIN index on to_tsvector('simple', notes) on Postgres;
+  on SQLite an external-content FTS5 table kept in sync by triggers.
+
+User email / employee code prefixes use the m0007 user indexes.
+"""
+from sqlalchemy import text
+
+from app.db.migrations import ops
+
+VERSION = 11
+NAME = "bill search"
+TRANSACTIONAL = False
+
+_SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS bills_notes_fts "
+    "USING fts5(notes, content='bills', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS bills_notes_fts_ai AFTER INSERT ON bills BEGIN "
+    "INSERT INTO bills_notes_fts(rowid, notes) VALUES (new.id, new.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS bills_notes_fts_ad AFTER DELETE ON bills BEGIN "
+    "INSERT INTO bills_notes_fts(bills_notes_fts, rowid, notes) VALUES ('delete', old.id, old.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS bills_notes_fts_au AFTER UPDATE OF notes ON bills BEGIN "
+    "INSERT INTO bills_notes_fts(bills_notes_fts, rowid, notes) VALUES ('delete', old.id, old.notes); "
+    "INSERT INTO bills_notes_fts(rowid, notes) VALUES (new.id, new.notes); END",
+    # Index the bills that already exist
+    "INSERT INTO bills_notes_fts(bills_notes_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade(conn):
+    ops.create_index(conn, "ix_bills_total_amount_id", "bills", ["total_amount", "id"])
+
+    if ops.is_postgres(conn):
+        ops.create_index(
+            conn, "ix_bills_bill_number_pattern", "bills", ["bill_number text_pattern_ops"]
+        )
+        # Must match the expression in app.routers.admin_bill._notes_match
+        ops.create_index(
+            conn,
+            "ix_bills_notes_fts",
+            "bills",
+            ["to_tsvector('simple', coalesce(notes, ''))"],
+            using="gin",
+        )
+    elif ops.is_sqlite(conn):
+        for statement in _SQLITE_FTS:
+            conn.execute(text(statement))
@@ -0,0 +1,73 @@
+# app/db/migrations/m0012_sqlite_bill_id_autoincrement.py
+"""
+Never hand out a bill / bill item id twice on SQLite.
+
+Archived rows keep their ids (bills_archive, bill_items_archive), so an id
+must stay unique across the hot and archive tables. Postgres sequences
+never go back; SQLite's default rowid is max(id) + 1, which reuses the ids
+of archived or deleted rows once the newest rows are gone. AUTOINCREMENT
+keeps the high-water mark in sqlite_sequence instead.
+
+SQLite cannot add AUTOINCREMENT to an existing table, so the table is
+rebuilt (create, copy, drop, rename) with its indexes and triggers, and
+the counter starts above every id in either table. Postgres: no-op.
+"""
+import re
+
+from sqlalchemy import text
+
+from app.db.migrations import ops
+
+VERSION = 12
+NAME = "sqlite bill id autoincrement"
+TRANSACTIONAL = True
+
+_TABLES = (("bills", "bills_archive"), ("bill_items", "bill_items_archive"))
+
+
+def _with_autoincrement(ddl: str, table: str, rebuild: str) -> str:
+    # As m0001 created them: "id INTEGER NOT NULL, ... PRIMARY KEY (id), ..."
+    ddl, named = re.subn(rf"^CREATE TABLE \"?{table}\"? \(", f"CREATE TABLE {rebuild} (", ddl)
+    ddl, inline = re.subn(r"\bid INTEGER NOT NULL,", "id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,", ddl)
+    ddl, dropped = re.subn(r"\s*PRIMARY KEY \(id\),", "", ddl)
+    if (named, inline, dropped) != (1, 1, 1):
+        raise RuntimeError(f"unexpected schema of {table}, rebuild it by hand: {ddl}")
+    return ddl
+
+
+def _rebuild(conn, table: str, archive: str) -> None:
+    ddl = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :t"), {"t": table}
+    ).scalar()
+    if "AUTOINCREMENT" in ddl.upper():
+        return
+    dependents = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE tbl_name = :t AND type IN ('index', 'trigger') AND sql IS NOT NULL"),
+        {"t": table},
+    ).scalars().all()
+
+    rebuild = f"{table}_rebuild"
+    conn.execute(text(f"DROP TABLE IF EXISTS {rebuild}"))
+    conn.execute(text(_with_autoincrement(ddl, table, rebuild)))
+    conn.execute(text(f"INSERT INTO {rebuild} SELECT * FROM {table}"))
+    conn.execute(text(f"DROP TABLE {table}"))
+    conn.execute(text(f"ALTER TABLE {rebuild} RENAME TO {table}"))
+    for statement in dependents:
+        conn.execute(text(statement))
+
+    high = conn.execute(
+        text(f"SELECT max(id) FROM (SELECT max(id) AS id FROM {table} UNION ALL SELECT max(id) FROM {archive})")
+    ).scalar()
+    conn.execute(text("DELETE FROM sqlite_sequence WHERE name = :t"), {"t": table})
+    if high is not None:
+        conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES (:t, :seq)"), {"t": table, "seq": high})
+
+
+def upgrade(conn):
+    if not ops.is_sqlite(conn):
+        return
+    # With enforcement on, DROP TABLE bills would cascade into bill_items
+    if conn.execute(text("PRAGMA foreign_keys")).scalar():
+        raise RuntimeError("run this migration with PRAGMA foreign_keys=OFF")
+    for table, archive in _TABLES:
+        _rebuild(conn, table, archive)
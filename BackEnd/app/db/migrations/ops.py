@@ -0,0 +1,69 @@
+# app/db/migrations/ops.py
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+
+def is_postgres(conn: Connection) -> bool:
+    return conn.dialect.name == "postgresql"
+
+
+def is_sqlite(conn: Connection) -> bool:
+    return conn.dialect.name == "sqlite"
+
+
+def _autocommit(conn: Connection) -> bool:
+    return conn.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+
+
+def has_table(conn: Connection, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def add_column(conn: Connection, table: str, column: str, ddl: str) -> None:
+    """ALTER TABLE ... ADD COLUMN, skipped when the column already exists."""
+    if has_column(conn, table, column):
+        return
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def create_index(
+    conn: Connection,
+    name: str,
+    table: str,
+    columns: list[str],
+    unique: bool = False,
+    where: str | None = None,
+    using: str | None = None,
+) -> None:
+    """
+    Create an index if it does not exist yet.
+
+    On Postgres the index is built CONCURRENTLY when the migration runs
+    outside a transaction (TRANSACTIONAL = False), so big tables stay
+    writable while it builds.
+    """
+    concurrently = is_postgres(conn) and _autocommit(conn)
+
+    sql = "CREATE {unique}INDEX {concurrently}IF NOT EXISTS {name} ON {table} {using}({cols})".format(
+        unique="UNIQUE " if unique else "",
+        concurrently="CONCURRENTLY " if concurrently else "",
+        name=name,
+        table=table,
+        using=f"USING {using} " if using else "",
+        cols=", ".join(columns),
+    )
+    if where:
+        sql += f" WHERE {where}"
+
+    conn.execute(text(sql))
+
+
+def drop_index(conn: Connection, name: str) -> None:
+    concurrently = is_postgres(conn) and _autocommit(conn)
+    conn.execute(
+        text(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {name}")
+    )
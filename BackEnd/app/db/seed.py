@@ -0,0 +1,38 @@
+# app/db/seed.py
+import logging
+
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.auth.security import hash_password
+
+logger = logging.getLogger(__name__)
+
+
+# CREATE DEFAULT ADMIN
+def create_default_admin():
+    db = SessionLocal()
+    try:
+        existing_admin = db.query(User).filter(User.role == "admin").first()
+        if existing_admin:
+            logger.info("Admin already exists")
+            return
+
+        admin = User(
+            first_name="Admin",
+            last_name="User",
+            email="admin@billswift.com",
+            password_hash=hash_password("admin123"),
+            employee_code="ADMIN001",
+            team="Management",
+            role="admin",
+            is_approved=True,
+            is_active=True,
+        )
+        db.add(admin)
+        db.commit()
+        logger.info("🔥 Default Admin Created: admin@billswift.com | admin123")
+
+    except Exception:
+        logger.exception("Admin creation failed")
+    finally:
+        db.close()
@@ -1,14 +1,39 @@
-from sqlalchemy import create_engine
+import math
+import threading
+import time
+
+from fastapi import Request
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from app.db.base import Base
 
+
+def _make_engine(url: str, connect_timeout: float | None = None):
+    # check_same_thread only exists for SQLite
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    if connect_timeout is not None and url.startswith("postgres"):
+        connect_args["connect_timeout"] = max(1, math.ceil(connect_timeout))
+    return create_engine(url, connect_args=connect_args)
+
+
 # For PostgreSQL – no echo in production
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}
+engine = _make_engine(settings.DATABASE_URL)
+
+# Read replica – falls back to the primary engine when not configured.
+# For local testing point READ_DATABASE_URL at a second SQLite file or
+# Postgres instance.
+read_engine = (
+    _make_engine(settings.READ_DATABASE_URL, settings.READ_REPLICA_CONNECT_TIMEOUT_SECONDS)
+    if settings.READ_DATABASE_URL
+    else engine
 )
 
+if settings.INDEX_AUDIT_LOG:
+    from app.db.index_audit import install_query_recorder
+
+    install_query_recorder(engine, settings.INDEX_AUDIT_LOG)
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -16,6 +41,13 @@ SessionLocal = sessionmaker(
     future=True
 )
 
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+    future=True
+)
+
 def get_db():
     """
     Dependency for FastAPI routes.
@@ -25,4 +57,127 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# READ-YOUR-WRITES STICKINESS
+# Carried by the client, so it holds whichever worker serves the next read:
+# after a write the response brings the write time (epoch seconds) back as
+# the X-Read-After header and a cookie of the same name. A request sending
+# either one reads from the primary until READ_STICKY_SECONDS after it, so
+# the client never sees its own bill missing.
+READ_AFTER_HEADER = "X-Read-After"
+READ_AFTER_COOKIE = "read_after"
+
+
+def mark_recent_write(request: Request) -> None:
+    """Call after committing a write the same client will read back."""
+    if read_engine is engine:
+        return
+    request.state.read_after = time.time()
+
+
+def _is_sticky(request: Request) -> bool:
+    value = request.headers.get(READ_AFTER_HEADER) or request.cookies.get(READ_AFTER_COOKIE)
+    if not value:
+        return False
+    try:
+        written_at = float(value)
+    except ValueError:
+        return False
+    now = time.time()
+    # Allows for some clock skew between workers, but no pinning to the
+    # primary with a time far in the future
+    return now - settings.READ_STICKY_SECONDS < written_at < now + settings.READ_STICKY_SECONDS
+
+
+class ReadAfterMiddleware:
+    """Sends mark_recent_write()'s time back to the client (header + cookie)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or read_engine is engine:
+            return await self.app(scope, receive, send)
+
+        async def send_with_read_after(message):
+            written_at = scope.get("state", {}).get("read_after")
+            if message["type"] == "http.response.start" and written_at is not None:
+                value = f"{written_at:.3f}"
+                cookie = (
+                    f"{READ_AFTER_COOKIE}={value}; Max-Age={math.ceil(settings.READ_STICKY_SECONDS)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [
+                    *message.get("headers", ()),
+                    (READ_AFTER_HEADER.lower().encode(), value.encode()),
+                    (b"set-cookie", cookie.encode()),
+                ]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_read_after)
+
+
+# REPLICA LAG
+_LAG_CHECK_INTERVAL = 1.0
+_lag_state = {"checked_at": 0.0, "lag": 0.0}
+_lag_lock = threading.Lock()
+
+
+def replica_lag_seconds() -> float:
+    """
+    Replication lag of the read replica, cached for _LAG_CHECK_INTERVAL.
+    An unreachable replica counts as infinitely behind.
+
+    One request at a time refreshes it; the others never wait for that
+    check (or a replica connect timing out) and use the last value.
+    """
+    if read_engine is engine or read_engine.dialect.name != "postgresql":
+        return 0.0
+
+    if time.monotonic() - _lag_state["checked_at"] < _LAG_CHECK_INTERVAL:
+        return _lag_state["lag"]
+    if not _lag_lock.acquire(blocking=False):
+        return _lag_state["lag"]
+    try:
+        if time.monotonic() - _lag_state["checked_at"] < _LAG_CHECK_INTERVAL:
+            return _lag_state["lag"]
+        try:
+            with read_engine.connect() as conn:
+                # A caught-up but idle replica has an old replay timestamp,
+                # so compare LSNs first.
+                lag = conn.execute(
+                    text(
+                        "SELECT CASE "
+                        "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                        "END"
+                    )
+                ).scalar()
+            lag = float(lag or 0)
+        except Exception:
+            lag = float("inf")
+
+        _lag_state.update(checked_at=time.monotonic(), lag=lag)
+        return lag
+    finally:
+        _lag_lock.release()
+
+
+def get_read_db(request: Request):
+    """
+    Dependency for read-only routes.
+    Uses the replica unless this client wrote recently or the replica lags.
+    """
+    use_primary = (
+        read_engine is engine
+        or _is_sticky(request)
+        or replica_lag_seconds() > settings.READ_REPLICA_MAX_LAG_SECONDS
+    )
+
+    db = SessionLocal() if use_primary else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,47 @@
+# app/db/types.py
+import operator
+from decimal import Decimal
+
+from sqlalchemy import Float, Numeric, cast
+from sqlalchemy.types import TypeDecorator
+
+
+class Cents(TypeDecorator):
+    """
+    Exact Numeric(precision, 2) column that Python code reads and writes as
+    int cents (app/core/money.py). Values are scaled by 100 on the way in
+    and out; nothing is stored differently.
+    """
+
+    impl = Numeric
+    cache_ok = True
+
+    def __init__(self, precision: int = 12):
+        super().__init__(precision=precision, scale=2, asdecimal=False)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        # int / numpy ints only: a float or Decimal here is a units value
+        # that was never converted, and would be off by 100x
+        return Decimal(operator.index(value)).scaleb(-2)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # Drivers hand back float (SQLite) or Decimal (Postgres) units
+        return round(value * 100)
+
+
+def as_units(column):
+    """
+    A Cents column read as plain float currency units, for routes that only
+    pass money through to JSON (no per-row Python conversion).
+
+    Cast in SQL, so the JSON is a float on every dialect, the same as
+    from_cents() gives Money fields: SQLite hands NUMERIC values with no
+    fraction back as integers (5, not 5.0).
+    """
+    if isinstance(column.type, Cents):
+        return cast(column, Float())
+    return column
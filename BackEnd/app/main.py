@@ -1,68 +1,84 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-import logging
 
 from app.core.config import settings
-from app.db.session import engine, SessionLocal
-from app.db.base import Base
-
-from app.models.user import User
-from app.auth.security import hash_password
+from app.core.responses import FastJSONResponse
+from app.core.log import RequestContextMiddleware, setup_logging, shutdown_logging
+from app.core.cache_policy import CachePolicyMiddleware
+from app.core.compression import CompressionMiddleware
+from app.db.session import READ_AFTER_HEADER, ReadAfterMiddleware, engine
+from app.db.migrate import verify_schema_version
+from app.core.events import event_bus
+from app.core.scheduler import scheduler
+from app.core.warmup import warmup
+from app.services.invoices import shutdown_pool as shutdown_invoice_pool
+from app.services.maintenance import register_jobs
 
 from app.routers.auth import router as auth_router
 from app.routers.product import router as product_router
 from app.routers.bill import router as bill_router
 from app.routers.user_admin import router as admin_user_router
 from app.routers.admin_bill import router as admin_bill_router
+from app.routers.admin_report import router as admin_report_router
+from app.routers.admin_events import router as admin_events_router
+from app.routers.admin_scheduler import router as admin_scheduler_router
 from app.routers.component import admin_router, router as component_router
+from app.routers.catalog import router as catalog_router
 
 # Initialize Limiter
 limiter = Limiter(key_func=get_remote_address)
 
-# CREATE DEFAULT ADMIN
-def create_default_admin():
-    db = SessionLocal()
+
+# STARTUP / SHUTDOWN
+# Schema changes and the default admin are handled by `python migrate_db.py`;
+# workers only check that the database is at the expected version.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    verify_schema_version(engine)
+    event_bus.start()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+    # In the background: /health answers at once, /ready once this is done
+    warmup.start()
     try:
-        existing_admin = db.query(User).filter(User.role == "admin").first()
-        if existing_admin:
-            logging.info("Admin already exists")
-            return
-
-        admin = User(
-            first_name="Admin",
-            last_name="User",
-            email="admin@billswift.com",
-            password_hash=hash_password("admin123"),
-            employee_code="ADMIN001",
-            team="Management",
-            role="admin",
-            is_active=True,
-        )
-        db.add(admin)
-        db.commit()
-        logging.info("🔥 Default Admin Created: admin@billswift.com | admin123")
-
-    except Exception as e:
-        logging.error(f"Admin creation failed: {e}")
+        yield
     finally:
-        db.close()
-
+        warmup.stop()
+        # Running jobs may still publish events and log, so they stop first
+        scheduler.stop()
+        event_bus.stop()
+        shutdown_invoice_pool()
+        shutdown_logging()
 
 
 # APP FACTORY
 def create_app() -> FastAPI:
+    setup_logging()
+    register_jobs(scheduler)
+
     app = FastAPI(
         title=settings.APP_NAME,
         version="0.1.0",
+        default_response_class=FastJSONResponse,
+        lifespan=lifespan,
     )
 
     # Rate Limiting Configuration
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+    # HTTP CACHING + COMPRESSION (ETags are computed on the uncompressed body)
+    app.add_middleware(CachePolicyMiddleware)
+    app.add_middleware(CompressionMiddleware)
+
+    # Read-your-writes: hands mark_recent_write()'s time back to the client
+    app.add_middleware(ReadAfterMiddleware)
+
     # CORS
     app.add_middleware(
         CORSMiddleware,
@@ -73,13 +89,10 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Request-ID", READ_AFTER_HEADER],
     )
-
-    # STARTUP
-    @app.on_event("startup")
-    def on_startup():
-        Base.metadata.create_all(bind=engine)
-        create_default_admin()
+    # Outermost: request ids + access log for everything, CORS included
+    app.add_middleware(RequestContextMiddleware)
 
     # ROUTERS
     app.include_router(auth_router)
@@ -87,16 +100,26 @@ def create_app() -> FastAPI:
     app.include_router(bill_router)
     app.include_router(admin_user_router)
     app.include_router(admin_bill_router)
+    app.include_router(admin_report_router)
+    app.include_router(admin_events_router)
+    app.include_router(admin_scheduler_router)
 
     # COMPONENT ROUTERS (THIS FIXES YOUR ISSUE)
     app.include_router(component_router)
     app.include_router(admin_router)   # /admin/components
+    app.include_router(catalog_router)
 
     # HEALTH
     @app.get("/health")
     async def health_check():
         return {"status": "ok", "env": settings.APP_ENV}
 
+    # READINESS (load balancer / orchestrator: send traffic once warmed up)
+    @app.get("/ready")
+    async def readiness_check():
+        state = warmup.state()
+        return FastJSONResponse(state, status_code=200 if state["ready"] else 503)
+
     return app
 
 
@@ -1,5 +1,26 @@
 from app.models.user import User
+from app.models.component import Component
 from app.models.product import Product
+from app.models.product_component import ProductComponent
 from app.models.bill import Bill, BillItem
+from app.models.report import DailyUserSales, DailyProductSales
+from app.models.catalog import CatalogVersion, CatalogTombstone
+from app.models.archive import ArchivedBill, ArchivedBillItem, BillArchiveYear
+from app.models.scheduler import SchedulerLock
 
-__all__ = ["User", "Product", "Bill", "BillItem"]
+__all__ = [
+    "User",
+    "Component",
+    "Product",
+    "ProductComponent",
+    "Bill",
+    "BillItem",
+    "DailyUserSales",
+    "DailyProductSales",
+    "CatalogVersion",
+    "CatalogTombstone",
+    "ArchivedBill",
+    "ArchivedBillItem",
+    "BillArchiveYear",
+    "SchedulerLock",
+]
@@ -0,0 +1,109 @@
+# app/models/archive.py
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    Text,
+    Index,
+    func,
+)
+from sqlalchemy.orm import foreign, relationship
+from app.db.base import Base
+from app.db.types import Cents
+
+# Bills of closed years, moved out of bills / bill_items by
+# app.services.archive so the hot tables only hold recent years.
+#
+# On Postgres both tables are range-partitioned by year on the bill's
+# created_at (one partition per archived year). Rows are never updated.
+# There are no foreign keys: an archived row keeps its original ids, and
+# the product delete guard checks bill_items_archive explicitly.
+
+
+class ArchivedBill(Base):
+    __tablename__ = "bills_archive"
+    __table_args__ = (
+        Index("ix_bills_archive_id", "id"),
+        Index("ix_bills_archive_bill_number", "bill_number"),
+        Index("ix_bills_archive_user_id_created_at", "user_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # Partition key first: Postgres requires it in the primary key
+    created_at = Column(DateTime(timezone=True), primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    bill_number = Column(String(100), nullable=False)
+    user_id = Column(Integer, nullable=False)
+
+    subtotal_amount = Column(Cents(), nullable=False)
+    discount_amount = Column(Cents(), nullable=False)
+    total_amount = Column(Cents(), nullable=False)
+
+    notes = Column(Text, nullable=True)
+
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Ids stay unique after the move; identity on id alone keeps lookups and
+    # selectin loads on the id indexes
+    __mapper_args__ = {"primary_key": [id]}
+
+    # Same shape as Bill, so bill_detail() / invoices work on either
+    user = relationship(
+        "User",
+        primaryjoin="foreign(ArchivedBill.user_id) == User.id",
+        viewonly=True,
+        lazy="joined",
+    )
+    items = relationship(
+        "ArchivedBillItem",
+        primaryjoin="ArchivedBill.id == foreign(ArchivedBillItem.bill_id)",
+        viewonly=True,
+        lazy="selectin",
+    )
+
+
+class ArchivedBillItem(Base):
+    __tablename__ = "bill_items_archive"
+    __table_args__ = (
+        Index("ix_bill_items_archive_bill_id", "bill_id"),
+        Index("ix_bill_items_archive_product_id", "product_id"),
+        {"postgresql_partition_by": "RANGE (bill_created_at)"},
+    )
+
+    # created_at of the bill, so items land in the bill's partition
+    bill_created_at = Column(DateTime(timezone=True), primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    bill_id = Column(Integer, nullable=False)
+    product_id = Column(Integer, nullable=False)
+
+    quantity = Column(Integer, nullable=False)
+
+    unit_price = Column(Cents(), nullable=False)
+    line_total = Column(Cents(), nullable=False)
+
+    __mapper_args__ = {"primary_key": [id]}
+
+    product = relationship(
+        "Product",
+        primaryjoin="foreign(ArchivedBillItem.product_id) == Product.id",
+        viewonly=True,
+        lazy="joined",
+    )
+
+
+class BillArchiveYear(Base):
+    """One row per year the archival job has started moving."""
+    __tablename__ = "bill_archive_years"
+
+    year = Column(Integer, primary_key=True, autoincrement=False)
+
+    # in_progress while rows are moving (reads check both sides), then archived
+    status = Column(String(20), nullable=False, default="in_progress")
+    bills_count = Column(Integer, nullable=False, default=0)
+    items_count = Column(Integer, nullable=False, default=0)
+
+    archived_at = Column(DateTime(timezone=True), nullable=True)
+
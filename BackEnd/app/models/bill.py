@@ -3,27 +3,31 @@ from sqlalchemy import (
     Integer,
     String,
     ForeignKey,
-    Numeric,
     DateTime,
     Text,
+    Index,
     func,
 )
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.types import Cents
 
 class Bill(Base):
     __tablename__ = "bills"
+    # Ids are never reused: archived bills keep theirs (see m0012)
+    __table_args__ = {"sqlite_autoincrement": True}
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
     # For easy reference – could be something like "BILL-2025-0001"
     bill_number = Column(String(100), unique=True, index=True, nullable=False)
 
+    # Served by ix_bills_user_id_created_at (my-bills filters + sorts on it)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
-    subtotal_amount = Column(Numeric(12, 2), nullable=False, default=0)
-    discount_amount = Column(Numeric(12, 2), nullable=False, default=0)
-    total_amount = Column(Numeric(12, 2), nullable=False, default=0)
+    subtotal_amount = Column(Cents(), nullable=False, default=0)
+    discount_amount = Column(Cents(), nullable=False, default=0)
+    total_amount = Column(Cents(), nullable=False, default=0)
 
     notes = Column(Text, nullable=True)
 
@@ -42,16 +46,25 @@ class Bill(Base):
 
 class BillItem(Base):
     __tablename__ = "bill_items"
+    __table_args__ = {"sqlite_autoincrement": True}
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
-    bill_id = Column(Integer, ForeignKey("bills.id", ondelete="CASCADE"), nullable=False)
-    product_id = Column(Integer, ForeignKey("products.id", ondelete="RESTRICT"), nullable=False)
+    bill_id = Column(Integer, ForeignKey("bills.id", ondelete="CASCADE"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="RESTRICT"), nullable=False, index=True)
 
     quantity = Column(Integer, nullable=False, default=1)
 
-    unit_price = Column(Numeric(12, 2), nullable=False)
-    line_total = Column(Numeric(12, 2), nullable=False)
+    unit_price = Column(Cents(), nullable=False)
+    line_total = Column(Cents(), nullable=False)
 
     bill = relationship("Bill", back_populates="items", lazy="joined")
-    product = relationship("Product", back_populates="bill_items", lazy="joined")
\ No newline at end of file
+    product = relationship("Product", back_populates="bill_items", lazy="joined")
+
+
+Index("ix_bills_user_id_created_at", Bill.user_id, Bill.created_at.desc())
+# Year / month ranges: archival job, admin filters, invoice exports
+Index("ix_bills_created_at", Bill.created_at)
+# Admin bill search: amount ranges. The bill_number pattern index and the
+# notes full-text index (GIN / FTS5) are dialect specific, see m0011.
+Index("ix_bills_total_amount_id", Bill.total_amount, Bill.id)
@@ -0,0 +1,125 @@
+# app/models/catalog.py
+"""
+Catalog change tracking for delta sync (GET /catalog/changes).
+
+Every flush that inserts, updates or deletes a Product, ProductComponent or
+Component takes the next value of the single-row catalog_version counter
+and stamps it on the changed rows:
+
+- Product / Component rows get row_version = new version
+- a changed ProductComponent bumps its parent Product (lines are served
+  embedded in the bundle)
+- a changed Component bumps every Product that uses it (their embedded
+  prices / names changed)
+- deleted Products / Components leave a CatalogTombstone
+
+The counter row is updated inside the writing transaction, so on Postgres
+concurrent catalog writers serialize on it and versions become visible in
+commit order – a client that syncs up to version N never misses a change
+≤ N committed later.
+"""
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Integer,
+    String,
+    event,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.component import Component
+from app.models.product import Product
+from app.models.product_component import ProductComponent
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+    # Tombstones up to this version were pruned; clients that synced
+    # earlier than this must do a full resync
+    pruned_through = Column(BigInteger, nullable=False, default=0)
+
+
+class CatalogTombstone(Base):
+    __tablename__ = "catalog_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(20), nullable=False)  # "product" | "component"
+    entity_id = Column(Integer, nullable=False)
+    row_version = Column(BigInteger, nullable=False, index=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+_TRACKED = (Product, Component, ProductComponent)
+
+
+def next_catalog_version(session: Session) -> int:
+    session.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == 1)
+        .values(value=CatalogVersion.value + 1)
+    )
+    return session.execute(
+        select(CatalogVersion.value).where(CatalogVersion.id == 1)
+    ).scalar_one()
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_catalog_changes(session, flush_context, instances):
+    changed = [
+        obj
+        for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, _TRACKED) and (obj in session.new or session.is_modified(obj))
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, _TRACKED)]
+    if not changed and not deleted:
+        return
+
+    version = next_catalog_version(session)
+
+    for obj in changed:
+        if isinstance(obj, ProductComponent):
+            product = obj.product or session.get(Product, obj.product_id)
+            if product is not None and product not in session.deleted:
+                product.row_version = version
+        else:
+            obj.row_version = version
+
+    for obj in deleted:
+        if isinstance(obj, ProductComponent):
+            product = session.get(Product, obj.product_id)
+            if product is not None and product not in session.deleted:
+                product.row_version = version
+        elif obj.id is not None:
+            session.add(
+                CatalogTombstone(
+                    entity="product" if isinstance(obj, Product) else "component",
+                    entity_id=obj.id,
+                    row_version=version,
+                )
+            )
+
+    changed_components = [
+        obj.id for obj in changed if isinstance(obj, Component) and obj.id is not None
+    ]
+    if changed_components:
+        session.execute(
+            update(Product)
+            .where(
+                Product.id.in_(
+                    select(ProductComponent.product_id).where(
+                        ProductComponent.component_id.in_(changed_components)
+                    )
+                )
+            )
+            .values(row_version=version)
+            .execution_options(synchronize_session=False)
+        )
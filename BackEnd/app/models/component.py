@@ -1,21 +1,30 @@
 # app/models/component.py
-from sqlalchemy import Column, Integer, String, Boolean, Numeric, DateTime, func, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, func, UniqueConstraint
 from app.db.base import Base
+from app.db.types import Cents
 
 class Component(Base):
     __tablename__ = "components"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
     name = Column(String(150), nullable=False)
     brand_name = Column(String(150), nullable=False)
     model = Column(String(150), nullable=True)
-    base_unit_price = Column(Numeric(12, 2), nullable=False)
+    base_unit_price = Column(Cents(), nullable=False)
 
     # NEW FIELD: This stores the toggle state
     is_active = Column(Boolean, default=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    # Catalog version of the last change (see app/models/catalog.py)
+    row_version = Column(BigInteger, nullable=False, default=0, index=True)
 
     __table_args__ = (
         UniqueConstraint(
@@ -1,23 +1,24 @@
 # app/models/product.py
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, Boolean, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.types import Cents
 
 class Product(Base):
     __tablename__ = "products"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
     starter_type = Column(String(50), nullable=False, index=True)
     rating_kw = Column(Numeric(10, 2), nullable=False, index=True)
 
-    base_price = Column(Numeric(12, 2), nullable=False, default=0)
-    total_price = Column(Numeric(12, 2), nullable=False, default=0)
+    base_price = Column(Cents(), nullable=False, default=0)
+    total_price = Column(Cents(), nullable=False, default=0)
 
     device_name = Column(String(150), nullable=True, index=True)
     brand_name = Column(String(150), nullable=True, index=True)
     model = Column(String(150), nullable=True, index=True)
-    price = Column(Numeric(12, 2), nullable=True)
+    price = Column(Cents(), nullable=True)
 
     is_active = Column(Boolean, default=True, nullable=False)
 
@@ -28,7 +29,13 @@ class Product(Base):
         onupdate=func.now(),
     )
 
-    bill_items = relationship("BillItem", back_populates="product")
+    # Catalog version of the last change to the bundle or any of its lines
+    # (see app/models/catalog.py)
+    row_version = Column(BigInteger, nullable=False, default=0, index=True)
+
+    # passive_deletes: the RESTRICT foreign key guards deletes, so never load
+    # a product's full sales history just to delete it
+    bill_items = relationship("BillItem", back_populates="product", passive_deletes="all")
 
     components = relationship(
         "ProductComponent",
@@ -36,3 +43,13 @@ class Product(Base):
         cascade="all, delete-orphan",
         lazy="selectin",
     )
+
+
+# Catalog filters (starter type + rating range) over active bundles only
+Index(
+    "ix_products_active_starter_rating",
+    Product.starter_type,
+    Product.rating_kw,
+    postgresql_where=Product.is_active == True,  # noqa: E712
+    sqlite_where=Product.is_active == True,  # noqa: E712
+)
@@ -1,12 +1,13 @@
 # app/models/product_component.py
-from sqlalchemy import Column, Integer, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.types import Cents
 
 class ProductComponent(Base):
     __tablename__ = "product_components"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
     product_id = Column(
         Integer,
@@ -18,12 +19,18 @@ class ProductComponent(Base):
         Integer,
         ForeignKey("components.id", ondelete="RESTRICT"),
         nullable=False,
+        index=True,
     )
 
     quantity = Column(Integer, nullable=False, default=1)
 
     # Optional override (rare case)
-    unit_price_override = Column(Numeric(12, 2), nullable=True)
+    unit_price_override = Column(Cents(), nullable=True)
 
     product = relationship("Product", back_populates="components")
     component = relationship("Component")
+
+    __table_args__ = (
+        # Bundle lines are always fetched per product
+        Index("ix_product_components_product_id_component_id", "product_id", "component_id"),
+    )
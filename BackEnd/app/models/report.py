@@ -0,0 +1,44 @@
+# app/models/report.py
+from sqlalchemy import Column, Integer, String, Date, Index
+from app.db.base import Base
+from app.db.types import Cents
+
+# Daily sales rollups, maintained incrementally by app.services.rollups
+# whenever a bill is created or deleted. Report endpoints read these instead
+# of aggregating bills / bill_items.
+#
+# No foreign keys on purpose: history must survive user/product clean-ups.
+
+
+class DailyUserSales(Base):
+    __tablename__ = "daily_user_sales"
+
+    day = Column(Date, primary_key=True)
+    user_id = Column(Integer, primary_key=True)
+
+    # Team of the employee when the bill was created
+    team = Column(String(100), nullable=True)
+
+    bills_count = Column(Integer, nullable=False, default=0)
+    subtotal_amount = Column(Cents(14), nullable=False, default=0)
+    discount_amount = Column(Cents(14), nullable=False, default=0)
+    total_amount = Column(Cents(14), nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_daily_user_sales_user_day", "user_id", "day"),
+        Index("ix_daily_user_sales_team_day", "team", "day"),
+    )
+
+
+class DailyProductSales(Base):
+    __tablename__ = "daily_product_sales"
+
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, primary_key=True)
+
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Cents(14), nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_daily_product_sales_product_day", "product_id", "day"),
+    )
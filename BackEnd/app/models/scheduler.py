@@ -0,0 +1,17 @@
+# app/models/scheduler.py
+from sqlalchemy import Column, DateTime, String
+
+from app.db.base import Base
+
+
+class SchedulerLock(Base):
+    """
+    Leader lease of one scheduled job (see app/core/scheduler.py): the
+    worker in `owner` runs the job until `locked_until`.
+    """
+    __tablename__ = "scheduler_locks"
+
+    name = Column(String(100), primary_key=True)
+    owner = Column(String(200), nullable=False, default="")
+    locked_until = Column(DateTime(timezone=True), nullable=False)
+    acquired_at = Column(DateTime(timezone=True), nullable=True)
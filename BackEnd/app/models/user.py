@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -6,7 +6,7 @@ from app.db.base import Base
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
@@ -29,4 +29,25 @@ class User(Base):
     )
 
     # Relationship: one user has many bills (bill history)
-    bills = relationship("Bill", back_populates="user", lazy="selectin")
\ No newline at end of file
+    # Loaded on access only – every authenticated request loads its User
+    bills = relationship("Bill", back_populates="user", lazy="select")
+
+
+# ADMIN USER DIRECTORY
+# Pending approvals: the approval queue and its count read only this
+Index(
+    "ix_users_pending",
+    User.id,
+    postgresql_where=(User.is_approved == False) & (User.role == "user"),  # noqa: E712
+    sqlite_where=(User.is_approved == False) & (User.role == "user"),  # noqa: E712
+)
+# Team filter + keyset pagination by id
+Index("ix_users_team_id", User.team, User.id)
+# Case-insensitive prefix search (text_pattern_ops lets LIKE 'abc%' use them)
+for _col in ("first_name", "last_name", "email", "employee_code"):
+    Index(
+        f"ix_users_lower_{_col}",
+        func.lower(getattr(User, _col)).label(f"lower_{_col}"),
+        postgresql_ops={f"lower_{_col}": "text_pattern_ops"},
+    )
+del _col
@@ -1,10 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+import io
+import re
+import zipfile
+from datetime import datetime, timezone
 
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
+from sqlalchemy import Integer, and_, column, func, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db, get_read_db, mark_recent_write
 from app.auth.jwt_handler import get_current_user
 from app.models.user import User
 from app.models.bill import Bill
+from app.models.archive import ArchivedBill
+from app.core.money import to_cents
+from app.core.responses import FastJSONResponse
+from app.core.fields import FIELDS_QUERY, parse_fields, select_columns
+from app.services.rollups import retract_bill
+from app.core.events import event_bus
+from app.core.config import settings
+from app.routers.bill import invoice_data, invoice_response
+from app.services.invoices import InvoiceBusy, get_invoice_pdfs
+from app.services.archive import (
+    archive_states,
+    bill_models,
+    find_archived_bill,
+    union_rows,
+    year_bounds,
+)
 
 router = APIRouter(prefix="/admin/billing", tags=["Admin Billing"])
 
@@ -14,43 +37,175 @@ def ensure_admin(current_user: User):
         raise HTTPException(status_code=403, detail="Admin access required")
 
 
+# Bill columns of the admin list (same names on ArchivedBill)
+_BILL_LIST_FIELDS = (
+    "id",
+    "bill_number",
+    "user_id",
+    "user_email",
+    "created_at",
+    "subtotal_amount",
+    "discount_amount",
+    "total_amount",
+)
+
+
 @router.get("/all-bills")
 def get_all_bills(
-    db: Session = Depends(get_db),
+    fields: str | None = FIELDS_QUERY,
+    year: int | None = Query(None, ge=2000, le=2100),
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     List all bills in the system for admin dashboard & bills admin page.
+    Archived years are only read for ?year= or ?include_archived=true.
     """
     ensure_admin(current_user)
 
-    bills = (
-        db.query(Bill)
-        .options(joinedload(Bill.user))
-        .order_by(Bill.id.desc())
-        .all()
+    fields = parse_fields(fields, _BILL_LIST_FIELDS)
+    statements = []
+    for model in bill_models(db, year, include_archived):
+        columns = {f: getattr(model, f) for f in _BILL_LIST_FIELDS if f != "user_email"}
+        columns["user_email"] = User.email
+        stmt = select(*select_columns(columns, fields), model.id.label("sort_key")).select_from(model)
+        if "user_email" in fields:
+            stmt = stmt.outerjoin(User, User.id == model.user_id)
+        if year is not None:
+            start, end = year_bounds(year)
+            stmt = stmt.where(model.created_at >= start, model.created_at < end)
+        statements.append(stmt)
+
+    return FastJSONResponse(union_rows(db, statements, fields))
+
+
+# SEARCH
+_SEARCH_FIELDS = (*_BILL_LIST_FIELDS, "employee_code", "notes")
+
+
+def _like_prefix(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _bill_number_prefix(model, dialect: str, prefix: str):
+    if dialect == "sqlite":
+        # SQLite's LIKE is case-insensitive and cannot use the (binary) unique
+        # index; GLOB is case-sensitive and range-scans it
+        return model.bill_number.op("GLOB")(re.sub(r"([*?\[])", r"[\1]", prefix) + "*")
+    # Postgres: ix_bills_bill_number_pattern (text_pattern_ops)
+    return model.bill_number.like(_like_prefix(prefix), escape="\\")
+
+
+def _notes_match(model, dialect: str, q: str):
+    """All words of `q` in the notes (whole words, any order)."""
+    if dialect == "postgresql":
+        # Same expression as ix_bills_notes_fts (GIN), or the index is not
+        # used; the archive has no such index and is scanned
+        return text(
+            f"to_tsvector('simple', coalesce({model.__tablename__}.notes, '')) "
+            "@@ plainto_tsquery('simple', :notes_q)"
+        ).bindparams(notes_q=q)
+    if model is ArchivedBill:
+        # No FTS table over the archive: every word as a substring
+        return and_(*(
+            func.lower(model.notes).like("%" + _like_prefix(word.lower()), escape="\\")
+            for word in q.split()
+        ))
+    # FTS5: each word quoted, so user input is never FTS query syntax
+    match = " ".join('"' + word.replace('"', '""') + '"' for word in q.split())
+    return Bill.id.in_(
+        text("SELECT rowid FROM bills_notes_fts WHERE bills_notes_fts MATCH :notes_q")
+        .bindparams(notes_q=match)
+        .columns(column("rowid", Integer))
     )
 
-    result = []
-    for b in bills:
-        result.append(
-            {
-                "id": b.id,
-                "bill_number": b.bill_number,
-                "user_id": b.user_id,
-                "user_email": getattr(b.user, "email", None) if b.user else None,
-                "created_at": b.created_at,
-                "subtotal_amount": float(b.subtotal_amount),
-                "discount_amount": float(b.discount_amount),
-                "total_amount": float(b.total_amount),
-            }
+
+@router.get("/search")
+def search_bills(
+    bill_number: str | None = Query(None, min_length=1, max_length=100, description="prefix, case-sensitive"),
+    email: str | None = Query(None, min_length=1, max_length=255, description="prefix of the user's email"),
+    employee_code: str | None = Query(None, min_length=1, max_length=50, description="prefix"),
+    min_total: float | None = Query(None, ge=0),
+    max_total: float | None = Query(None, ge=0),
+    q: str | None = Query(None, max_length=200, description="words in the notes"),
+    include_archived: bool = False,
+    cursor: int | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: str | None = FIELDS_QUERY,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Search bills by bill number prefix, user email / employee code prefix,
+    total amount range and words in the notes. Filters combine with AND;
+    results are newest first in keyset pages by id (?cursor=<next_cursor>).
+
+    Archived years are only searched with ?include_archived=true (without
+    the notes indexes: slower, and on SQLite words match as substrings);
+    otherwise `archived_years_excluded` lists the years left out.
+    """
+    ensure_admin(current_user)
+    if min_total is not None and max_total is not None and min_total > max_total:
+        raise HTTPException(status_code=400, detail="min_total is greater than max_total")
+
+    fields = parse_fields(fields, _SEARCH_FIELDS)
+    dialect = db.get_bind().dialect.name
+    # Matching users first (lower(...) user indexes), then their bills
+    # through ix_bills_user_id_created_at
+    user_filters = []
+    if email:
+        user_filters.append(func.lower(User.email).like(_like_prefix(email.lower()), escape="\\"))
+    if employee_code:
+        user_filters.append(
+            func.lower(User.employee_code).like(_like_prefix(employee_code.lower()), escape="\\")
+        )
+
+    statements = []
+    for model in bill_models(db, include_archived=include_archived):
+        columns = {f: getattr(model, f) for f in _SEARCH_FIELDS if f not in ("user_email", "employee_code")}
+        columns["user_email"] = User.email
+        columns["employee_code"] = User.employee_code
+
+        stmt = (
+            select(*select_columns(columns, fields), model.id.label("sort_key"))
+            .select_from(model)
+            .outerjoin(User, User.id == model.user_id)
         )
+        if bill_number:
+            stmt = stmt.where(_bill_number_prefix(model, dialect, bill_number))
+        if user_filters:
+            stmt = stmt.where(model.user_id.in_(select(User.id).where(*user_filters)))
+        if min_total is not None:
+            stmt = stmt.where(model.total_amount >= to_cents(min_total))
+        if max_total is not None:
+            stmt = stmt.where(model.total_amount <= to_cents(max_total))
+        if q and q.strip():
+            stmt = stmt.where(_notes_match(model, dialect, q))
+        if cursor is not None:
+            stmt = stmt.where(model.id < cursor)
+        statements.append(stmt.order_by(model.id.desc()).limit(limit + 1))
 
-    return result
+    # Bill ids are unique across the hot and archive tables (m0012)
+    if len(statements) == 1:
+        page = statements[0]
+    else:
+        merged = union_all(*(s.subquery().select() for s in statements)).subquery()
+        page = select(merged).order_by(merged.c.sort_key.desc()).limit(limit + 1)
+    rows = db.execute(page).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return FastJSONResponse({
+        "items": [{f: r._mapping[f] for f in fields} for r in rows],
+        "next_cursor": rows[-1].sort_key if more else None,
+        "archived_years_excluded": [] if include_archived else sorted(archive_states(db)),
+    })
 
 
 @router.delete("/{bill_id}")
 def delete_bill_admin(
+    request: Request,
     bill_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -62,9 +217,97 @@ def delete_bill_admin(
 
     bill = db.query(Bill).filter(Bill.id == bill_id).first()
     if not bill:
+        if find_archived_bill(db, bill_id=bill_id):
+            raise HTTPException(status_code=400, detail="Archived bills cannot be deleted")
         raise HTTPException(status_code=404, detail="Bill not found")
 
+    retract_bill(db, bill)
     db.delete(bill)
     db.commit()
+    mark_recent_write(request)
+    event_bus.publish("bill.deleted", {"id": bill_id})
+
+    return {"detail": "Bill deleted"}
 
-    return {"detail": "Bill deleted"}
\ No newline at end of file
+
+# INVOICES
+@router.get("/{bill_id}/invoice.pdf", response_class=Response)
+def get_invoice_admin(
+    request: Request,
+    bill_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    ensure_admin(current_user)
+
+    bill = db.query(Bill).filter(Bill.id == bill_id).first() or find_archived_bill(db, bill_id=bill_id)
+    if not bill:
+        raise HTTPException(status_code=404, detail="Bill not found")
+    return invoice_response(request, invoice_data(bill))
+
+
+class InvoiceBatchRequest(BaseModel):
+    bill_ids: list[int] | None = None
+    # Every bill of a calendar month (UTC), e.g. "2026-09"
+    month: str | None = Field(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
+@router.post("/invoices.zip", response_class=Response)
+def export_invoices_zip(
+    payload: InvoiceBatchRequest,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Zip of invoice PDFs for the given bills or month (month-end export).
+    Uncached invoices render in parallel in the invoice worker pool.
+    """
+    ensure_admin(current_user)
+
+    if payload.bill_ids:
+        models = [Bill, ArchivedBill] if archive_states(db) else [Bill]
+    elif payload.month:
+        year, month = map(int, payload.month.split("-"))
+        start = datetime(year, month, 1, tzinfo=timezone.utc)
+        end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+        # The archive only when that year has been (or is being) archived
+        models = bill_models(db, year)
+    else:
+        raise HTTPException(status_code=400, detail="Give bill_ids or month")
+
+    def requested(model):
+        if payload.bill_ids:
+            return model.id.in_(payload.bill_ids)
+        return (model.created_at >= start) & (model.created_at < end)
+
+    bills = []
+    for model in models:
+        remaining = settings.INVOICE_BATCH_MAX + 1 - len(bills)
+        bills += db.query(model).filter(requested(model)).order_by(model.id).limit(remaining).all()
+    bills.sort(key=lambda b: b.id)
+    if not bills:
+        raise HTTPException(status_code=404, detail="No bills found")
+    if len(bills) > settings.INVOICE_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"More than {settings.INVOICE_BATCH_MAX} bills; split the export",
+        )
+
+    details = [invoice_data(b) for b in bills]
+    try:
+        pdfs = get_invoice_pdfs(details)
+    except InvoiceBusy:
+        raise HTTPException(status_code=503, detail="Invoice renderer busy, try again shortly")
+
+    buf = io.BytesIO()
+    # PDF content streams are already deflated
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_STORED) as zf:
+        for detail, (_, pdf) in zip(details, pdfs):
+            zf.writestr(f"{detail['bill_number']}.pdf", pdf)
+
+    name = f"invoices-{payload.month}.zip" if payload.month and not payload.bill_ids else "invoices.zip"
+    return Response(
+        content=buf.getvalue(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{name}"'},
+    )
@@ -0,0 +1,91 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.db.session import SessionLocal
+from app.auth.jwt_handler import user_from_token
+from app.core.config import settings
+from app.core.events import event_bus
+from app.core.responses import dumps
+
+router = APIRouter(prefix="/admin/events", tags=["Admin Events"])
+
+
+def require_admin_stream(request: Request, token: str | None = Query(None)):
+    """
+    Admin check for EventSource, which cannot send headers: the token may
+    come as ?token= instead. Uses its own short session so the stream does
+    not hold a database connection while it is open.
+    """
+    header = request.headers.get("authorization", "")
+    if header.lower().startswith("bearer "):
+        token = header[7:]
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    with SessionLocal() as db:
+        user = user_from_token(token, db)
+        if user.role != "admin":
+            raise HTTPException(status_code=403, detail="Admin access required")
+
+
+def _frame(event: dict) -> bytes:
+    return (
+        f"id: {event['id']}\nevent: {event['type']}\ndata: ".encode()
+        + dumps(event["data"])
+        + b"\n\n"
+    )
+
+
+_RESYNC = b"event: resync\ndata: {}\n\n"
+
+
+# ADMIN: EVENT STREAM
+@router.get("/stream")
+async def stream_events(request: Request, _: None = Depends(require_admin_stream)):
+    """
+    Server-Sent Events: user.signup, user.approved, user.status,
+    users.approved / users.status (bulk, with "ids"), bill.created,
+    bill.deleted, product.created, product.deleted, component.deleted.
+
+    On `resync` (missed events) the client refetches its lists once.
+    """
+    sub, missed = event_bus.subscribe(request.headers.get("last-event-id"))
+
+    async def stream():
+        try:
+            yield b"retry: 3000\n\n"
+            if missed is None:
+                yield _RESYNC
+            else:
+                for event in missed:
+                    yield _frame(event)
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        sub.queue.get(), timeout=settings.EVENT_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield b": ping\n\n"
+                    continue
+
+                if sub.overflowed:
+                    # Too slow to keep up: drop the backlog and resync
+                    sub.overflowed = False
+                    while not sub.queue.empty():
+                        sub.queue.get_nowait()
+                    yield _RESYNC
+                    continue
+                yield _frame(event)
+        finally:
+            event_bus.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
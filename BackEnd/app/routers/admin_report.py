@@ -0,0 +1,184 @@
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.money import from_cents
+from app.db.session import get_read_db
+from app.auth.jwt_handler import require_admin
+from app.models.user import User
+from app.models.product import Product
+from app.models.report import DailyUserSales, DailyProductSales
+
+router = APIRouter(prefix="/admin/reports", tags=["Admin Reports"])
+
+# All reports answer from the daily rollup tables (app/models/report.py),
+# never from bills / bill_items, so cost depends on days × groups only.
+
+
+def _date_range(date_from: date | None, date_to: date | None) -> tuple[date, date]:
+    """Inclusive range; defaults to the last 30 days."""
+    date_to = date_to or datetime.now(timezone.utc).date()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must be before date_to")
+    return date_from, date_to
+
+
+def _money(cents) -> float:
+    return from_cents(cents or 0)
+
+
+#  REVENUE BY DAY
+@router.get("/daily")
+def report_daily(
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    db: Session = Depends(get_read_db),
+    _: User = Depends(require_admin),
+):
+    date_from, date_to = _date_range(date_from, date_to)
+
+    rows = (
+        db.query(
+            DailyUserSales.day,
+            func.sum(DailyUserSales.bills_count),
+            func.sum(DailyUserSales.subtotal_amount),
+            func.sum(DailyUserSales.discount_amount),
+            func.sum(DailyUserSales.total_amount),
+        )
+        .filter(DailyUserSales.day >= date_from, DailyUserSales.day <= date_to)
+        .group_by(DailyUserSales.day)
+        .order_by(DailyUserSales.day)
+        .all()
+    )
+
+    return [
+        {
+            "day": day,
+            "bills_count": int(bills or 0),
+            "subtotal_amount": _money(subtotal),
+            "discount_amount": _money(discount),
+            "total_amount": _money(total),
+        }
+        for day, bills, subtotal, discount, total in rows
+    ]
+
+
+#  REVENUE BY TEAM
+@router.get("/teams")
+def report_by_team(
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    db: Session = Depends(get_read_db),
+    _: User = Depends(require_admin),
+):
+    date_from, date_to = _date_range(date_from, date_to)
+
+    rows = (
+        db.query(
+            DailyUserSales.team,
+            func.sum(DailyUserSales.bills_count),
+            func.sum(DailyUserSales.total_amount),
+        )
+        .filter(DailyUserSales.day >= date_from, DailyUserSales.day <= date_to)
+        .group_by(DailyUserSales.team)
+        .order_by(func.sum(DailyUserSales.total_amount).desc())
+        .all()
+    )
+
+    return [
+        {
+            "team": team or "-",
+            "bills_count": int(bills or 0),
+            "total_amount": _money(total),
+        }
+        for team, bills, total in rows
+    ]
+
+
+#  REVENUE BY EMPLOYEE
+@router.get("/employees")
+def report_by_employee(
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    _: User = Depends(require_admin),
+):
+    date_from, date_to = _date_range(date_from, date_to)
+
+    totals = (
+        db.query(
+            DailyUserSales.user_id.label("user_id"),
+            func.sum(DailyUserSales.bills_count).label("bills_count"),
+            func.sum(DailyUserSales.total_amount).label("total_amount"),
+        )
+        .filter(DailyUserSales.day >= date_from, DailyUserSales.day <= date_to)
+        .group_by(DailyUserSales.user_id)
+        .subquery()
+    )
+
+    rows = (
+        db.query(totals, User.first_name, User.last_name, User.employee_code, User.team)
+        .outerjoin(User, User.id == totals.c.user_id)
+        .order_by(totals.c.total_amount.desc())
+        .limit(limit)
+        .all()
+    )
+
+    return [
+        {
+            "user_id": r.user_id,
+            "name": f"{r.first_name} {r.last_name}" if r.first_name else None,
+            "employee_code": r.employee_code,
+            "team": r.team,
+            "bills_count": int(r.bills_count or 0),
+            "total_amount": _money(r.total_amount),
+        }
+        for r in rows
+    ]
+
+
+#  REVENUE BY PRODUCT BUNDLE
+@router.get("/products")
+def report_by_product(
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    _: User = Depends(require_admin),
+):
+    date_from, date_to = _date_range(date_from, date_to)
+
+    totals = (
+        db.query(
+            DailyProductSales.product_id.label("product_id"),
+            func.sum(DailyProductSales.units).label("units"),
+            func.sum(DailyProductSales.revenue).label("revenue"),
+        )
+        .filter(DailyProductSales.day >= date_from, DailyProductSales.day <= date_to)
+        .group_by(DailyProductSales.product_id)
+        .subquery()
+    )
+
+    rows = (
+        db.query(totals, Product.starter_type, Product.rating_kw)
+        .outerjoin(Product, Product.id == totals.c.product_id)
+        .order_by(totals.c.revenue.desc())
+        .limit(limit)
+        .all()
+    )
+
+    return [
+        {
+            "product_id": r.product_id,
+            "product_name": (
+                f"{r.starter_type} {r.rating_kw} kW" if r.starter_type else "Unknown"
+            ),
+            "units": int(r.units or 0),
+            "revenue": _money(r.revenue),
+        }
+        for r in rows
+    ]
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from app.auth.jwt_handler import require_admin
+from app.core.scheduler import scheduler
+from app.models.user import User
+
+router = APIRouter(prefix="/admin/scheduler", tags=["Admin Scheduler"])
+
+
+# ADMIN: JOBS
+@router.get("/jobs")
+def list_jobs(_: User = Depends(require_admin)):
+    """
+    Scheduled jobs with this worker's timing metrics. Leader jobs run on
+    one worker at a time, so their counts differ between workers; `skipped`
+    counts slots another worker took (or a run that was still going).
+    """
+    return {
+        "running": scheduler.started,
+        "owner": scheduler.owner,
+        "jobs": scheduler.jobs(),
+    }
@@ -1,3 +1,5 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.db.session import get_db
@@ -5,6 +7,7 @@ from app.models.user import User
 from app.schemas.user import UserCreate, LoginRequest, UserOut
 from app.auth.security import hash_password, verify_password
 from app.auth.jwt_handler import create_access_token, get_current_user
+from app.core.events import event_bus
 from app.core.email_utils import (
     send_new_user_request_email,
     send_user_signup_ack_email,
@@ -16,6 +19,7 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
+logger = logging.getLogger(__name__)
 limiter = Limiter(key_func=get_remote_address)
 
 @router.post("/signup", response_model=UserOut)
@@ -42,11 +46,21 @@ def signup(request: Request, payload: UserCreate, db: Session = Depends(get_db))
     db.commit()
     db.refresh(user)
 
+    event_bus.publish("user.signup", {
+        "id": user.id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "employee_code": user.employee_code,
+        "team": user.team,
+        "created_at": user.created_at,
+    })
+
     try:
         send_new_user_request_email(user)   # to admin
         send_user_signup_ack_email(user)    # to user
-    except Exception as e:
-        print("[EMAIL] Error during signup emails:", e)
+    except Exception:
+        logger.exception("signup emails failed", extra={"user_id": user.id})
 
     return user
 
@@ -1,17 +1,27 @@
 # app/routers/bill.py
-from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timezone
 import random
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db, mark_recent_write
 from app.models.bill import Bill, BillItem
-from app.models.product import Product
+from app.models.archive import ArchivedBill
 from app.models.user import User
 from app.schemas.bill import BillCreate, BillOut, BillDetailOut
+from app.schemas.quote import QuoteConfiguration, QuoteRequest, QuoteOut
 from app.auth.jwt_handler import get_current_user
+from app.core.config import settings
+from app.core.money import from_cents
+from app.core.responses import FastJSONResponse
+from app.core.fields import FIELDS_QUERY, parse_fields, select_columns
+from app.core.events import event_bus
+from app.services.rollups import record_bill
+from app.services.pricing import get_price_matrix, price_bill_lines, quote
+from app.services.invoices import InvoiceBusy, get_invoice_pdf
+from app.services.archive import bill_models, find_archived_bill, union_rows, year_bounds
 
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -25,11 +35,11 @@ def _generate_bill_number(db: Session, user: User) -> str:
     Generate bill id in format:
         BS-YYYY-{employee_code}{abc}
 
-    - YYYY: current year
+    - YYYY: current year in UTC, the year created_at (and archival) uses
     - employee_code: from user.employee_code (sanitized)
     - abc: random 3-digit number (unique globally; retries if collision)
     """
-    year = datetime.now().year
+    year = datetime.now(timezone.utc).year
     emp_code = user.employee_code or "0000"
     emp_code_clean = "".join(ch for ch in emp_code if ch.isalnum())
 
@@ -59,46 +69,59 @@ def create_bill(
             detail="Bill must contain at least one item",
         )
 
-    subtotal = Decimal("0.00")
-    bill_items: list[BillItem] = []
-
+    # Money in int cents throughout (app/core/money.py). Every line is priced
+    # here from current component prices; the client's figures are only
+    # checked against the server quote, never billed.
+    max_discount = 100 if current_user.role == "admin" else settings.BILL_MAX_DISCOUNT_PERCENT
     for item in payload.items:
-        product = (
-            db.query(Product)
-            .filter(Product.id == item.product_id, Product.is_active == True)
-            .first()
-        )
-        if not product:
+        if item.discount_percent > max_discount:
             raise HTTPException(
-                status_code=404,
-                detail=f"Product {item.product_id} not found",
+                status_code=422,
+                detail=f"Discount on product {item.product_id} is above the allowed {max_discount:g}%",
             )
 
-        # If override_price is sent from UI, use that (bundle price after
-        # component + bundle discounts). Otherwise fall back to product.total_price.
-        if item.override_price is not None:
-            unit_price = Decimal(str(item.override_price))
-        else:
-            base_price = product.total_price or product.price
-            unit_price = Decimal(str(base_price))
+    priced = price_bill_lines(db, [
+        QuoteConfiguration(product_id=item.product_id, quantity=item.quantity,
+                           discount_percent=item.discount_percent)
+        for item in payload.items
+    ])
 
-        quantity = item.quantity or 1
-        line_total = unit_price * quantity
-        subtotal += line_total
+    subtotal = 0
+    bill_items: list[BillItem] = []
+    mismatches = []
+    for item, line in zip(payload.items, priced):
+        if line["error"]:
+            raise HTTPException(status_code=404 if not line["found"] else 422, detail=line["error"])
+        if item.expected_price is not None and item.expected_price != line["unit_price"]:
+            mismatches.append({
+                "product_id": item.product_id,
+                "expected_price": from_cents(item.expected_price),
+                "unit_price": from_cents(line["unit_price"]),
+            })
 
+        subtotal += line["line_total"]
         bill_items.append(
             BillItem(
-                product_id=product.id,
-                quantity=quantity,
-                unit_price=unit_price,
-                line_total=line_total,
+                product_id=item.product_id,
+                quantity=line["quantity"],
+                unit_price=line["unit_price"],
+                line_total=line["line_total"],
             )
         )
 
-    discount = Decimal(str(payload.discount_amount or 0))
-    total = subtotal - discount
-    if total < 0:
-        total = Decimal("0.00")
+    if mismatches:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Prices changed; review the bill and submit again", "items": mismatches},
+        )
+
+    discount = payload.discount_amount
+    if discount * 100 > subtotal * max_discount:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Bill discount is above the allowed {max_discount:g}% of the subtotal",
+        )
+    total = max(subtotal - discount, 0)
 
     bill_number = _generate_bill_number(db, current_user)
 
@@ -113,53 +136,87 @@ def create_bill(
     )
 
     db.add(bill)
+    db.flush()
+    record_bill(db, bill)
     db.commit()
+    mark_recent_write(request)
     db.refresh(bill)
+    event_bus.publish("bill.created", {
+        "id": bill.id,
+        "bill_number": bill.bill_number,
+        "user_id": bill.user_id,
+        "user_email": current_user.email,
+        "created_at": bill.created_at,
+        "subtotal_amount": from_cents(bill.subtotal_amount),
+        "discount_amount": from_cents(bill.discount_amount),
+        "total_amount": from_cents(bill.total_amount),
+    })
     return bill
 
 
-@router.get("/my-bills", response_model=list[BillOut])
-def get_my_bills(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+@router.post("/quote", response_model=QuoteOut)
+def quote_configurations(
+    payload: QuoteRequest,
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_user),
 ):
-    bills = (
-        db.query(Bill)
-        .filter(Bill.user_id == current_user.id)
-        .order_by(Bill.created_at.desc())
-        .all()
+    """
+    Price many candidate bundle configurations in one call.
+    Nothing is stored; prices come from current component prices.
+    """
+    items = quote(
+        get_price_matrix(db),
+        payload.configurations,
+        discount_percent=payload.discount_percent,
     )
-    return bills
+    total = sum(i["line_total"] for i in items if i["error"] is None)
+    return FastJSONResponse({"items": items, "total_amount": round(total, 2)})
 
 
-@router.get("/{bill_id}", response_model=BillDetailOut)
-def get_bill_detail(
-    bill_id: str,
-    db: Session = Depends(get_db),
+# Columns of BillOut, selectable through ?fields= (same names on ArchivedBill)
+_MY_BILL_FIELDS = (
+    "id",
+    "bill_number",
+    "subtotal_amount",
+    "discount_amount",
+    "total_amount",
+    "created_at",
+)
+
+
+@router.get("/my-bills", response_model=list[BillOut])
+def get_my_bills(
+    fields: str | None = FIELDS_QUERY,
+    year: int | None = Query(None, ge=2000, le=2100),
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Check if the query is a numeric ID or a Bill Number string
-    if bill_id.isdigit():
-        # Search by Primary Key ID
-        bill = (
-            db.query(Bill)
-            .filter(Bill.id == int(bill_id), Bill.user_id == current_user.id)
-            .first()
-        )
-    else:
-        # Search by the generated Bill Number (e.g., BS-2025-ADMIN001001)
-        bill = (
-            db.query(Bill)
-            .filter(Bill.bill_number == bill_id, Bill.user_id == current_user.id)
-            .first()
-        )
+    """
+    The current user's bills, newest first. Archived years are only read
+    when asked for (?year= or ?include_archived=true).
+    """
+    fields = parse_fields(fields, _MY_BILL_FIELDS)
 
-    if not bill:
-        raise HTTPException(status_code=404, detail="Bill not found")
+    statements = []
+    for model in bill_models(db, year, include_archived):
+        columns = {f: getattr(model, f) for f in _MY_BILL_FIELDS}
+        stmt = select(*select_columns(columns, fields), model.created_at.label("sort_key"))
+        stmt = stmt.where(model.user_id == current_user.id)
+        if year is not None:
+            start, end = year_bounds(year)
+            stmt = stmt.where(model.created_at >= start, model.created_at < end)
+        statements.append(stmt)
 
+    return FastJSONResponse(union_rows(db, statements, fields))
+
+
+def bill_detail(bill: Bill | ArchivedBill) -> dict:
+    """BillDetailOut payload for a loaded bill (items + products load with it)."""
     items = []
     for item in bill.items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
+        # BillItem.product is joined-loaded together with the items
+        product = item.product
 
         if product and product.starter_type:
             product_name = f"{product.starter_type} {product.rating_kw} kW"
@@ -173,18 +230,85 @@ def get_bill_detail(
                 "product_id": item.product_id,
                 "product_name": product_name,
                 "quantity": item.quantity,
-                "unit_price": float(item.unit_price),
-                "line_total": float(item.line_total),
+                "unit_price": from_cents(item.unit_price),
+                "line_total": from_cents(item.line_total),
             }
         )
 
     return {
         "id": bill.id,
         "bill_number": bill.bill_number,
-        "subtotal_amount": float(bill.subtotal_amount),
-        "discount_amount": float(bill.discount_amount),
-        "total_amount": float(bill.total_amount),
+        "subtotal_amount": from_cents(bill.subtotal_amount),
+        "discount_amount": from_cents(bill.discount_amount),
+        "total_amount": from_cents(bill.total_amount),
         "notes": bill.notes,
         "created_at": bill.created_at,
         "items": items,
     }
+
+
+def invoice_data(bill: Bill | ArchivedBill) -> dict:
+    """What an invoice PDF is rendered from: the bill detail + who billed it."""
+    user = bill.user
+    return {
+        **bill_detail(bill),
+        "prepared_by": f"{user.first_name} {user.last_name} ({user.employee_code})" if user else None,
+    }
+
+
+def invoice_response(request: Request, detail: dict) -> Response:
+    try:
+        key, pdf = get_invoice_pdf(detail)
+    except InvoiceBusy:
+        raise HTTPException(status_code=503, detail="Invoice renderer busy, try again shortly")
+
+    headers = {
+        "ETag": f'"{key}"',
+        "Cache-Control": "private, max-age=86400",
+        "Content-Disposition": f'inline; filename="{detail["bill_number"]}.pdf"',
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=pdf, media_type="application/pdf", headers=headers)
+
+
+def _find_user_bill(db: Session, bill_id: str, user: User) -> Bill | ArchivedBill:
+    # Check if the query is a numeric ID or a Bill Number string
+    if bill_id.isdigit():
+        # Search by Primary Key ID
+        bill = (
+            db.query(Bill)
+            .filter(Bill.id == int(bill_id), Bill.user_id == user.id)
+            .first()
+        ) or find_archived_bill(db, bill_id=int(bill_id), user_id=user.id)
+    else:
+        # Search by the generated Bill Number (e.g., BS-2025-ADMIN001001)
+        bill = (
+            db.query(Bill)
+            .filter(Bill.bill_number == bill_id, Bill.user_id == user.id)
+            .first()
+        ) or find_archived_bill(db, bill_number=bill_id, user_id=user.id)
+
+    if not bill:
+        raise HTTPException(status_code=404, detail="Bill not found")
+    return bill
+
+
+@router.get("/{bill_id}", response_model=BillDetailOut)
+def get_bill_detail(
+    bill_id: str,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    return FastJSONResponse(bill_detail(_find_user_bill(db, bill_id, current_user)))
+
+
+@router.get("/{bill_id}/invoice.pdf", response_class=Response)
+def get_bill_invoice(
+    request: Request,
+    bill_id: str,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Printable invoice, rendered once per bill and then served from cache."""
+    return invoice_response(request, invoice_data(_find_user_bill(db, bill_id, current_user)))
@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from app.db.session import get_read_db
+from app.db.types import as_units
+from app.auth.jwt_handler import get_current_user
+from app.core.responses import FastJSONResponse
+from app.models.user import User
+from app.models.product import Product
+from app.models.product_component import ProductComponent
+from app.models.component import Component
+from app.models.catalog import CatalogVersion, CatalogTombstone
+from app.routers.product import serialize_product
+
+router = APIRouter(prefix="/catalog", tags=["Catalog"])
+
+
+@router.get("/changes")
+def get_catalog_changes(
+    since: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_user),
+):
+    """
+    Delta feed for clients keeping a local copy of the catalog.
+
+    Returns products (with their component lines) and components changed
+    after version `since`, plus ids deleted since then. Store `version` and
+    pass it as `since` next time. When `full` is true the client fell behind
+    tombstone retention: replace the local catalog with this response.
+    """
+    state = db.execute(
+        select(CatalogVersion.value, CatalogVersion.pruned_through).where(CatalogVersion.id == 1)
+    ).one_or_none()
+    version, pruned_through = state if state else (0, 0)
+
+    full = since < pruned_through
+    if full:
+        since = 0
+
+    products = (
+        db.query(Product)
+        .filter(Product.row_version > since)
+        .options(selectinload(Product.components).selectinload(ProductComponent.component))
+        .order_by(Product.id)
+        .all()
+    )
+    components = (
+        db.query(
+            Component.id,
+            Component.name,
+            Component.brand_name,
+            Component.model,
+            as_units(Component.base_unit_price).label("base_unit_price"),
+            Component.is_active,
+        )
+        .filter(Component.row_version > since)
+        .order_by(Component.id)
+        .all()
+    )
+    tombstones = (
+        db.query(CatalogTombstone.entity, CatalogTombstone.entity_id)
+        .filter(CatalogTombstone.row_version > since)
+        .all()
+    )
+
+    return FastJSONResponse({
+        "version": version,
+        "full": full,
+        "products": [
+            {**serialize_product(p), "is_active": p.is_active} for p in products
+        ],
+        "components": [c._asdict() for c in components],
+        "deleted": {
+            "products": [t.entity_id for t in tombstones if t.entity == "product"],
+            "components": [t.entity_id for t in tombstones if t.entity == "component"],
+        },
+    })
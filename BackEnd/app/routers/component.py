@@ -1,13 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import exists, func, select
 from sqlalchemy.orm import Session
-from decimal import Decimal
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db, mark_recent_write
 from app.models.component import Component
+from app.models.product import Product
+from app.models.product_component import ProductComponent
+from app.models.report import DailyProductSales
 from app.auth.jwt_handler import require_admin, get_current_user
 from app.models.user import User
+from app.core.responses import FastJSONResponse
+from app.core.events import event_bus
+from app.core.fields import FIELDS_QUERY, parse_fields, select_columns
+from app.core.money import from_cents
+from app.db.types import as_units
+from app.services.pricing import (
+    get_price_matrix,
+    invalidate_price_matrix,
+    refresh_bundle_totals,
+    simulate_price_changes,
+)
 # Import the schemas we fixed earlier
-from app.schemas.component import ComponentOut, ComponentCreate, ComponentUpdate
+from app.schemas.component import (
+    ComponentOut,
+    ComponentCreate,
+    ComponentUpdate,
+    PriceSimulationRequest,
+)
+
+# Columns of ComponentOut – list routes select just these (or the ?fields=
+# subset) and skip ORM rows
+_COMPONENT_COLUMNS = {
+    "id": Component.id,
+    "name": Component.name,
+    "brand_name": Component.brand_name,
+    "model": Component.model,
+    "base_unit_price": Component.base_unit_price,
+    "is_active": Component.is_active,
+}
 
 # --- USER ROUTER (New) ---
 router = APIRouter(
@@ -17,11 +47,19 @@ router = APIRouter(
 
 @router.get("/", response_model=list[ComponentOut])
 def list_components_user(
-    db: Session = Depends(get_db),
+    fields: str | None = FIELDS_QUERY,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user), # Allow both users and admins
 ):
     """Allows authenticated users to list components for billing."""
-    return db.query(Component).filter(Component.is_active == True).order_by(Component.name).all()
+    fields = parse_fields(fields, _COMPONENT_COLUMNS)
+    rows = (
+        db.query(*select_columns(_COMPONENT_COLUMNS, fields))
+        .filter(Component.is_active == True)
+        .order_by(Component.name)
+        .all()
+    )
+    return FastJSONResponse([r._asdict() for r in rows])
 
 # ADMIN ROUTER
 admin_router = APIRouter(
@@ -32,14 +70,22 @@ admin_router = APIRouter(
 # ADMIN: LIST
 @admin_router.get("/", response_model=list[ComponentOut])
 def list_components_admin(
-    db: Session = Depends(get_db),
+    fields: str | None = FIELDS_QUERY,
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_admin),
 ):
-    return db.query(Component).order_by(Component.name).all()
+    fields = parse_fields(fields, _COMPONENT_COLUMNS)
+    rows = (
+        db.query(*select_columns(_COMPONENT_COLUMNS, fields))
+        .order_by(Component.name)
+        .all()
+    )
+    return FastJSONResponse([r._asdict() for r in rows])
 
 # ADMIN: CREATE
 @admin_router.post("/", response_model=ComponentOut)
 def create_component(
+    request: Request,
     payload: ComponentCreate,
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),
@@ -60,18 +106,21 @@ def create_component(
         name=payload.name,
         brand_name=payload.brand_name,
         model=payload.model,
-        base_unit_price=Decimal(str(payload.base_unit_price)),
+        base_unit_price=payload.base_unit_price,
         is_active=payload.is_active  # Uses the default from schema
     )
 
     db.add(component)
     db.commit()
+    invalidate_price_matrix()
+    mark_recent_write(request)
     db.refresh(component)
     return component
 
 # ADMIN: UPDATE
 @admin_router.put("/{component_id}", response_model=ComponentOut)
 def update_component(
+    request: Request,
     component_id: int,
     payload: ComponentUpdate,
     db: Session = Depends(get_db),
@@ -84,16 +133,27 @@ def update_component(
     component.name = payload.name
     component.brand_name = payload.brand_name
     component.model = payload.model
-    component.base_unit_price = Decimal(str(payload.base_unit_price))
+    price_changed = component.base_unit_price != payload.base_unit_price
+    component.base_unit_price = payload.base_unit_price
     component.is_active = payload.is_active # This will no longer crash
 
+    if price_changed:
+        # Stored totals of every bundle using it (overridden lines stay as they are)
+        db.flush()
+        refresh_bundle_totals(
+            db,
+            select(ProductComponent.product_id).where(ProductComponent.component_id == component_id),
+        )
     db.commit()
+    invalidate_price_matrix()
+    mark_recent_write(request)
     db.refresh(component)
     return component
 
 # ADMIN: DELETE
 @admin_router.delete("/{component_id}")
 def delete_component(
+    request: Request,
     component_id: int,
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),
@@ -102,22 +162,24 @@ def delete_component(
     if not component:
         raise HTTPException(404, "Component not found")
 
-    # Check if component is used (Check your model relationship name here)
-    # If the relationship is named 'product_components', this stays as is
-    if hasattr(component, 'product_components') and component.product_components:
+    # Check if component is used in any bundle (EXISTS on ix_product_components_component_id)
+    if db.query(exists().where(ProductComponent.component_id == component_id)).scalar():
         raise HTTPException(
             400, "Component is used in products. Remove it first."
         )
 
     db.delete(component)
     db.commit()
+    invalidate_price_matrix()
+    mark_recent_write(request)
+    event_bus.publish("component.deleted", {"id": component_id})
     return {"detail": "Component deleted"}
 
 # ADMIN: SEARCH COMPONENTS
 @admin_router.get("/search")
 def search_components(
     q: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_admin),
 ):
     if len(q.strip()) < 3:
@@ -144,4 +206,99 @@ def search_components(
             "model": c.model or "",
         }
         for c in results
-    ]
\ No newline at end of file
+    ]
+# ADMIN: WHERE USED
+@admin_router.get("/{component_id}/where-used")
+def component_where_used(
+    component_id: int,
+    db: Session = Depends(get_read_db),
+    _: User = Depends(require_admin),
+):
+    """Bundles that contain this component."""
+    if not db.query(exists().where(Component.id == component_id)).scalar():
+        raise HTTPException(404, "Component not found")
+
+    rows = (
+        db.query(
+            Product.id,
+            Product.starter_type,
+            Product.rating_kw,
+            Product.is_active,
+            ProductComponent.quantity,
+            as_units(ProductComponent.unit_price_override).label("unit_price_override"),
+        )
+        .join(Product, Product.id == ProductComponent.product_id)
+        .filter(ProductComponent.component_id == component_id)
+        .order_by(Product.starter_type, Product.rating_kw)
+        .all()
+    )
+
+    return FastJSONResponse({
+        "component_id": component_id,
+        "bundles_count": len(rows),
+        "bundles": [
+            {
+                "product_id": r.id,
+                "product_name": f"{r.starter_type} {r.rating_kw} kW",
+                "is_active": r.is_active,
+                "quantity": r.quantity,
+                "unit_price_override": r.unit_price_override,
+            }
+            for r in rows
+        ],
+    })
+
+# ADMIN: WHAT-IF PRICE SIMULATION
+@admin_router.post("/simulate-price-change")
+def simulate_price_change(
+    payload: PriceSimulationRequest,
+    db: Session = Depends(get_read_db),
+    _: User = Depends(require_admin),
+):
+    """
+    Preview how proposed component base prices would move every bundle
+    price. Nothing is saved.
+    """
+    result = simulate_price_changes(
+        get_price_matrix(db),
+        {c.component_id: c.new_price for c in payload.changes},
+        top_n=payload.top_n,
+    )
+
+    top_ids = [t["product_id"] for t in result["top"]]
+    products = {
+        p.id: p
+        for p in db.query(Product.id, Product.starter_type, Product.rating_kw)
+        .filter(Product.id.in_(top_ids))
+        .all()
+    }
+    units_sold = dict(
+        db.query(DailyProductSales.product_id, func.sum(DailyProductSales.units))
+        .filter(DailyProductSales.product_id.in_(top_ids))
+        .group_by(DailyProductSales.product_id)
+        .all()
+    )
+
+    return {
+        "unknown_component_ids": result["unknown_component_ids"],
+        "affected_bundles": result["affected_bundles"],
+        "total_delta": from_cents(result["total_delta"]),
+        "top": [
+            {
+                "product_id": t["product_id"],
+                "product_name": (
+                    f"{products[t['product_id']].starter_type} {products[t['product_id']].rating_kw} kW"
+                    if t["product_id"] in products
+                    else "Unknown"
+                ),
+                "old_price": from_cents(t["old_price"]),
+                "new_price": from_cents(t["new_price"]),
+                "delta": from_cents(t["delta"]),
+                "delta_percent": (
+                    round(t["delta"] * 100 / t["old_price"], 2) if t["old_price"] else None
+                ),
+                "units_sold": int(units_sold.get(t["product_id"]) or 0),
+            }
+            for t in result["top"]
+        ],
+    }
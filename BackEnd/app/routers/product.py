@@ -1,55 +1,168 @@
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Literal
 
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import exists, func
+from sqlalchemy.orm import Session, load_only, noload, selectinload
+
+from app.db.session import get_db, get_read_db, mark_recent_write
 from app.models.product import Product
 from app.models.product_component import ProductComponent
 from app.models.component import Component
-from app.schemas.product import ProductCreate, ProductOut, ProductComponentOut
+from app.models.bill import BillItem
+from app.models.archive import ArchivedBillItem
+from app.schemas.product import ProductBulkPatch, ProductCreate, ProductOut, ProductPatch, ProductUpdate
+from app.core.money import from_cents
+from app.core.responses import FastJSONResponse
+from app.core.fields import FIELDS_QUERY, parse_fields
+from app.services.pricing import invalidate_price_matrix, refresh_bundle_totals
+from app.core.events import event_bus
 from app.auth.jwt_handler import require_admin, get_current_user
 from app.models.user import User
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
 
-def serialize_product(product: Product) -> ProductOut:
-    components = []
-    base = Decimal("0.00")
+# Fields of ProductOut, in output order (see ?fields=)
+PRODUCT_FIELDS = (
+    "id",
+    "starter_type",
+    "rating_kw",
+    "display_name",
+    "base_price",
+    "total_price",
+    "components",
+)
+# Fields that need the component lines loaded
+_PRICED_FIELDS = {"base_price", "total_price", "components"}
 
-    for pc in product.components:
-        unit_price = (
-            pc.unit_price_override
-            if pc.unit_price_override is not None
-            else pc.component.base_unit_price
-        )
-        line_total = unit_price * pc.quantity
-        base += line_total
-
-        components.append(
-            ProductComponentOut(
-                id=pc.id,
-                quantity=pc.quantity,
-                unit_price=float(unit_price),
-                line_total=float(line_total),
-                name=pc.component.name,
-                brand_name=pc.component.brand_name,
-                model=pc.component.model,
+
+def serialize_product(product: Product, fields=PRODUCT_FIELDS) -> dict:
+    """
+    Plain-dict form of ProductOut. Line math is in int cents; each amount
+    is converted to units once, and no models are constructed here.
+    """
+    data = {
+        "id": product.id,
+        "starter_type": product.starter_type,
+        "rating_kw": product.rating_kw,
+        "display_name": f"{product.starter_type} {product.rating_kw} kW",
+    }
+
+    if _PRICED_FIELDS.intersection(fields):
+        components = []
+        base = 0
+
+        for pc in product.components:
+            unit_price = (
+                pc.unit_price_override
+                if pc.unit_price_override is not None
+                else pc.component.base_unit_price
             )
-        )
+            line_total = unit_price * pc.quantity
+            base += line_total
+
+            components.append(
+                {
+                    "id": pc.id,
+                    "quantity": pc.quantity,
+                    "unit_price": from_cents(unit_price),
+                    "line_total": from_cents(line_total),
+                    "name": pc.component.name,
+                    "brand_name": pc.component.brand_name,
+                    "model": pc.component.model,
+                }
+            )
+
+        data.update(base_price=from_cents(base), total_price=from_cents(base), components=components)
+
+    return {f: data[f] for f in fields}
+
 
-    return ProductOut(
-        id=product.id,
-        starter_type=product.starter_type,
-        rating_kw=float(product.rating_kw),
-        base_price=float(base),
-        total_price=float(base),
-        components=components,
+def product_in_use(db: Session, product_id: int) -> bool:
+    return (
+        db.query(exists().where(BillItem.product_id == product_id)).scalar()
+        or db.query(exists().where(ArchivedBillItem.product_id == product_id)).scalar()
     )
 
 
+# BUNDLE LINES
+def _resolve_components(db: Session, component_ids) -> dict[int, Component]:
+    """All referenced components in one query; 404 naming any that are missing."""
+    wanted = set(component_ids)
+    if not wanted:
+        return {}
+    found = {c.id: c for c in db.query(Component).filter(Component.id.in_(wanted))}
+    missing = sorted(wanted - found.keys())
+    if missing:
+        raise HTTPException(404, f"Components not found: {', '.join(map(str, missing))}")
+    return found
+
+
+def _apply_lines(product: Product, lines, components: dict[int, Component]) -> None:
+    """
+    Make product.components match `lines` (one per component), touching only
+    what differs: changed lines are updated in place, new ones inserted and
+    dropped ones deleted (delete-orphan). Unchanged rows keep their ids.
+    """
+    wanted = {}
+    for item in lines:
+        if item.component_id in wanted:
+            raise HTTPException(400, f"Component {item.component_id} listed twice")
+        wanted[item.component_id] = item
+
+    existing = {}
+    for pc in list(product.components):
+        if pc.component_id in wanted and pc.component_id not in existing:
+            existing[pc.component_id] = pc
+        else:
+            product.components.remove(pc)
+
+    for component_id, item in wanted.items():
+        override = item.unit_price_override
+        pc = existing.get(component_id)
+        if pc is None:
+            product.components.append(
+                ProductComponent(
+                    component=components[component_id],
+                    quantity=item.quantity,
+                    unit_price_override=override,
+                )
+            )
+            continue
+        if pc.quantity != item.quantity:
+            pc.quantity = item.quantity
+        if pc.unit_price_override != override:
+            pc.unit_price_override = override
+
+
+def _apply_fields(product: Product, payload) -> None:
+    """Bundle-level fields present in the payload (PATCH leaves the rest)."""
+    if payload.starter_type is not None and payload.starter_type != product.starter_type:
+        product.starter_type = payload.starter_type
+        product.device_name = payload.starter_type
+    if payload.rating_kw is not None:
+        rating_kw = Decimal(str(payload.rating_kw))
+        if product.rating_kw != rating_kw:
+            product.rating_kw = rating_kw
+    if payload.is_active is not None and payload.is_active != product.is_active:
+        product.is_active = payload.is_active
+
+
+def _load_bundle(db: Session, product_id: int) -> Product:
+    product = (
+        _catalog_query(db, active_only=False)
+        .filter(Product.id == product_id)
+        .first()
+    )
+    if not product:
+        raise HTTPException(404, "Product not found")
+    return product
+
+
 @router.post("/", response_model=ProductOut)
 def create_product_bundle(
+    request: Request,
     payload: ProductCreate,
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),
@@ -59,42 +172,217 @@ def create_product_bundle(
         rating_kw=Decimal(str(payload.rating_kw)),
         device_name=payload.starter_type,
     )
-
-    for item in payload.components:
-        component = db.query(Component).get(item.component_id)
-        if not component:
-            raise HTTPException(404, "Component not found")
-
-        product.components.append(
-            ProductComponent(
-                component=component,
-                quantity=item.quantity,
-                unit_price_override=(
-                    Decimal(str(item.unit_price_override))
-                    if item.unit_price_override
-                    else None
-                ),
-            )
-        )
+    components = _resolve_components(db, (item.component_id for item in payload.components))
+    _apply_lines(product, payload.components, components)
 
     db.add(product)
+    db.flush()
+    refresh_bundle_totals(db, [product.id])
     db.commit()
-    db.refresh(product)
+    invalidate_price_matrix()
+    mark_recent_write(request)
+    event_bus.publish("product.created", {"id": product.id})
+
+    return FastJSONResponse(serialize_product(_load_bundle(db, product.id)))
+
+
+_SORTS = {
+    "rating_kw": (Product.rating_kw.asc(), Product.id.asc()),
+    "-rating_kw": (Product.rating_kw.desc(), Product.id.desc()),
+    "starter_type": (Product.starter_type.asc(), Product.rating_kw.asc(), Product.id.asc()),
+    "id": (Product.id.asc(),),
+    "-id": (Product.id.desc(),),
+}
 
-    return serialize_product(product)
+
+def _catalog_query(
+    db: Session,
+    starter_type: str | None = None,
+    brand: str | None = None,
+    active_only: bool = True,
+    fields=PRODUCT_FIELDS,
+):
+    query = db.query(Product)
+    if active_only:
+        query = query.filter(Product.is_active == True)  # noqa: E712
+    if starter_type:
+        query = query.filter(Product.starter_type == starter_type)
+    if brand:
+        query = query.filter(Product.brand_name == brand)
+
+    if not _PRICED_FIELDS.intersection(fields):
+        # e.g. dropdowns asking for id,display_name: no component lines at all
+        return query.options(
+            load_only(Product.id, Product.starter_type, Product.rating_kw),
+            noload(Product.components),
+        )
+    return query.options(
+        selectinload(Product.components).selectinload(ProductComponent.component)
+    )
 
 
 @router.get("/", response_model=list[ProductOut])
 def list_products(
-    db: Session = Depends(get_db),
+    starter_type: Literal["DOL", "RDOL", "S/D"] | None = None,
+    min_kw: float | None = Query(None, ge=0),
+    max_kw: float | None = Query(None, ge=0),
+    brand: str | None = None,
+    active_only: bool | None = None,
+    sort: Literal["rating_kw", "-rating_kw", "starter_type", "id", "-id"] = "starter_type",
+    limit: int | None = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    fields: str | None = FIELDS_QUERY,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Catalog slice, e.g. ?starter_type=S/D&min_kw=7.5&max_kw=15.
+    Runs as a range scan on ix_products_active_starter_rating.
+    active_only defaults to true for users and false for admins, who
+    manage (and reactivate) inactive bundles.
+    """
+    if active_only is None:
+        active_only = current_user.role != "admin"
+    fields = parse_fields(fields, PRODUCT_FIELDS)
+    query = _catalog_query(db, starter_type, brand, active_only, fields)
+    if min_kw is not None:
+        query = query.filter(Product.rating_kw >= Decimal(str(min_kw)))
+    if max_kw is not None:
+        query = query.filter(Product.rating_kw <= Decimal(str(max_kw)))
+
+    query = query.order_by(*_SORTS[sort])
+    if limit is not None:
+        query = query.limit(limit)
+    if offset:
+        query = query.offset(offset)
+
+    return FastJSONResponse([serialize_product(p, fields) for p in query.all()])
+
+
+@router.get("/nearest", response_model=ProductOut)
+def nearest_product(
+    kw: float = Query(..., ge=0),
+    starter_type: Literal["DOL", "RDOL", "S/D"] | None = None,
+    brand: str | None = None,
+    db: Session = Depends(get_read_db),
     _: User = Depends(get_current_user),
 ):
-    products = db.query(Product).all()
-    return [serialize_product(p) for p in products]
+    """
+    Bundle whose rating is closest to `kw`: one index probe upwards and one
+    downwards instead of scanning the catalog. Ties go to the larger rating.
+    """
+    target = Decimal(str(kw))
+
+    above = (
+        _catalog_query(db, starter_type, brand)
+        .filter(Product.rating_kw >= target)
+        .order_by(Product.rating_kw.asc(), Product.id.asc())
+        .first()
+    )
+    below = (
+        _catalog_query(db, starter_type, brand)
+        .filter(Product.rating_kw < target)
+        .order_by(Product.rating_kw.desc(), Product.id.asc())
+        .first()
+    )
+
+    candidates = [p for p in (above, below) if p is not None]
+    if not candidates:
+        raise HTTPException(404, "No matching product")
+
+    best = min(candidates, key=lambda p: (abs(p.rating_kw - target), -p.rating_kw))
+    return FastJSONResponse(serialize_product(best))
+
+
+# ADMIN: EDIT
+def _save_bundles(request: Request, db: Session, product_ids: list[int]) -> None:
+    db.flush()
+    refresh_bundle_totals(db, product_ids)
+    db.commit()
+    invalidate_price_matrix()
+    mark_recent_write(request)
+
+
+@router.patch("/bulk")
+def bulk_update_products(
+    request: Request,
+    payload: ProductBulkPatch,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    """
+    PATCH many bundles in one transaction: all of them are applied or none.
+    Components and bundles are each loaded with a single query.
+    """
+    ids = [item.id for item in payload.items]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(400, "A product is listed twice")
+
+    products = {
+        p.id: p
+        for p in _catalog_query(db, active_only=False).filter(Product.id.in_(ids))
+    }
+    missing = sorted(set(ids) - products.keys())
+    if missing:
+        raise HTTPException(404, f"Products not found: {', '.join(map(str, missing))}")
+
+    components = _resolve_components(
+        db,
+        (line.component_id for item in payload.items for line in item.components or ()),
+    )
+    for item in payload.items:
+        product = products[item.id]
+        _apply_fields(product, item)
+        if item.components is not None:
+            _apply_lines(product, item.components, components)
+
+    _save_bundles(request, db, ids)
+    event_bus.publish("products.updated", {"ids": ids})
+    return {"updated": ids, "count": len(ids)}
+
+
+@router.put("/{product_id}", response_model=ProductOut)
+def replace_product_bundle(
+    request: Request,
+    product_id: int,
+    payload: ProductUpdate,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    """Full edit: `components` is the bundle's complete new line list."""
+    product = _load_bundle(db, product_id)
+    components = _resolve_components(db, (item.component_id for item in payload.components))
+    _apply_fields(product, payload)
+    _apply_lines(product, payload.components, components)
+
+    _save_bundles(request, db, [product_id])
+    event_bus.publish("product.updated", {"id": product_id})
+    return FastJSONResponse(serialize_product(_load_bundle(db, product_id)))
+
+
+@router.patch("/{product_id}", response_model=ProductOut)
+def update_product_bundle(
+    request: Request,
+    product_id: int,
+    payload: ProductPatch,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    """Partial edit; lines are only touched when `components` is given."""
+    product = _load_bundle(db, product_id)
+    _apply_fields(product, payload)
+    if payload.components is not None:
+        components = _resolve_components(db, (item.component_id for item in payload.components))
+        _apply_lines(product, payload.components, components)
+
+    _save_bundles(request, db, [product_id])
+    event_bus.publish("product.updated", {"id": product_id})
+    return FastJSONResponse(serialize_product(_load_bundle(db, product_id)))
 
 
 @router.delete("/{product_id}")
-async def delete_product(
+def delete_product(
+    request: Request,
     product_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
@@ -103,10 +391,43 @@ async def delete_product(
     if not product:
         raise HTTPException(404, "Product not found")
 
-    # Check if product is used in any bill items
-    if product.bill_items:
+    # Check if product is used in any bill items (EXISTS on ix_bill_items_product_id,
+    # instead of loading every bill line ever sold)
+    if product_in_use(db, product_id):
         raise HTTPException(400, "Cannot delete product used in bills")
 
     db.delete(product)
     db.commit()
-    return {"detail": "Product deleted"}
\ No newline at end of file
+    invalidate_price_matrix()
+    mark_recent_write(request)
+    event_bus.publish("product.deleted", {"id": product_id})
+    return {"detail": "Product deleted"}
+
+# WHERE USED
+@router.get("/{product_id}/usage")
+def get_product_usage(
+    product_id: int,
+    db: Session = Depends(get_read_db),
+    _: User = Depends(require_admin),
+):
+    """How many bills (and units) reference this bundle."""
+    if not db.query(exists().where(Product.id == product_id)).scalar():
+        raise HTTPException(404, "Product not found")
+
+    bills_count, units = 0, 0
+    # Archived bills still pin the bundle (they keep their product ids)
+    for model in (BillItem, ArchivedBillItem):
+        bills, qty = (
+            db.query(func.count(func.distinct(model.bill_id)), func.sum(model.quantity))
+            .filter(model.product_id == product_id)
+            .one()
+        )
+        bills_count += bills
+        units += qty or 0
+
+    return {
+        "product_id": product_id,
+        "bills_count": bills_count,
+        "units_sold": int(units or 0),
+        "deletable": bills_count == 0,
+    }
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal, NamedTuple
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from sqlalchemy import case, func, or_, select, update
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db, mark_recent_write
 from app.models.user import User
 from app.auth.jwt_handler import require_admin
-from pydantic import BaseModel
+from app.core.responses import FastJSONResponse
+from app.core.events import event_bus
+from app.core.fields import FIELDS_QUERY, parse_fields, select_columns
+from app.core.email_utils import send_user_approved_emails
+from pydantic import BaseModel, Field
 from app.auth.security import verify_password, hash_password
 
 router = APIRouter(prefix="/admin/users", tags=["Admin Users"])
@@ -12,68 +19,195 @@ class AdminPasswordUpdate(BaseModel):
     current_password: str
     new_password: str
 
+class BulkUserIds(BaseModel):
+    user_ids: list[int] = Field(..., min_length=1, max_length=500)
+
+class BulkStatusUpdate(BulkUserIds):
+    is_active: bool
+
+# Plain copy of what the approval email needs; background tasks run after
+# the request's session is closed
+class Recipient(NamedTuple):
+    email: str
+    first_name: str
+
+# Selectable user columns (?fields=); rows are column selects, never ORM
+# Users, so their bill history is not loaded
+_PENDING_USER_COLUMNS = {
+    "id": User.id,
+    "first_name": User.first_name,
+    "last_name": User.last_name,
+    "email": User.email,
+    "employee_code": User.employee_code,
+    "team": User.team,
+    "created_at": User.created_at,
+}
+_USER_COLUMNS = {
+    **_PENDING_USER_COLUMNS,
+    "role": User.role,
+    "is_active": User.is_active,
+}
+
+
+def _prefix(term: str) -> str:
+    """LIKE pattern for a case-insensitive prefix match (uses the lower(...) indexes)."""
+    escaped = term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _user_directory_query(db: Session, columns: list, q: str | None, team: str | None):
+    query = db.query(*columns).filter(User.role == "user")
+    if team:
+        query = query.filter(User.team == team)
+    terms = q.split() if q else []
+    if len(terms) >= 2:
+        # "jo sm" → first name "jo*" and last name "sm*"
+        query = query.filter(
+            func.lower(User.first_name).like(_prefix(terms[0]), escape="\\"),
+            func.lower(User.last_name).like(_prefix(" ".join(terms[1:])), escape="\\"),
+        )
+    elif terms:
+        term = _prefix(terms[0])
+        query = query.filter(
+            or_(
+                func.lower(User.first_name).like(term, escape="\\"),
+                func.lower(User.last_name).like(term, escape="\\"),
+                func.lower(User.email).like(term, escape="\\"),
+                func.lower(User.employee_code).like(term, escape="\\"),
+            )
+        )
+    return query
+
+
+_STATUS_FILTERS = {
+    "pending": User.is_approved == False,  # noqa: E712
+    "approved": User.is_approved == True,  # noqa: E712
+    "active": (User.is_approved == True) & (User.is_active == True),  # noqa: E712
+    "restricted": (User.is_approved == True) & (User.is_active == False),  # noqa: E712
+}
+
+
+def _rows(query, fields: list[str]) -> list[dict]:
+    return [{f: getattr(r, f) for f in fields} for r in query.order_by(User.id).all()]
+
+
+def _page(query, fields: list[str], cursor: int | None, limit: int) -> dict:
+    """Keyset page by id: ?cursor=<next_cursor> continues after the last row."""
+    if cursor is not None:
+        query = query.filter(User.id > cursor)
+    rows = query.order_by(User.id).limit(limit + 1).all()
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": [{f: getattr(r, f) for f in fields} for r in rows],
+        "next_cursor": rows[-1].user_id if more else None,
+    }
+
+
+# Paged responses are opt-in (?paginate=1, or any ?cursor=): without them
+# the listings stay the bare arrays existing clients expect
+PAGINATE_QUERY = Query(False, description="Return {items, next_cursor, total} pages instead of a bare list")
+
+
 #  GET PENDING USERS
 @router.get("/pending")
 def get_pending_users(
-    db: Session = Depends(get_db),
+    q: str | None = None,
+    team: str | None = None,
+    paginate: bool = PAGINATE_QUERY,
+    cursor: int | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: str | None = FIELDS_QUERY,
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_admin),
 ):
     """
-    Fetch all users waiting for admin approval.
-    A pending user = is_active == False (not allowed to log in yet)
+    Users waiting for admin approval, oldest first: every match as a list,
+    or with ?paginate=1 a page at a time, where `total` counts every
+    pending user matching the filters.
     """
-    pending_users = (
-        db.query(User)
-        .filter(User.role == "user", User.is_approved == False)  # noqa: E712
-        .all()
-    )
+    fields = parse_fields(fields, _PENDING_USER_COLUMNS)
+    columns = select_columns(_PENDING_USER_COLUMNS, fields) + [User.id.label("user_id")]
 
-    return [
-        {
-            "id": u.id,
-            "first_name": u.first_name,
-            "last_name": u.last_name,
-            "email": u.email,
-            "employee_code": u.employee_code,
-            "team": u.team,
-            "created_at": u.created_at,
-        }
-        for u in pending_users
-    ]
+    query = _user_directory_query(db, columns, q, team).filter(_STATUS_FILTERS["pending"])
+    if not paginate and cursor is None:
+        return FastJSONResponse(_rows(query, fields))
+    page = _page(query, fields, cursor, limit)
+
+    total = (
+        _user_directory_query(db, [func.count(User.id)], q, team)
+        .filter(_STATUS_FILTERS["pending"])
+        .scalar()
+    )
+    return FastJSONResponse({**page, "total": total})
 
 
 
 #  GET ALL USERS
 @router.get("/all")
 def get_all_users(
-    db: Session = Depends(get_db),
+    q: str | None = None,
+    team: str | None = None,
+    status: Literal["pending", "approved", "active", "restricted"] | None = None,
+    paginate: bool = PAGINATE_QUERY,
+    cursor: int | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: str | None = FIELDS_QUERY,
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_admin),
 ):
     """
-    Fetch all users for admin panel
+    User directory for the admin panel: prefix search (?q=) on name, email
+    and employee code, team / status filters. A list of every match, or
+    with ?paginate=1 keyset pages by id.
+
+    Pages also carry `counts`: the matching users per status (ignoring
+    ?status=), from one aggregate query.
     """
-    users = db.query(User).filter(User.role == "user").all()
-
-    return [
-        {
-            "id": u.id,
-            "first_name": u.first_name,
-            "last_name": u.last_name,
-            "email": u.email,
-            "employee_code": u.employee_code,
-            "team": u.team,
-            "role": u.role,
-            "is_active": u.is_active,
-            "created_at": u.created_at,
-        }
-        for u in users
-    ]
+    fields = parse_fields(fields, _USER_COLUMNS)
+    columns = select_columns(_USER_COLUMNS, fields) + [User.id.label("user_id")]
+
+    query = _user_directory_query(db, columns, q, team)
+    if status:
+        query = query.filter(_STATUS_FILTERS[status])
+    if not paginate and cursor is None:
+        return FastJSONResponse(_rows(query, fields))
+    page = _page(query, fields, cursor, limit)
+
+    row = _user_directory_query(
+        db,
+        [func.count(User.id)]
+        + [func.count(case((cond, 1))) for cond in _STATUS_FILTERS.values()],
+        q,
+        team,
+    ).one()
+    counts = {"all": row[0], **dict(zip(_STATUS_FILTERS, row[1:]))}
+    return FastJSONResponse({**page, "total": counts[status or "all"], "counts": counts})
+
+
+#  TEAMS (directory filter options)
+@router.get("/teams")
+def get_user_teams(
+    db: Session = Depends(get_read_db),
+    _: User = Depends(require_admin),
+):
+    rows = (
+        db.query(User.team, func.count(User.id))
+        .filter(User.role == "user", User.team.isnot(None))
+        .group_by(User.team)
+        .order_by(User.team)
+        .all()
+    )
+    return [{"team": team, "users": n} for team, n in rows]
 
 
 #  APPROVE USER
 @router.put("/{user_id}/approve")
 def approve_user(
+    request: Request,
     user_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),
 ):
@@ -91,7 +225,12 @@ def approve_user(
     user.is_approved = True
     user.is_active = True
     db.commit()
+    mark_recent_write(request)
+    event_bus.publish("user.approved", {"id": user.id})
     db.refresh(user)
+    background_tasks.add_task(
+        send_user_approved_emails, [Recipient(user.email, user.first_name)]
+    )
 
     return {
         "detail": "User approved successfully",
@@ -104,10 +243,11 @@ def approve_user(
 #  ADMIN DASHBOARD STATS
 from app.models.product import Product
 from app.models.bill import Bill
+from app.services.archive import archived_bills_count
 
 @router.get("/dashboard-stats")
 def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_admin),
 ):
     pending_users = (
@@ -118,7 +258,7 @@ def get_dashboard_stats(
 
     total_users = db.query(User).filter(User.role == "user").count()
     total_products = db.query(Product).count()
-    total_bills = db.query(Bill).count()
+    total_bills = db.query(Bill).count() + archived_bills_count(db)
 
     return {
         "pending_users": pending_users,
@@ -133,6 +273,7 @@ class UserStatusUpdate(BaseModel):
 
 @router.patch("/{user_id}/status")
 def toggle_user_status(
+    request: Request,
     user_id: int,
     status_data: UserStatusUpdate,
     db: Session = Depends(get_db),
@@ -153,10 +294,108 @@ def toggle_user_status(
 
     user.is_active = status_data.is_active
     db.commit()
+    mark_recent_write(request)
+    event_bus.publish("user.status", {"id": user.id, "is_active": status_data.is_active})
     db.refresh(user)
 
     return {"detail": f"User {'activated' if user.is_active else 'deactivated'} successfully"}
 
+# BULK ACTIONS
+# One set-based UPDATE per request instead of a query, commit and refresh per
+# user. Every id gets an outcome, so the UI can report partial success.
+def _outcomes(db: Session, ids: list[int], changed: set[int], changed_as: str, skipped_as: str) -> dict:
+    existing = set(db.execute(select(User.id).where(User.id.in_(ids))).scalars())
+    return {
+        uid: changed_as if uid in changed else skipped_as if uid in existing else "not_found"
+        for uid in ids
+    }
+
+
+@router.post("/bulk-approve")
+def bulk_approve_users(
+    request: Request,
+    payload: BulkUserIds,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    """
+    Approve many pending accounts at once. Outcome per id: approved,
+    already_approved (including restricted users, who stay restricted),
+    admin or not_found. Approval emails go out afterwards over one SMTP
+    session.
+    """
+    ids = list(dict.fromkeys(payload.user_ids))
+    # Same rows as GET /pending: never approved, and not an admin
+    approved = db.execute(
+        update(User)
+        .where(User.id.in_(ids), User.role == "user", _STATUS_FILTERS["pending"])
+        .values(is_approved=True, is_active=True)
+        .returning(User.id, User.email, User.first_name)
+    ).all()
+    admins = set(
+        db.execute(select(User.id).where(User.id.in_(ids), User.role == "admin")).scalars()
+    )
+    results = _outcomes(db, ids, {r.id for r in approved}, "approved", "already_approved")
+    results.update({uid: "admin" for uid in admins})
+    db.commit()
+    mark_recent_write(request)
+
+    if approved:
+        event_bus.publish("users.approved", {"ids": [r.id for r in approved]})
+        background_tasks.add_task(
+            send_user_approved_emails, [Recipient(r.email, r.first_name) for r in approved]
+        )
+
+    return {
+        "approved": len(approved),
+        "results": [{"user_id": uid, "outcome": results[uid]} for uid in ids],
+    }
+
+
+@router.patch("/bulk-status")
+def bulk_update_user_status(
+    request: Request,
+    payload: BulkStatusUpdate,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    """
+    Activate or deactivate many users at once. Outcome per id: activated /
+    deactivated, unchanged, admin (admin accounts are never toggled) or
+    not_found.
+    """
+    ids = list(dict.fromkeys(payload.user_ids))
+    changed = set(
+        db.execute(
+            update(User)
+            .where(
+                User.id.in_(ids),
+                User.role != "admin",
+                User.is_active != payload.is_active,
+            )
+            .values(is_active=payload.is_active)
+            .returning(User.id)
+        ).scalars()
+    )
+    admins = set(
+        db.execute(select(User.id).where(User.id.in_(ids), User.role == "admin")).scalars()
+    )
+    results = _outcomes(
+        db, ids, changed, "activated" if payload.is_active else "deactivated", "unchanged"
+    )
+    results.update({uid: "admin" for uid in admins})
+    db.commit()
+    mark_recent_write(request)
+
+    if changed:
+        event_bus.publish("users.status", {"ids": sorted(changed), "is_active": payload.is_active})
+
+    return {
+        "changed": len(changed),
+        "results": [{"user_id": uid, "outcome": results[uid]} for uid in ids],
+    }
+
 @router.put("/update-password")
 def update_admin_password(
     data: AdminPasswordUpdate,
@@ -170,12 +409,12 @@ def update_admin_password(
             detail="Current password is incorrect"
         )
 
-    # 2. Hash and update with new password
-    current_user.password_hash = hash_password(data.new_password)
+    # 2. Hash and update with new password (current_user may come from
+    # the read session, so the row is loaded again here)
+    admin = db.get(User, current_user.id)
+    admin.password_hash = hash_password(data.new_password)
     
     # 3. Save to database
-    db.add(current_user)
     db.commit()
-    db.refresh(current_user)
 
     return {"detail": "Password updated successfully"}
\ No newline at end of file
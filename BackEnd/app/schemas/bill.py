@@ -1,36 +1,43 @@
 # app/schemas/bill.py
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
+from app.schemas.types import Money, MoneyInput
+
 
 class BillItemInput(BaseModel):
     """
-    One line in the bill – one starter bundle (Product).
+    One line in the bill – one starter bundle (Product), priced on the
+    server from current component prices (app/services/pricing.py).
     quantity will usually be 1 for each bundle.
 
-    override_price:
-        If provided, backend will use this as the bundle price
-        instead of product.total_price (after all discounts).
+    discount_percent:
+        Per-unit discount; at most BILL_MAX_DISCOUNT_PERCENT for users.
+    expected_price:
+        The unit price (after discount) the client showed. If the server
+        quote differs, the bill is rejected and nothing is stored.
     """
     product_id: int
-    quantity: int = 1
-    override_price: float | None = None
+    quantity: int = Field(1, ge=1)
+    discount_percent: float = Field(0, ge=0, le=100)
+    expected_price: MoneyInput | None = None
 
 
 class BillCreate(BaseModel):
     items: List[BillItemInput]
-    # absolute money value, not percent
-    discount_amount: float = 0
+    # absolute money value, not percent; at most BILL_MAX_DISCOUNT_PERCENT
+    # of the subtotal for users
+    discount_amount: MoneyInput = Field(0, ge=0)
     notes: Optional[str] = None
 
 
 class BillOut(BaseModel):
     id: int
     bill_number: str
-    subtotal_amount: float
-    discount_amount: float
-    total_amount: float
+    subtotal_amount: Money
+    discount_amount: Money
+    total_amount: Money
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -40,16 +47,16 @@ class BillItemOut(BaseModel):
     product_id: int
     product_name: str
     quantity: int
-    unit_price: float
-    line_total: float
+    unit_price: Money
+    line_total: Money
 
 
 class BillDetailOut(BaseModel):
     id: int
     bill_number: str
-    subtotal_amount: float
-    discount_amount: float
-    total_amount: float
+    subtotal_amount: Money
+    discount_amount: Money
+    total_amount: Money
     notes: str | None
     created_at: datetime
     items: List[BillItemOut]
@@ -1,11 +1,13 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.schemas.types import Money, MoneyInput
 
 class ComponentBase(BaseModel):
     name: str
     brand_name: str
     model: Optional[str] = None
-    base_unit_price: float
+    base_unit_price: MoneyInput
     is_active: bool = True # Added for visibility toggle
 
 class ComponentCreate(ComponentBase):
@@ -16,6 +18,15 @@ class ComponentUpdate(ComponentBase):
 
 class ComponentOut(ComponentBase):
     id: int
+    base_unit_price: Money
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ComponentPriceChange(BaseModel):
+    component_id: int
+    new_price: MoneyInput = Field(..., ge=0)
+
+class PriceSimulationRequest(BaseModel):
+    changes: List[ComponentPriceChange] = Field(..., min_length=1)
+    top_n: int = Field(20, ge=1, le=500)
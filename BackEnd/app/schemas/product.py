@@ -1,18 +1,20 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Literal
 
+from app.schemas.types import Money, MoneyInput
+
 
 class ProductComponentCreate(BaseModel):
     component_id: int
     quantity: int
-    unit_price_override: Optional[float] = None
+    unit_price_override: Optional[MoneyInput] = None
 
 
 class ProductComponentOut(BaseModel):
     id: int
     quantity: int
-    unit_price: float
-    line_total: float
+    unit_price: Money
+    line_total: Money
     name: str
     brand_name: str
     model: Optional[str]
@@ -24,10 +26,32 @@ class ProductCreate(BaseModel):
     components: List[ProductComponentCreate]
 
 
+class ProductUpdate(ProductCreate):
+    """PUT: the whole bundle; `components` is the complete new line list."""
+    is_active: Optional[bool] = None
+
+
+class ProductPatch(BaseModel):
+    """PATCH: only the given fields change; `components` replaces all lines."""
+    starter_type: Optional[Literal["DOL", "RDOL", "S/D"]] = None
+    rating_kw: Optional[float] = None
+    is_active: Optional[bool] = None
+    components: Optional[List[ProductComponentCreate]] = None
+
+
+class ProductBulkPatchItem(ProductPatch):
+    id: int
+
+
+class ProductBulkPatch(BaseModel):
+    items: List[ProductBulkPatchItem] = Field(..., min_length=1, max_length=500)
+
+
 class ProductOut(BaseModel):
     id: int
     starter_type: str
     rating_kw: float
-    base_price: float
-    total_price: float
+    display_name: str
+    base_price: Money
+    total_price: Money
     components: List[ProductComponentOut]
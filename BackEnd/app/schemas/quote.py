@@ -0,0 +1,45 @@
+# app/schemas/quote.py
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+
+from app.schemas.product import ProductComponentCreate
+
+
+class QuoteConfiguration(BaseModel):
+    """
+    One candidate to price: an existing bundle (product_id) or an ad-hoc
+    list of component lines. Discounts are per unit, percent first.
+    """
+    product_id: Optional[int] = None
+    components: List[ProductComponentCreate] = []
+    quantity: int = Field(1, ge=1)
+    discount_percent: float = Field(0, ge=0, le=100)
+    discount_amount: float = Field(0, ge=0)
+
+    @model_validator(mode="after")
+    def _one_source(self):
+        if (self.product_id is None) == (not self.components):
+            raise ValueError("Provide either product_id or components")
+        return self
+
+
+class QuoteRequest(BaseModel):
+    configurations: List[QuoteConfiguration] = Field(..., max_length=5000)
+    # Applied to every configuration on top of its own discount_percent
+    discount_percent: float = Field(0, ge=0, le=100)
+
+
+class QuoteLineOut(BaseModel):
+    index: int
+    product_id: Optional[int]
+    quantity: int
+    list_price: float
+    unit_price: float
+    discount: float
+    line_total: float
+    error: Optional[str] = None
+
+
+class QuoteOut(BaseModel):
+    items: List[QuoteLineOut]
+    total_amount: float
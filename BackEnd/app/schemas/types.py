@@ -0,0 +1,23 @@
+# app/schemas/types.py
+from typing import Annotated
+
+from pydantic import BeforeValidator, PlainSerializer, WithJsonSchema
+
+from app.core.money import from_cents, to_cents
+
+# Money is int cents inside the app (app/core/money.py) and a plain number
+# in currency units on the wire, both ways.
+
+# Response fields: int cents written out as units
+Money = Annotated[
+    int,
+    PlainSerializer(from_cents, return_type=float, when_used="json"),
+    WithJsonSchema({"type": "number"}),
+]
+
+# Request fields: units as sent by the client, validated into int cents
+MoneyInput = Annotated[
+    int,
+    BeforeValidator(to_cents),
+    WithJsonSchema({"type": "number"}),
+]
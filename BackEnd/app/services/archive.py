@@ -0,0 +1,310 @@
+# app/services/archive.py
+"""
+Archival of closed years out of bills / bill_items.
+
+    python -m app.services.archive run [--keep-years 2] [--batch-size 1000]
+    python -m app.services.archive year 2023
+    python -m app.services.archive status
+    python -m app.services.archive export 2023 --out exports/
+
+A year is moved in id batches: INSERT ... SELECT into bills_archive /
+bill_items_archive, then DELETE from the hot tables, one transaction per
+batch, so an interrupted run leaves every bill on exactly one side and can
+simply be started again. bill_archive_years says where a year lives:
+
+    (no row)      hot tables only
+    in_progress   split across both; reads check both
+    archived      archive tables only
+
+Reads go through bill_models() / find_archived_bill(), which only touch the
+archive when the requested year or bill is in it. Daily rollups are left
+alone, so reports still cover archived years.
+"""
+import argparse
+import gzip
+import os
+import re
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, insert, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.responses import dumps
+from app.models.archive import ArchivedBill, ArchivedBillItem, BillArchiveYear
+from app.models.bill import Bill, BillItem
+
+_BILL_NUMBER_YEAR = re.compile(r"^BS-(\d{4})-")
+
+_BILL_COLUMNS = (
+    "id", "bill_number", "user_id", "subtotal_amount",
+    "discount_amount", "total_amount", "notes", "created_at",
+)
+_ITEM_COLUMNS = ("id", "bill_id", "product_id", "quantity", "unit_price", "line_total")
+
+
+def year_bounds(year: int) -> tuple[datetime, datetime]:
+    """[start, end) of a UTC calendar year."""
+    return (
+        datetime(year, 1, 1, tzinfo=timezone.utc),
+        datetime(year + 1, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def bill_year(bill_number: str) -> int | None:
+    """Year embedded in a generated bill number (BS-YYYY-...)."""
+    match = _BILL_NUMBER_YEAR.match(bill_number)
+    return int(match.group(1)) if match else None
+
+
+# READ ROUTING
+def archive_states(db: Session) -> dict[int, str]:
+    """{year: status} for every year the archival job has touched (a few rows)."""
+    return dict(db.query(BillArchiveYear.year, BillArchiveYear.status).all())
+
+
+def bill_models(db: Session, year: int | None = None, include_archived: bool = False) -> list:
+    """
+    Which of Bill / ArchivedBill a bill listing has to read. Without a year
+    only the hot table is read unless `include_archived` is set.
+    """
+    states = archive_states(db)
+    if year is not None:
+        state = states.get(year)
+        if state == "archived":
+            return [ArchivedBill]
+        if state == "in_progress":
+            return [Bill, ArchivedBill]
+        return [Bill]
+    if include_archived and states:
+        return [Bill, ArchivedBill]
+    return [Bill]
+
+
+def union_rows(db: Session, statements: list, fields: list[str]) -> list[dict]:
+    """
+    Rows of one select per model (same labelled columns plus `sort_key`),
+    merged by sort_key descending. Only `fields` are returned.
+    """
+    rows = (statements[0] if len(statements) == 1 else union_all(*statements)).subquery()
+    result = db.execute(
+        select(*(rows.c[f] for f in fields)).order_by(rows.c.sort_key.desc())
+    )
+    return [dict(r._mapping) for r in result]
+
+
+def find_archived_bill(
+    db: Session,
+    bill_id: int | None = None,
+    bill_number: str | None = None,
+    user_id: int | None = None,
+) -> ArchivedBill | None:
+    """Archived bill by id or number; call after the hot tables came up empty."""
+    states = archive_states(db)
+    if not states:
+        return None
+    # Numbers carry the year they were generated in, which older numbers
+    # took from local time; archival goes by the UTC created_at year, so a
+    # bill from around New Year may sit in the neighbouring year
+    year = bill_year(bill_number) if bill_number is not None else None
+    if year is not None and not states.keys() & {year - 1, year, year + 1}:
+        return None
+
+    query = db.query(ArchivedBill)
+    if bill_id is not None:
+        query = query.filter(ArchivedBill.id == bill_id)
+    if bill_number is not None:
+        query = query.filter(ArchivedBill.bill_number == bill_number)
+    if user_id is not None:
+        query = query.filter(ArchivedBill.user_id == user_id)
+    return query.first()
+
+
+def archived_bills_count(db: Session) -> int:
+    return int(db.query(func.sum(BillArchiveYear.bills_count)).scalar() or 0)
+
+
+# ARCHIVAL
+def ensure_partitions(db: Session, year: int) -> None:
+    """Postgres: the year's partition of both archive tables (no-op elsewhere)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    start, end = year_bounds(year)
+    for table in ("bills_archive", "bill_items_archive"):
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {table}_{year} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+
+
+def _set_state(db: Session, year: int, status: str) -> None:
+    state = db.get(BillArchiveYear, year)
+    if state is None:
+        state = BillArchiveYear(year=year)
+        db.add(state)
+    state.status = status
+    if status == "archived":
+        start, end = year_bounds(year)
+        state.bills_count = (
+            db.query(func.count(ArchivedBill.id))
+            .filter(ArchivedBill.created_at >= start, ArchivedBill.created_at < end)
+            .scalar()
+        )
+        state.items_count = (
+            db.query(func.count(ArchivedBillItem.id))
+            .filter(ArchivedBillItem.bill_created_at >= start, ArchivedBillItem.bill_created_at < end)
+            .scalar()
+        )
+        state.archived_at = datetime.now(timezone.utc)
+
+
+def archive_year(year: int, batch_size: int = 1000) -> int:
+    """Move every bill of a closed UTC year to the archive; returns bills moved."""
+    if year >= datetime.now(timezone.utc).year:
+        raise ValueError(f"{year} is not closed yet")
+
+    from app.db.session import SessionLocal
+
+    start, end = year_bounds(year)
+    db = SessionLocal()
+    try:
+        ensure_partitions(db, year)
+        _set_state(db, year, "in_progress")
+        db.commit()
+
+        moved = 0
+        while True:
+            ids = db.scalars(
+                select(Bill.id)
+                .where(Bill.created_at >= start, Bill.created_at < end)
+                .order_by(Bill.id)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                break
+
+            db.execute(insert(ArchivedBill).from_select(
+                list(_BILL_COLUMNS),
+                select(*(getattr(Bill, c) for c in _BILL_COLUMNS)).where(Bill.id.in_(ids)),
+            ))
+            db.execute(insert(ArchivedBillItem).from_select(
+                [*_ITEM_COLUMNS, "bill_created_at"],
+                select(*(getattr(BillItem, c) for c in _ITEM_COLUMNS), Bill.created_at)
+                .join(Bill, Bill.id == BillItem.bill_id)
+                .where(BillItem.bill_id.in_(ids)),
+            ))
+            db.execute(delete(BillItem).where(BillItem.bill_id.in_(ids)))
+            db.execute(delete(Bill).where(Bill.id.in_(ids)))
+            db.commit()
+            moved += len(ids)
+
+        _set_state(db, year, "archived")
+        db.commit()
+        return moved
+    finally:
+        db.close()
+
+
+def archive_closed_years(keep_years: int, batch_size: int = 1000) -> dict[int, int]:
+    """Archive every year older than the current one minus `keep_years` (skips archived years)."""
+    from app.db.session import SessionLocal
+
+    cutoff = datetime.now(timezone.utc).year - keep_years
+    db = SessionLocal()
+    try:
+        first = db.query(func.min(Bill.created_at)).scalar()
+        done = {year for year, status in archive_states(db).items() if status == "archived"}
+    finally:
+        db.close()
+    if first is None:
+        return {}
+    return {
+        year: archive_year(year, batch_size)
+        for year in range(first.year, cutoff)
+        if year not in done
+    }
+
+
+def export_year(year: int, out_dir: str) -> str:
+    """
+    Gzipped JSON lines of an archived year: one bill with its items per
+    line, money as integer cents.
+    """
+    from app.db.session import SessionLocal
+
+    start, end = year_bounds(year)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"bills-{year}.jsonl.gz")
+
+    db = SessionLocal()
+    try:
+        last_id = 0
+        with gzip.open(path, "wb") as out:
+            while True:
+                bills = (
+                    db.query(ArchivedBill)
+                    .filter(
+                        ArchivedBill.created_at >= start,
+                        ArchivedBill.created_at < end,
+                        ArchivedBill.id > last_id,
+                    )
+                    .order_by(ArchivedBill.id)
+                    .limit(1000)
+                    .all()
+                )
+                if not bills:
+                    break
+                for bill in bills:
+                    row = {c: getattr(bill, c) for c in _BILL_COLUMNS}
+                    row["items"] = [{c: getattr(i, c) for c in _ITEM_COLUMNS} for i in bill.items]
+                    out.write(dumps(row) + b"\n")
+                last_id = bills[-1].id
+                db.expunge_all()
+    finally:
+        db.close()
+    return path
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Bill archival")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="archive every year older than --keep-years")
+    run.add_argument("--keep-years", type=int, default=settings.ARCHIVE_KEEP_YEARS)
+    run.add_argument("--batch-size", type=int, default=1000)
+
+    one = sub.add_parser("year", help="archive one closed year")
+    one.add_argument("year", type=int)
+    one.add_argument("--batch-size", type=int, default=1000)
+
+    sub.add_parser("status", help="archived years")
+
+    export = sub.add_parser("export", help="write an archived year to bills-YYYY.jsonl.gz")
+    export.add_argument("year", type=int)
+    export.add_argument("--out", default=".")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        moved = archive_closed_years(args.keep_years, args.batch_size)
+        for year, n in moved.items():
+            print(f"[ARCHIVE] {year}: {n} bills moved")
+        print(f"--- {sum(moved.values())} bills archived ---")
+    elif args.command == "year":
+        n = archive_year(args.year, args.batch_size)
+        print(f"--- {args.year}: {n} bills archived ---")
+    elif args.command == "status":
+        from app.db.session import SessionLocal
+
+        db = SessionLocal()
+        try:
+            for state in db.query(BillArchiveYear).order_by(BillArchiveYear.year):
+                print(f"{state.year}  {state.status:<12}{state.bills_count:>8} bills{state.items_count:>8} items")
+        finally:
+            db.close()
+    elif args.command == "export":
+        print(export_year(args.year, args.out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# app/services/invoice_pdf.py
+"""
+Invoice PDF layout, written directly as PDF objects (standard Helvetica
+fonts, no external dependency).
+
+Only the standard library is imported here: this module is what the
+invoice worker processes load (see app/services/invoices.py).
+"""
+import zlib
+from datetime import datetime
+
+# Bump whenever the layout changes – cached PDFs are keyed by it
+TEMPLATE_VERSION = 1
+
+PAGE_W, PAGE_H = 595, 842  # A4 in points
+MARGIN = 50
+ROWS_PER_PAGE = 32
+
+# Helvetica advance widths (1/1000 em) for the characters used in amounts;
+# everything else is measured as an average glyph
+_WIDTHS = {**{d: 556 for d in "0123456789"}, ",": 278, ".": 278, "-": 333, " ": 278}
+
+
+def _text_width(text: str, size: float) -> float:
+    return sum(_WIDTHS.get(ch, 556) for ch in text) * size / 1000
+
+
+def _escape(text: str) -> bytes:
+    raw = str(text).encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _money(value) -> str:
+    return f"{value or 0:,.2f}"
+
+
+def _wrap(text: str, width: int = 95) -> list[str]:
+    lines = []
+    for paragraph in str(text).splitlines() or [""]:
+        line = ""
+        for word in paragraph.split():
+            if line and len(line) + 1 + len(word) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        lines.append(line)
+    return lines
+
+
+class _Canvas:
+    def __init__(self):
+        self.ops: list[bytes] = []
+
+    def text(self, x, y, text, size=10, bold=False, right=False):
+        if right:
+            x -= _text_width(str(text), size)
+        font = b"/F2" if bold else b"/F1"
+        self.ops.append(
+            b"BT %s %g Tf %.2f %.2f Td (%s) Tj ET" % (font, size, x, y, _escape(text))
+        )
+
+    def line(self, x1, y1, x2, y2, width=0.5):
+        self.ops.append(b"%g w %.2f %.2f m %.2f %.2f l S" % (width, x1, y1, x2, y2))
+
+    def stream(self) -> bytes:
+        return b"\n".join(self.ops)
+
+
+# Column positions: #, item, qty (right), unit price (right), amount (right)
+_COLS = (MARGIN, MARGIN + 25, 370, 460, PAGE_W - MARGIN)
+
+
+def _page(detail: dict, rows: list[dict], first_row: int, page_no: int, pages: int, last: bool) -> bytes:
+    c = _Canvas()
+    right = PAGE_W - MARGIN
+
+    c.text(MARGIN, 790, "BillSwift", size=20, bold=True)
+    c.text(right, 790, "INVOICE", size=20, bold=True, right=True)
+    c.line(MARGIN, 775, right, 775, width=1)
+
+    created = detail.get("created_at")
+    date_text = created.strftime("%d %b %Y") if isinstance(created, datetime) else str(created or "")
+    y = 750
+    for label, value in (
+        ("Invoice no.", detail["bill_number"]),
+        ("Date", date_text),
+        ("Prepared by", detail.get("prepared_by") or "-"),
+    ):
+        c.text(MARGIN, y, label, size=9)
+        c.text(MARGIN + 80, y, value, size=10, bold=label == "Invoice no.")
+        y -= 15
+
+    y = 680
+    for x, title, align_right in zip(_COLS, ("#", "Item", "Qty", "Unit price", "Amount"), (0, 0, 1, 1, 1)):
+        c.text(x, y, title, size=9, bold=True, right=bool(align_right))
+    c.line(MARGIN, y - 6, right, y - 6)
+
+    y -= 22
+    for i, item in enumerate(rows, start=first_row + 1):
+        c.text(_COLS[0], y, str(i), size=9)
+        c.text(_COLS[1], y, item["product_name"], size=10)
+        c.text(_COLS[2], y, str(item["quantity"]), size=10, right=True)
+        c.text(_COLS[3], y, _money(item["unit_price"]), size=10, right=True)
+        c.text(_COLS[4], y, _money(item["line_total"]), size=10, right=True)
+        y -= 18
+
+    if last:
+        c.line(_COLS[2] - 40, y + 8, right, y + 8)
+        y -= 8
+        for label, value, bold in (
+            ("Subtotal", _money(detail["subtotal_amount"]), False),
+            ("Discount", "-" + _money(detail["discount_amount"]), False),
+            ("Total", _money(detail["total_amount"]), True),
+        ):
+            c.text(_COLS[3], y, label, size=10, bold=bold, right=True)
+            c.text(_COLS[4], y, value, size=11 if bold else 10, bold=bold, right=True)
+            y -= 16
+
+        if detail.get("notes"):
+            y -= 14
+            c.text(MARGIN, y, "Notes", size=9, bold=True)
+            for line in _wrap(detail["notes"])[:12]:
+                y -= 13
+                c.text(MARGIN, y, line, size=9)
+
+    c.line(MARGIN, 60, right, 60)
+    c.text(MARGIN, 45, detail["bill_number"], size=8)
+    c.text(right, 45, f"Page {page_no} of {pages}", size=8, right=True)
+    return c.stream()
+
+
+def render_invoice_pdf(detail: dict) -> bytes:
+    """
+    PDF bytes for a bill detail payload (see bill_detail() in
+    app/routers/bill.py) plus an optional "prepared_by".
+    """
+    items = detail["items"]
+    chunks = [items[i:i + ROWS_PER_PAGE] for i in range(0, len(items), ROWS_PER_PAGE)] or [[]]
+
+    # Object numbers: 1 catalog, 2 pages, 3-4 fonts, then (page, content) pairs
+    objects: list[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # pages, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for n, rows in enumerate(chunks):
+        content = zlib.compress(
+            _page(detail, rows, n * ROWS_PER_PAGE, n + 1, len(chunks), n == len(chunks) - 1)
+        )
+        page_obj = len(objects) + 1
+        kids.append(b"%d 0 R" % page_obj)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_W, PAGE_H, page_obj + 1)
+        )
+        objects.append(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(content), content)
+        )
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, obj)
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
@@ -0,0 +1,125 @@
+# app/services/invoices.py
+"""
+Invoice PDFs: rendering off the API workers, plus a disk cache.
+
+    get_invoice_pdf(detail)       – one invoice (cache, else render)
+    get_invoice_pdfs(details)     – many, misses rendered in parallel
+
+Rendering runs in a small process pool (INVOICE_WORKERS) shared by the
+worker's requests; at most INVOICE_MAX_PENDING renders wait for it, beyond
+that callers get InvoiceBusy instead of queueing without limit.
+
+Bills never change once created, so a PDF is stored under the SHA-256 of
+the template version and the invoice data: the same bill renders once
+and any layout change (TEMPLATE_VERSION) or differing data gets a new file.
+"""
+import hashlib
+import os
+import pathlib
+import tempfile
+import threading
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+from app.core.responses import dumps
+from app.services.invoice_pdf import TEMPLATE_VERSION, render_invoice_pdf
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+class InvoiceBusy(Exception):
+    """Too many renders already waiting for the pool."""
+
+
+_pool: "ProcessPoolExecutor | None" = None
+_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(settings.INVOICE_MAX_PENDING)
+
+
+def _get_pool() -> "ProcessPoolExecutor":
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn: API workers run threads, which fork does not copy safely
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.INVOICE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+# CACHE
+def cache_key(detail: dict) -> str:
+    return hashlib.sha256(
+        b"v%d:" % TEMPLATE_VERSION + dumps(detail)
+    ).hexdigest()
+
+
+def _cache_path(key: str) -> pathlib.Path:
+    return pathlib.Path(settings.INVOICE_CACHE_DIR) / key[:2] / f"{key}.pdf"
+
+
+def _cache_get(key: str) -> bytes | None:
+    try:
+        return _cache_path(key).read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _cache_put(key: str, pdf: bytes) -> None:
+    path = _cache_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename: concurrent readers never see a partial file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(pdf)
+    os.replace(tmp, path)
+
+
+# RENDERING
+def _render(details: list[dict]) -> list[bytes]:
+    """Render in the pool, holding one pending slot per invoice."""
+    acquired = 0
+    try:
+        for _ in details:
+            if not _pending.acquire(timeout=settings.INVOICE_QUEUE_TIMEOUT_SECONDS):
+                raise InvoiceBusy()
+            acquired += 1
+        return list(_get_pool().map(render_invoice_pdf, details, chunksize=8))
+    finally:
+        for _ in range(acquired):
+            _pending.release()
+
+
+def get_invoice_pdf(detail: dict) -> tuple[str, bytes]:
+    """(cache key, PDF bytes) – the key doubles as an ETag."""
+    return get_invoice_pdfs([detail])[0]
+
+
+def get_invoice_pdfs(details: list[dict]) -> list[tuple[str, bytes]]:
+    keys = [cache_key(d) for d in details]
+    pdfs = [_cache_get(k) for k in keys]
+
+    missing = [i for i, pdf in enumerate(pdfs) if pdf is None]
+    # Large batches go through the pool in slices no bigger than the
+    # pending limit, so one month-end export cannot starve single requests
+    step = max(1, settings.INVOICE_MAX_PENDING // 2)
+    for start in range(0, len(missing), step):
+        batch = missing[start:start + step]
+        for i, pdf in zip(batch, _render([details[i] for i in batch])):
+            _cache_put(keys[i], pdf)
+            pdfs[i] = pdf
+
+    return list(zip(keys, pdfs))
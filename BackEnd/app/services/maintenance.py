@@ -0,0 +1,104 @@
+# app/services/maintenance.py
+"""
+Periodic maintenance jobs, run by the in-process scheduler
+(app/core/scheduler.py). register_jobs() is called once at startup.
+
+    catalog.prune_tombstones  daily; drops catalog tombstones past retention
+    pricing.warm_matrix       every worker, just inside the price matrix TTL;
+                              a rebuild only after catalog changes
+    bills.archive             daily; moves closed years to the archive
+    bills.reconcile           weekly; bill / line total integrity report
+
+The two bills.* jobs are batch work (a bulk move, a process pool) that
+should not share an API worker by default: they are only registered with
+SCHEDULER_BATCH_JOBS=true. Without it, run `python -m app.services.archive run`
+and `python -m app.services.reconcile run` from the system scheduler instead.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select, update
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.catalog import CatalogTombstone, CatalogVersion
+
+logger = logging.getLogger(__name__)
+
+
+def prune_catalog_tombstones() -> int:
+    """
+    Delete tombstones older than CATALOG_TOMBSTONE_RETENTION_DAYS and move
+    catalog_version.pruned_through past them, so clients that synced before
+    the pruned deletions get a full catalog instead of missing them.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.CATALOG_TOMBSTONE_RETENTION_DAYS)
+    with SessionLocal() as db:
+        through = db.execute(
+            select(func.max(CatalogTombstone.row_version)).where(CatalogTombstone.deleted_at < cutoff)
+        ).scalar()
+        if through is None:
+            return 0
+        pruned = db.execute(
+            delete(CatalogTombstone).where(CatalogTombstone.row_version <= through)
+        ).rowcount
+        db.execute(
+            update(CatalogVersion)
+            .where(CatalogVersion.id == 1, CatalogVersion.pruned_through < through)
+            .values(pruned_through=through)
+        )
+        db.commit()
+    logger.info("catalog tombstones pruned", extra={"pruned": pruned, "through": through})
+    return pruned
+
+
+def warm_price_matrix() -> None:
+    from app.services.pricing import warm_price_matrix as warm
+
+    with SessionLocal() as db:
+        warm(db)
+
+
+def archive_closed_years() -> None:
+    from app.services.archive import archive_closed_years as archive
+
+    moved = archive(settings.ARCHIVE_KEEP_YEARS)
+    if moved:
+        logger.info("bills archived", extra={"years": moved})
+
+
+def reconcile_bills() -> None:
+    """
+    Weekly integrity check into RECONCILE_REPORT_DIR/reconcile-YYYYMMDD.jsonl.
+    A run cut short by a restart resumes from its checkpoint the next time.
+    """
+    import os
+
+    from app.services.reconcile import reconcile
+
+    os.makedirs(settings.RECONCILE_REPORT_DIR, exist_ok=True)
+    day = datetime.now(timezone.utc).strftime("%Y%m%d")
+    out = os.path.join(settings.RECONCILE_REPORT_DIR, f"reconcile-{day}.jsonl")
+    state = reconcile(
+        out,
+        workers=settings.RECONCILE_WORKERS,
+        chunk_size=settings.RECONCILE_CHUNK_SIZE,
+        resume=True,
+    )
+    if state["mismatches"]:
+        logger.warning("bill mismatches found", extra={"mismatches": state["mismatches"], "report": out})
+
+
+def register_jobs(scheduler) -> None:
+    scheduler.add_job("catalog.prune_tombstones", prune_catalog_tombstones, cron="15 3 * * *")
+    # Checked a little before the TTL runs out, so requests find it fresh;
+    # rebuilt only when the catalog version moved
+    scheduler.add_job(
+        "pricing.warm_matrix",
+        warm_price_matrix,
+        every=max(settings.PRICE_MATRIX_TTL_SECONDS * 0.8, 1),
+        leader=False,
+    )
+    if settings.SCHEDULER_BATCH_JOBS:
+        scheduler.add_job("bills.archive", archive_closed_years, cron="30 2 * * *")
+        scheduler.add_job("bills.reconcile", reconcile_bills, cron="0 4 * * 0")
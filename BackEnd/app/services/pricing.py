@@ -0,0 +1,388 @@
+# app/services/pricing.py
+"""
+Server-side bundle pricing.
+
+A bundle's price is the sum over its ProductComponent lines of
+quantity × (unit_price_override if set, else component.base_unit_price).
+
+PriceMatrix holds every line of every bundle as flat NumPy arrays (a sparse
+product × component matrix in CSR layout) with money in integer cents, so
+pricing any number of bundles or ad-hoc configurations is a couple of
+vectorized gathers and one np.bincount.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.lazy import LazyModule
+from app.core.money import from_cents, to_cents
+from app.models.catalog import CatalogVersion
+from app.models.component import Component
+from app.models.product import Product
+from app.models.product_component import ProductComponent
+
+# Imported on the first pricing call, not at app startup
+np = LazyModule("numpy")
+
+
+@dataclass(frozen=True)
+class PriceMatrix:
+    # Sorted ids; position in the array is the row/column index
+    product_ids: np.ndarray
+    product_active: np.ndarray
+    component_ids: np.ndarray
+    component_price: np.ndarray  # cents, per component index
+
+    # Bundle lines in CSR order: lines of product i are indptr[i]:indptr[i+1]
+    indptr: np.ndarray
+    line_component: np.ndarray  # component index
+    line_qty: np.ndarray
+    line_override: np.ndarray  # cents, only meaningful where has_override
+    line_has_override: np.ndarray
+
+    built_at: float
+    # catalog_version.value the lines and prices were read at
+    catalog_version: int
+
+    @property
+    def line_product(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.product_ids)), np.diff(self.indptr))
+
+    def line_unit_prices(self, component_price: np.ndarray | None = None) -> np.ndarray:
+        prices = self.component_price if component_price is None else component_price
+        return np.where(self.line_has_override, self.line_override, prices[self.line_component])
+
+    def bundle_prices(self, component_price: np.ndarray | None = None) -> np.ndarray:
+        """Price in cents of every bundle (aligned with product_ids)."""
+        line_totals = self.line_unit_prices(component_price) * self.line_qty
+        return _sum_by(self.line_product, line_totals, len(self.product_ids))
+
+    @staticmethod
+    def lookup(ids: np.ndarray, universe: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Map ids to indices in sorted `universe`; returns (indices, found_mask)."""
+        if len(universe) == 0:
+            return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+        idx = np.clip(np.searchsorted(universe, ids), 0, len(universe) - 1)
+        return idx, universe[idx] == ids
+
+
+def _take(values: np.ndarray, idx: np.ndarray, fill) -> np.ndarray:
+    if len(values) == 0:
+        return np.full(len(idx), fill, dtype=values.dtype)
+    return values[idx]
+
+
+def _sum_by(groups: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    # float64 sums of integer cents are exact far beyond any realistic total
+    return np.rint(np.bincount(groups, weights=values, minlength=size)).astype(np.int64)
+
+
+def build_price_matrix(db: Session, product_ids: list[int] | None = None) -> PriceMatrix:
+    """Load bundle lines and component prices (optionally for a few products only)."""
+    product_q = select(Product.id, Product.is_active).order_by(Product.id)
+    line_q = select(
+        ProductComponent.product_id,
+        ProductComponent.component_id,
+        ProductComponent.quantity,
+        ProductComponent.unit_price_override,
+    ).order_by(ProductComponent.product_id, ProductComponent.id)
+    component_q = select(Component.id, Component.base_unit_price).order_by(Component.id)
+
+    if product_ids is not None:
+        product_q = product_q.where(Product.id.in_(product_ids))
+        line_q = line_q.where(ProductComponent.product_id.in_(product_ids))
+        component_q = component_q.where(
+            Component.id.in_(
+                select(ProductComponent.component_id).where(
+                    ProductComponent.product_id.in_(product_ids)
+                )
+            )
+        )
+
+    version = _catalog_version(db)
+    products = db.execute(product_q).all()
+    lines = db.execute(line_q).all()
+    components = db.execute(component_q).all()
+
+    pids = np.array([p.id for p in products], dtype=np.int64)
+    cids = np.array([c.id for c in components], dtype=np.int64)
+
+    line_pid = np.array([l.product_id for l in lines], dtype=np.int64)
+    line_cid = np.array([l.component_id for l in lines], dtype=np.int64)
+
+    counts = np.bincount(np.searchsorted(pids, line_pid), minlength=len(pids))
+    indptr = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    return PriceMatrix(
+        product_ids=pids,
+        product_active=np.array([bool(p.is_active) for p in products], dtype=bool),
+        component_ids=cids,
+        component_price=np.array([c.base_unit_price for c in components], dtype=np.int64),
+        indptr=indptr,
+        line_component=np.searchsorted(cids, line_cid),
+        line_qty=np.array([l.quantity for l in lines], dtype=np.int64),
+        line_override=np.array(
+            [l.unit_price_override if l.unit_price_override is not None else 0 for l in lines],
+            dtype=np.int64,
+        ),
+        line_has_override=np.array([l.unit_price_override is not None for l in lines], dtype=bool),
+        built_at=time.monotonic(),
+        catalog_version=version,
+    )
+
+
+def _catalog_version(db: Session) -> int:
+    # Every catalog write bumps it (app/models/catalog.py): one PK lookup
+    return db.execute(select(CatalogVersion.value).where(CatalogVersion.id == 1)).scalar() or 0
+
+
+# CACHE
+# One matrix per worker, dropped when this worker changes a product /
+# component (invalidate_price_matrix()). After PRICE_MATRIX_TTL_SECONDS it is
+# checked against the catalog version, which sees other workers' changes
+# too, and only rebuilt when that moved.
+_cache: dict[str, PriceMatrix | None] = {"matrix": None}
+_cache_lock = threading.Lock()
+
+
+def invalidate_price_matrix() -> None:
+    _cache["matrix"] = None
+
+
+def get_price_matrix(db: Session) -> PriceMatrix:
+    matrix = _cache["matrix"]
+    if matrix is not None and time.monotonic() - matrix.built_at < settings.PRICE_MATRIX_TTL_SECONDS:
+        return matrix
+
+    with _cache_lock:
+        matrix = _cache["matrix"]
+        if matrix is None or time.monotonic() - matrix.built_at >= settings.PRICE_MATRIX_TTL_SECONDS:
+            matrix = _refreshed(db, matrix)
+        return matrix
+
+
+def _refreshed(db: Session, matrix: PriceMatrix | None) -> PriceMatrix:
+    # Caller holds _cache_lock
+    if matrix is not None and matrix.catalog_version == _catalog_version(db):
+        matrix = replace(matrix, built_at=time.monotonic())
+    else:
+        matrix = build_price_matrix(db)
+    _cache["matrix"] = matrix
+    return matrix
+
+
+def warm_price_matrix(db: Session) -> PriceMatrix:
+    """
+    Bring this worker's matrix up to date before requests need it: a
+    catalog version check, and a rebuild only when the catalog changed.
+    """
+    with _cache_lock:
+        return _refreshed(db, _cache["matrix"])
+
+
+# MATERIALIZED TOTALS
+def refresh_bundle_totals(db: Session, product_ids) -> None:
+    """
+    Store the current price of the given bundles (ids, or a select of ids)
+    in products.base_price / total_price, in one UPDATE. Call after the
+    line changes are flushed.
+    """
+    lines_total = (
+        select(
+            func.coalesce(
+                func.sum(
+                    ProductComponent.quantity
+                    * func.coalesce(ProductComponent.unit_price_override, Component.base_unit_price)
+                ),
+                0,
+            )
+        )
+        .join(Component, Component.id == ProductComponent.component_id)
+        .where(ProductComponent.product_id == Product.id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Product)
+        .where(Product.id.in_(product_ids))
+        .values(base_price=lines_total, total_price=lines_total)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# QUOTES
+def _quote_cents(matrix: PriceMatrix, configurations: list, discount_percent: float = 0) -> dict:
+    """
+    Price many candidate configurations in one vectorized pass.
+
+    Each configuration is either an existing bundle (product_id) or an
+    ad-hoc list of component lines, with a quantity and optional per-unit
+    discounts. discount_percent applies to every configuration on top of
+    its own discount_percent; absolute discounts are taken after percentages.
+    Returns per-configuration arrays in cents, plus {index: error}.
+    """
+    n = len(configurations)
+    errors: dict[int, str] = {}
+
+    # 1. Lines coming from existing bundles: expand CSR rows of each product
+    bundle_cfg = [i for i, c in enumerate(configurations) if c.product_id is not None]
+    bundle_pids = np.array([configurations[i].product_id for i in bundle_cfg], dtype=np.int64)
+    p_idx, p_found = matrix.lookup(bundle_pids, matrix.product_ids)
+    p_ok = p_found & _take(matrix.product_active, p_idx, False)
+
+    for i, pid, ok in zip(bundle_cfg, bundle_pids, p_ok):
+        if not ok:
+            errors[i] = f"Product {pid} not found"
+
+    cfg_of_bundle = np.array(bundle_cfg, dtype=np.int64)[p_ok]
+    rows = p_idx[p_ok]
+    starts, counts = matrix.indptr[rows], matrix.indptr[rows + 1] - matrix.indptr[rows]
+    firsts = np.concatenate((np.zeros(1, dtype=np.int64), np.cumsum(counts)[:-1]))
+    offsets = np.repeat(starts - firsts[: len(starts)], counts)
+    bundle_lines = offsets + np.arange(counts.sum())
+
+    unit = matrix.line_unit_prices()
+    b_cfg = np.repeat(cfg_of_bundle, counts)
+    b_totals = unit[bundle_lines] * matrix.line_qty[bundle_lines]
+
+    # 2. Ad-hoc component lines
+    adhoc = [
+        (i, line)
+        for i, c in enumerate(configurations)
+        if c.product_id is None
+        for line in c.components
+    ]
+    a_cfg = np.array([i for i, _ in adhoc], dtype=np.int64)
+    a_cids = np.array([l.component_id for _, l in adhoc], dtype=np.int64)
+    a_qty = np.array([l.quantity for _, l in adhoc], dtype=np.int64)
+    a_has_override = np.array([l.unit_price_override is not None for _, l in adhoc], dtype=bool)
+    # unit_price_override is MoneyInput, already in cents
+    a_override = np.array(
+        [l.unit_price_override if l.unit_price_override is not None else 0 for _, l in adhoc],
+        dtype=np.int64,
+    )
+    c_idx, c_found = matrix.lookup(a_cids, matrix.component_ids)
+    for i, cid, ok in zip(a_cfg, a_cids, c_found):
+        if not ok:
+            errors.setdefault(int(i), f"Component {cid} not found")
+
+    a_unit = np.where(a_has_override, a_override, _take(matrix.component_price, c_idx, 0))
+    a_totals = np.where(c_found, a_unit * a_qty, 0)
+
+    # 3. One reduction over all lines → unit price per configuration
+    all_cfg = np.concatenate((b_cfg, a_cfg))
+    unit_price = _sum_by(all_cfg, np.concatenate((b_totals, a_totals)), n)
+    line_count = np.bincount(all_cfg, minlength=n)
+
+    quantity = np.array([c.quantity for c in configurations], dtype=np.int64)
+    pct = np.array([c.discount_percent for c in configurations], dtype=np.float64) + discount_percent
+    pct = np.clip(pct, 0, 100)
+    flat = np.array([to_cents(c.discount_amount) for c in configurations], dtype=np.int64)
+
+    discounted = np.rint(unit_price * (1 - pct / 100)).astype(np.int64) - flat
+    discounted = np.maximum(discounted, 0)
+    return {
+        "list_price": unit_price,
+        "unit_price": discounted,
+        "quantity": quantity,
+        "line_total": discounted * quantity,
+        "lines": line_count,
+        "errors": errors,
+    }
+
+
+def quote(matrix: PriceMatrix, configurations: list, discount_percent: float = 0) -> list[dict]:
+    """Quote configurations (see _quote_cents), money in units for the API."""
+    q = _quote_cents(matrix, configurations, discount_percent)
+    return [
+        {
+            "index": i,
+            "product_id": configurations[i].product_id,
+            "quantity": int(q["quantity"][i]),
+            "list_price": from_cents(q["list_price"][i]),
+            "unit_price": from_cents(q["unit_price"][i]),
+            "discount": from_cents(q["list_price"][i] - q["unit_price"][i]),
+            "line_total": from_cents(q["line_total"][i]),
+            "error": q["errors"].get(i),
+        }
+        for i in range(len(configurations))
+    ]
+
+
+def price_bill_lines(db: Session, lines: list) -> list[dict]:
+    """
+    Server quote for bill lines (product_id, quantity, discount_percent) on
+    fresh, uncached prices. Per line: list_price / unit_price / line_total
+    in cents, or an error for unknown, inactive or component-less bundles.
+    """
+    matrix = build_price_matrix(db, product_ids=sorted({line.product_id for line in lines}))
+    q = _quote_cents(matrix, lines)
+    priced = []
+    for i, line in enumerate(lines):
+        error = q["errors"].get(i)
+        if error is None and not q["lines"][i]:
+            error = f"Product {line.product_id} has no components to price"
+        priced.append({
+            "product_id": line.product_id,
+            "quantity": int(q["quantity"][i]),
+            "list_price": int(q["list_price"][i]),
+            "unit_price": int(q["unit_price"][i]),
+            "line_total": int(q["line_total"][i]),
+            "found": i not in q["errors"],
+            "error": error,
+        })
+    return priced
+
+
+# WHAT-IF SIMULATION
+def simulate_price_changes(matrix: PriceMatrix, new_prices: dict[int, int], top_n: int = 20) -> dict:
+    """
+    Re-price every bundle with some component base prices replaced
+    (component id → new price in cents) in one vectorized pass.
+
+    Lines with a unit_price_override are unaffected by base price changes.
+    Returns counts plus the top_n bundles by absolute price delta.
+    """
+    ids = np.array(list(new_prices), dtype=np.int64)
+    idx, found = matrix.lookup(ids, matrix.component_ids)
+
+    proposed = matrix.component_price.copy()
+    proposed[idx[found]] = np.array(list(new_prices.values()), dtype=np.int64)[found]
+
+    changed = np.zeros(len(matrix.component_ids), dtype=bool)
+    changed[idx[found]] = True
+
+    before = matrix.bundle_prices()
+    after = matrix.bundle_prices(proposed)
+    delta = after - before
+
+    # Bundles with at least one non-overridden line on a changed component
+    uses_changed = changed[matrix.line_component] & ~matrix.line_has_override
+    affected = np.bincount(matrix.line_product, weights=uses_changed, minlength=len(matrix.product_ids)) > 0
+
+    k = min(top_n, int(affected.sum()))
+    candidates = np.flatnonzero(affected)
+    if k and len(candidates) > k:
+        order = np.argpartition(-np.abs(delta[candidates]), k - 1)[:k]
+        candidates = candidates[order]
+    top = candidates[np.argsort(-np.abs(delta[candidates]), kind="stable")][:k]
+
+    return {
+        "unknown_component_ids": [int(i) for i in ids[~found]],
+        "affected_bundles": int(affected.sum()),
+        "total_delta": int(delta[affected].sum()),
+        "top": [
+            {
+                "product_id": int(matrix.product_ids[i]),
+                "old_price": int(before[i]),
+                "new_price": int(after[i]),
+                "delta": int(delta[i]),
+            }
+            for i in top
+        ],
+    }
@@ -0,0 +1,276 @@
+# app/services/reconcile.py
+"""
+Bill integrity reconciler.
+
+    python -m app.services.reconcile run [--workers 4] [--chunk-size 50000]
+                                         [--archive] [--out reconcile.jsonl] [--resume]
+
+Checks, per bill, in integer cents:
+
+    line_total   bill_items.line_total == unit_price * quantity
+    subtotal     bills.subtotal_amount == SUM(bill_items.line_total)
+    total        bills.total_amount == max(subtotal_amount - discount_amount, 0)
+    no_items     the bill has at least one item
+
+Bills are split into keyset ranges of --chunk-size ids (id >= lo AND
+id < hi, on the primary key and ix_bill_items_bill_id) that a process pool
+checks with two aggregate queries each; only mismatching rows leave the
+database. Plain SELECTs in short per-chunk transactions take no locks that
+block billing, and they go to READ_DATABASE_URL when a replica is set.
+--archive checks bills_archive / bill_items_archive instead.
+
+Mismatches are appended to --out as JSON lines as chunks finish. Next to it,
+<out>.checkpoint records the finished chunks and the report's length after
+their lines (written after them), so --resume after an interruption first
+cuts off lines of chunks that never made it into the checkpoint, then only
+checks what is left.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.responses import dumps
+from app.db.types import as_units
+from app.models.archive import ArchivedBill, ArchivedBillItem
+from app.models.bill import Bill, BillItem
+
+logger = logging.getLogger(__name__)
+
+_SOURCES = {"bills": (Bill, BillItem), "archive": (ArchivedBill, ArchivedBillItem)}
+
+
+def _cents(column):
+    """Money column as integer cents in SQL (exact on Postgres, float-safe on SQLite)."""
+    return func.round(as_units(column) * 100)
+
+
+# CHECKS (run in pool workers)
+def _init_worker():
+    # Connections inherited from the parent must not be shared
+    from app.db.session import read_engine
+
+    read_engine.dispose(close=False)
+
+
+def check_range(source: str, lo: int, hi: int) -> tuple[int, int, list[dict]]:
+    """
+    Check bills with lo <= id < hi. Returns (bills checked, items checked,
+    mismatches).
+    """
+    from app.db.session import ReadSessionLocal
+
+    bill_model, item_model = _SOURCES[source]
+    mismatches = []
+
+    db: Session = ReadSessionLocal()
+    try:
+        # Line level: line_total vs unit_price * quantity
+        item_count = db.execute(
+            select(func.count(item_model.id)).where(item_model.bill_id >= lo, item_model.bill_id < hi)
+        ).scalar()
+        line_cents, unit_cents = _cents(item_model.line_total), _cents(item_model.unit_price)
+        for row in db.execute(
+            select(item_model.id, item_model.bill_id, item_model.quantity, unit_cents, line_cents)
+            .where(
+                item_model.bill_id >= lo,
+                item_model.bill_id < hi,
+                line_cents != unit_cents * item_model.quantity,
+            )
+            .order_by(item_model.id)
+        ):
+            item_id, bill_id, quantity, unit, line = row
+            mismatches.append({
+                "check": "line_total", "source": source, "bill_id": bill_id, "item_id": item_id,
+                "expected": int(unit) * quantity, "actual": int(line),
+                "quantity": quantity, "unit_price": int(unit),
+            })
+
+        # Bill level: subtotal vs its lines, total vs subtotal - discount
+        items = (
+            select(
+                item_model.bill_id,
+                func.sum(_cents(item_model.line_total)).label("lines"),
+                func.count(item_model.id).label("n"),
+            )
+            .where(item_model.bill_id >= lo, item_model.bill_id < hi)
+            .group_by(item_model.bill_id)
+            .subquery()
+        )
+        subtotal = _cents(bill_model.subtotal_amount)
+        discount = _cents(bill_model.discount_amount)
+        total = _cents(bill_model.total_amount)
+        lines = func.coalesce(items.c.lines, 0)
+        expected_total = case((subtotal > discount, subtotal - discount), else_=0)
+        for row in db.execute(
+            select(
+                bill_model.id, bill_model.bill_number, subtotal, discount, total,
+                lines, func.coalesce(items.c.n, 0),
+            )
+            .outerjoin(items, items.c.bill_id == bill_model.id)
+            .where(bill_model.id >= lo, bill_model.id < hi)
+            .where((subtotal != lines) | (total != expected_total) | (items.c.n.is_(None)))
+            .order_by(bill_model.id)
+        ):
+            bill_id, number, sub, disc, tot, line_sum, n = (
+                row[0], row[1], int(row[2]), int(row[3]), int(row[4]), int(row[5]), row[6]
+            )
+            base = {"source": source, "bill_id": bill_id, "bill_number": number}
+            if not n:
+                mismatches.append({"check": "no_items", **base})
+            if sub != line_sum:
+                mismatches.append({"check": "subtotal", **base, "expected": line_sum, "actual": sub})
+            if tot != max(sub - disc, 0):
+                mismatches.append({
+                    "check": "total", **base, "expected": max(sub - disc, 0), "actual": tot,
+                    "discount": disc,
+                })
+        bill_count = db.execute(
+            select(func.count(bill_model.id)).where(bill_model.id >= lo, bill_model.id < hi)
+        ).scalar()
+    finally:
+        db.rollback()
+        db.close()
+    return bill_count, item_count, mismatches
+
+
+# CHECKPOINT
+def _load_checkpoint(path: str) -> dict | None:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _save_checkpoint(path: str, state: dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+# RUN
+def reconcile(
+    out: str,
+    source: str = "bills",
+    workers: int = 4,
+    chunk_size: int = 50_000,
+    resume: bool = False,
+) -> dict:
+    """
+    Check every bill of `source` and append mismatches to `out`. Returns a
+    summary; with `resume`, chunks already in the checkpoint are skipped.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from app.db.session import ReadSessionLocal
+
+    bill_model, _ = _SOURCES[source]
+    checkpoint_path = f"{out}.checkpoint"
+
+    state = _load_checkpoint(checkpoint_path) if resume else None
+    if state and (state["source"], state["chunk_size"]) != (source, chunk_size):
+        raise ValueError(
+            f"checkpoint is for --chunk-size {state['chunk_size']} on {state['source']}; "
+            "use the same options or start without --resume"
+        )
+    if not state:
+        state = {"source": source, "chunk_size": chunk_size, "done": [],
+                 "bills": 0, "items": 0, "mismatches": 0, "report_bytes": 0,
+                 "started_at": datetime.now(timezone.utc).isoformat()}
+        open(out, "wb").close()
+    else:
+        # Lines written after the last checkpoint belong to a chunk that is
+        # checked again now; keeping them would report its mismatches twice
+        if "report_bytes" in state:  # absent in checkpoints of older runs
+            with open(out, "ab") as report:
+                report.truncate(state["report_bytes"])
+
+    with ReadSessionLocal() as db:
+        first, last = db.execute(select(func.min(bill_model.id), func.max(bill_model.id))).one()
+    if first is None:
+        _save_checkpoint(checkpoint_path, state)
+        return state
+
+    # Chunks are aligned on multiples of chunk_size, so a resumed run sees the
+    # same ranges (plus new ones for bills added since)
+    done = set(state["done"])
+    chunks = [
+        (lo, lo + chunk_size)
+        for lo in range(first - first % chunk_size, last + 1, chunk_size)
+        if lo not in done
+    ]
+
+    started = time.perf_counter()
+    with open(out, "ab") as report, ProcessPoolExecutor(
+        max_workers=workers,
+        # The API process runs threads; spawn keeps workers clean of them
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as pool:
+        futures = {pool.submit(check_range, source, lo, hi): lo for lo, hi in chunks}
+        for future in as_completed(futures):
+            bills, items, mismatches = future.result()
+            for m in mismatches:
+                report.write(dumps(m) + b"\n")
+            report.flush()
+            os.fsync(report.fileno())
+
+            state["done"].append(futures[future])
+            state["report_bytes"] = report.tell()
+            state["bills"] += bills
+            state["items"] += items
+            state["mismatches"] += len(mismatches)
+            _save_checkpoint(checkpoint_path, state)
+
+    state["finished_at"] = datetime.now(timezone.utc).isoformat()
+    _save_checkpoint(checkpoint_path, state)
+    logger.info(
+        "reconcile finished",
+        extra={"source": source, "bills": state["bills"], "items": state["items"],
+               "mismatches": state["mismatches"], "chunks": len(chunks),
+               "seconds": round(time.perf_counter() - started, 1)},
+    )
+    return state
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Bill integrity reconciler")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="check bills and bill items, report mismatches")
+    run.add_argument("--workers", type=int, default=settings.RECONCILE_WORKERS)
+    run.add_argument("--chunk-size", type=int, default=settings.RECONCILE_CHUNK_SIZE)
+    run.add_argument("--archive", action="store_true", help="check the archive tables")
+    run.add_argument("--out", default="reconcile.jsonl")
+    run.add_argument("--resume", action="store_true", help="continue from <out>.checkpoint")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        started = time.perf_counter()
+        state = reconcile(
+            args.out,
+            source="archive" if args.archive else "bills",
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            resume=args.resume,
+        )
+        print(
+            f"--- {state['bills']} bills, {state['items']} items checked in "
+            f"{time.perf_counter() - started:.1f}s: {state['mismatches']} mismatches → {args.out} ---"
+        )
+        if state["mismatches"]:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
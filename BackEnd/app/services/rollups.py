@@ -0,0 +1,244 @@
+# app/services/rollups.py
+"""
+Incremental maintenance of the daily sales rollups (app/models/report.py).
+
+    record_bill(db, bill)       – call inside the transaction creating a bill
+    retract_bill(db, bill)      – call inside the transaction deleting a bill
+
+    python -m app.services.rollups backfill [--workers 4] [--chunk-days 31]
+
+The backfill rebuilds both tables from bills / bill_items. The date range is
+split into disjoint day chunks, and each chunk is rebuilt by its own process
+(delete + INSERT ... SELECT GROUP BY), so chunks never contend on rows.
+"""
+import argparse
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.bill import Bill, BillItem
+from app.models.report import DailyProductSales, DailyUserSales
+from app.models.user import User
+
+
+def bill_day(created_at: datetime | None) -> date:
+    """Rollups are bucketed by UTC calendar day."""
+    if created_at is None:
+        return datetime.now(timezone.utc).date()
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+def _upsert(db: Session, model, keys: dict, increments: dict, extra: dict | None = None):
+    """
+    Add `increments` to the row identified by `keys`, creating it if needed.
+    Uses INSERT ... ON CONFLICT DO UPDATE where the dialect supports it so
+    concurrent bills on the same day never lose an update.
+    """
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        stmt = dialect_insert(table).values(**keys, **(extra or {}), **increments)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={k: table.c[k] + stmt.excluded[k] for k in increments},
+        )
+        db.execute(stmt)
+        return
+
+    result = db.execute(
+        update(table)
+        .where(*(table.c[k] == v for k, v in keys.items()))
+        .values({k: table.c[k] + v for k, v in increments.items()})
+    )
+    if result.rowcount == 0:
+        db.execute(insert(table).values(**keys, **(extra or {}), **increments))
+
+
+def _apply(db: Session, bill: Bill, sign: int) -> None:
+    day = bill_day(bill.created_at)
+
+    _upsert(
+        db,
+        DailyUserSales,
+        keys={"day": day, "user_id": bill.user_id},
+        extra={"team": bill.user.team if bill.user else None},
+        increments={
+            "bills_count": sign,
+            "subtotal_amount": sign * bill.subtotal_amount,
+            "discount_amount": sign * bill.discount_amount,
+            "total_amount": sign * bill.total_amount,
+        },
+    )
+
+    # One bill can list the same bundle more than once
+    per_product = defaultdict(lambda: [0, 0])
+    for item in bill.items:
+        per_product[item.product_id][0] += item.quantity
+        per_product[item.product_id][1] += item.line_total
+
+    for product_id, (units, revenue) in per_product.items():
+        _upsert(
+            db,
+            DailyProductSales,
+            keys={"day": day, "product_id": product_id},
+            increments={"units": sign * units, "revenue": sign * revenue},
+        )
+
+
+def record_bill(db: Session, bill: Bill) -> None:
+    """Add a freshly flushed bill to the rollups (same transaction, no commit)."""
+    _apply(db, bill, +1)
+
+
+def retract_bill(db: Session, bill: Bill) -> None:
+    """Remove a bill from the rollups before it is deleted (no commit)."""
+    _apply(db, bill, -1)
+
+
+# BACKFILL
+def _day_expr(dialect: str):
+    if dialect == "postgresql":
+        return func.date(func.timezone("UTC", Bill.created_at))
+    return func.date(Bill.created_at)
+
+
+def _day_bounds(start: date, end: date):
+    """[start, end) as UTC datetimes for an index-friendly created_at range."""
+    return (
+        datetime.combine(start, time.min, tzinfo=timezone.utc),
+        datetime.combine(end, time.min, tzinfo=timezone.utc),
+    )
+
+
+def _init_worker():
+    # Connections inherited through fork() must not be shared with the parent
+    from app.db.session import engine
+
+    engine.dispose(close=False)
+
+
+def rebuild_range(start: date, end: date) -> int:
+    """Rebuild rollups for days in [start, end). Returns the number of bills covered."""
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        dialect = db.get_bind().dialect.name
+        day = _day_expr(dialect).label("day")
+        lo, hi = _day_bounds(start, end)
+        in_range = (Bill.created_at >= lo, Bill.created_at < hi)
+
+        db.execute(delete(DailyUserSales).where(DailyUserSales.day >= start, DailyUserSales.day < end))
+        db.execute(delete(DailyProductSales).where(DailyProductSales.day >= start, DailyProductSales.day < end))
+
+        db.execute(
+            insert(DailyUserSales).from_select(
+                [
+                    "day",
+                    "user_id",
+                    "team",
+                    "bills_count",
+                    "subtotal_amount",
+                    "discount_amount",
+                    "total_amount",
+                ],
+                select(
+                    day,
+                    Bill.user_id,
+                    func.max(User.team),
+                    func.count(Bill.id),
+                    func.sum(Bill.subtotal_amount),
+                    func.sum(Bill.discount_amount),
+                    func.sum(Bill.total_amount),
+                )
+                .join(User, User.id == Bill.user_id)
+                .where(*in_range)
+                .group_by(day, Bill.user_id),
+            )
+        )
+
+        db.execute(
+            insert(DailyProductSales).from_select(
+                ["day", "product_id", "units", "revenue"],
+                select(
+                    day,
+                    BillItem.product_id,
+                    func.sum(BillItem.quantity),
+                    func.sum(BillItem.line_total),
+                )
+                .join(Bill, Bill.id == BillItem.bill_id)
+                .where(*in_range)
+                .group_by(day, BillItem.product_id),
+            )
+        )
+
+        count = db.execute(select(func.count(Bill.id)).where(*in_range)).scalar()
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+
+def backfill(workers: int = 4, chunk_days: int = 31) -> int:
+    """Rebuild all rollups from raw bills in parallel day chunks."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        first, last = db.execute(select(func.min(Bill.created_at), func.max(Bill.created_at))).one()
+    finally:
+        db.close()
+
+    if first is None:
+        return 0
+
+    start = bill_day(first)
+    stop = bill_day(last) + timedelta(days=1)
+
+    chunks = []
+    while start < stop:
+        end = min(start + timedelta(days=chunk_days), stop)
+        chunks.append((start, end))
+        start = end
+
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(rebuild_range, s, e): (s, e) for s, e in chunks}
+        for future in as_completed(futures):
+            s, e = futures[future]
+            n = future.result()
+            total += n
+            print(f"[ROLLUP] {s} → {e}: {n} bills")
+
+    return total
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Daily sales rollup maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bf = sub.add_parser("backfill", help="rebuild rollups from bills")
+    bf.add_argument("--workers", type=int, default=4)
+    bf.add_argument("--chunk-days", type=int, default=31)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "backfill":
+        total = backfill(workers=args.workers, chunk_days=args.chunk_days)
+        print(f"--- Rollups rebuilt from {total} bills ---")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Latency of the admin bill search (GET /admin/billing/search) on a large
+bills table, with the query plan of every filter.
+
+    python benchmarks/bench_bill_search.py [--bills 1000000] [--users 2000] [--repeat 20]
+
+Seeds a throwaway SQLite database through the migrations (so the FTS5
+table and its triggers exist), then calls the route function directly,
+without HTTP, and reports the median of --repeat calls per filter.
+"""
+import argparse
+import os
+import pathlib
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+_WORDS = (
+    "urgent delivery pune plant pump motor replacement site visit warranty "
+    "panel rewiring advance paid cheque pending transport included quote "
+    "revised customer nashik mumbai godown spare starter relay overload"
+).split()
+
+
+def _seed(db_url: str, bills: int, users: int, rnd: random.Random) -> None:
+    env = {**os.environ, "DATABASE_URL": db_url}
+    subprocess.run([sys.executable, "migrate_db.py"], cwd=ROOT, env=env, check=True, capture_output=True)
+
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+
+    import app.models  # noqa: F401
+    from app.models.bill import Bill
+    from app.models.user import User
+
+    engine = create_engine(db_url)
+    with Session(engine) as db:
+        db.execute(insert(User), [
+            {"id": i, "first_name": f"First{i}", "last_name": f"Last{i}", "email": f"user{i}@example.com",
+             "password_hash": "x", "employee_code": f"EMP{i:05d}", "role": "user"}
+            for i in range(2, users + 2)
+        ])
+        for start in range(1, bills + 1, 50_000):
+            rows = []
+            for i in range(start, min(start + 50_000, bills + 1)):
+                user = rnd.randint(2, users + 1)
+                total = rnd.randint(1_000, 50_000_000)
+                rows.append({
+                    "id": i, "bill_number": f"BS-{2020 + i * 6 // bills}-EMP{user:05d}{i:07d}", "user_id": user,
+                    "subtotal_amount": total, "discount_amount": 0, "total_amount": total,
+                    "notes": " ".join(rnd.sample(_WORDS, 4)) if rnd.random() < 0.6 else None,
+                })
+            # Rare words, so full-text hits are few and the lookup is what is timed
+            rows[0]["notes"] = f"dispute ticket {start}"
+            db.execute(insert(Bill), rows)
+        db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bills", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-bill-search-")
+    db_url = f"sqlite:///{tmp}/bench.db"
+    os.environ["DATABASE_URL"] = db_url
+    os.environ["LOG_LEVEL"] = "WARNING"
+    t0 = time.perf_counter()
+    _seed(db_url, args.bills, args.users, random.Random(49))
+    print(f"--- seeded {args.bills} bills in {time.perf_counter() - t0:.0f}s ---")
+
+    import orjson
+    from sqlalchemy import event, text
+
+    from app.db.session import SessionLocal
+    from app.routers import admin_bill
+
+    admin = SimpleNamespace(role="admin")
+    searches = {
+        "bill_number prefix": {"bill_number": "BS-2023-EMP00042"},
+        "employee_code prefix": {"employee_code": "emp00042"},
+        "email prefix": {"email": "user1234@"},
+        "amount range": {"min_total": 1000, "max_total": 1010},
+        "notes: rare word": {"q": "dispute"},
+        "notes: two rare words": {"q": "dispute ticket"},
+        "common words + employee": {"q": "urgent pump", "employee_code": "EMP00042"},
+        "no filter (first page)": {},
+    }
+    defaults = {"bill_number": None, "email": None, "employee_code": None, "min_total": None,
+                "max_total": None, "q": None, "cursor": None, "limit": 50, "fields": None}
+
+    print(f"{'search':<26}{'median ms':>10}{'rows':>6}  plan")
+    with SessionLocal() as db:
+        db.execute(text("ANALYZE"))
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        for name, params in searches.items():
+            def call():
+                return admin_bill.search_bills(**{**defaults, **params}, db=db, current_user=admin)
+
+            statements.clear()
+            rows = len(orjson.loads(call().body)["items"])
+            sql, bound = statements[-1]
+            plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", bound).all()
+            samples = []
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                call()
+                samples.append((time.perf_counter() - t) * 1000)
+            steps = "; ".join(p[-1] for p in plan)
+            print(f"{name:<26}{statistics.median(samples):>10.2f}{rows:>6}  {steps}")
+        event.remove(db.get_bind(), "before_cursor_execute", record)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Bandwidth and latency of large list responses over a throttled link, with
+and without response compression / ETag revalidation.
+
+    python benchmarks/bench_compression.py [--products 300] [--kbps 2000] [--latency-ms 40]
+
+Seeds a throwaway SQLite database, starts the API with uvicorn, and puts a
+small TCP proxy in front of it that limits the response direction to
+--kbps and adds --latency-ms per direction. Every request goes through
+the proxy, so the timings include what the link would cost a client.
+"""
+import argparse
+import asyncio
+import os
+import pathlib
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _seed(db_url: str, products: int) -> None:
+    env = {**os.environ, "DATABASE_URL": db_url}
+    subprocess.run([sys.executable, "migrate_db.py"], cwd=ROOT, env=env, check=True, capture_output=True)
+
+    os.environ["DATABASE_URL"] = db_url
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+
+    import app.models  # noqa: F401
+    from app.models.component import Component
+    from app.models.product import Product
+    from app.models.product_component import ProductComponent
+
+    rnd = random.Random(7)
+    engine = create_engine(db_url)
+    with Session(engine) as db:
+        db.execute(
+            insert(Component),
+            [
+                {
+                    "name": f"Component {i}",
+                    "brand_name": rnd.choice(["ABB", "Siemens", "Schneider", "L&T"]),
+                    "model": f"M-{i:04d}",
+                    "base_unit_price": rnd.randint(100, 50000),  # cents
+                    "is_active": True,
+                }
+                for i in range(200)
+            ],
+        )
+        db.execute(
+            insert(Product),
+            [
+                {
+                    "starter_type": rnd.choice(["DOL", "RDOL", "S/D"]),
+                    "rating_kw": rnd.choice([0.37, 0.75, 1.5, 2.2, 3.7, 5.5, 7.5, 11, 15, 22, 30, 37]),
+                    "device_name": "Starter",
+                    "is_active": True,
+                }
+                for _ in range(products)
+            ],
+        )
+        db.execute(
+            insert(ProductComponent),
+            [
+                {"product_id": p, "component_id": rnd.randint(1, 200), "quantity": rnd.randint(1, 3)}
+                for p in range(1, products + 1)
+                for _ in range(8)
+            ],
+        )
+        db.commit()
+
+
+# THROTTLING PROXY
+async def _pipe(reader, writer, bytes_per_sec: float | None, latency: float):
+    try:
+        while True:
+            chunk = await reader.read(16384)
+            if not chunk:
+                break
+            await asyncio.sleep(latency)
+            if bytes_per_sec:
+                await asyncio.sleep(len(chunk) / bytes_per_sec)
+            writer.write(chunk)
+            await writer.drain()
+    except (ConnectionResetError, BrokenPipeError):
+        pass
+    finally:
+        writer.close()
+
+
+def _start_proxy(listen_port: int, target_port: int, kbps: float, latency_ms: float) -> None:
+    bytes_per_sec = kbps * 1000 / 8
+    latency = latency_ms / 1000
+
+    async def handle(client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection("127.0.0.1", target_port)
+        await asyncio.gather(
+            _pipe(client_reader, server_writer, None, latency),
+            _pipe(server_reader, client_writer, bytes_per_sec, latency),
+        )
+
+    async def serve():
+        server = await asyncio.start_server(handle, "127.0.0.1", listen_port)
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+
+
+def _measure(client, url: str, headers: dict, repeat: int) -> tuple[int, int, float]:
+    """(body bytes on the wire, status, median seconds)"""
+    timings, wire = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with client.stream("GET", url, headers=headers) as r:
+            wire = sum(len(chunk) for chunk in r.iter_raw())
+        timings.append(time.perf_counter() - start)
+    return wire, r.status_code, statistics.median(timings)
+
+
+def main() -> None:
+    import httpx
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=300)
+    parser.add_argument("--kbps", type=float, default=2000, help="downstream bandwidth")
+    parser.add_argument("--latency-ms", type=float, default=40, help="one-way delay")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-compression-")
+    db_url = f"sqlite:///{tmp}/bench.db"
+    _seed(db_url, args.products)
+
+    api_port, proxy_port = _free_port(), _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(api_port), "--no-access-log"],
+        cwd=ROOT,
+        env={**os.environ, "DATABASE_URL": db_url, "LOG_LEVEL": "WARNING"},
+    )
+    _start_proxy(proxy_port, api_port, args.kbps, args.latency_ms)
+
+    try:
+        base = f"http://127.0.0.1:{proxy_port}"
+        with httpx.Client(base_url=base, timeout=120) as client:
+            for _ in range(50):
+                try:
+                    client.get("/health")
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.2)
+
+            token = client.post(
+                "/auth/login", json={"email": "admin@billswift.com", "password": "admin123"}
+            ).json()["access_token"]
+            auth = {"Authorization": f"Bearer {token}"}
+
+            from app.core.compression import _ENCODERS
+
+            print(
+                f"--- /products/ with {args.products} bundles over {args.kbps:g} kbit/s, "
+                f"{args.latency_ms:g} ms each way ---"
+            )
+            print(f"{'variant':<28}{'status':>8}{'bytes':>12}{'median ms':>12}")
+
+            rows = [("identity (before)", {"Accept-Encoding": "identity"})]
+            rows += [(enc, {"Accept-Encoding": enc}) for enc in ("gzip", "br", "zstd") if enc in _ENCODERS]
+            results = {}
+            for name, headers in rows:
+                wire, status, median = _measure(client, "/products/", {**auth, **headers}, args.repeat)
+                results[name] = (wire, median)
+                print(f"{name:<28}{status:>8}{wire:>12}{median * 1000:>12.1f}")
+
+            etag = client.get("/products/", headers={**auth, "Accept-Encoding": "gzip"}).headers["etag"]
+            wire, status, median = _measure(
+                client, "/products/", {**auth, "Accept-Encoding": "gzip", "If-None-Match": etag}, args.repeat
+            )
+            print(f"{'gzip + If-None-Match':<28}{status:>8}{wire:>12}{median * 1000:>12.1f}")
+
+            before_bytes, before_ms = results["identity (before)"]
+            after_bytes, after_ms = results["gzip"]
+            print(
+                f"--- gzip: {before_bytes / max(after_bytes, 1):.1f}x fewer bytes, "
+                f"{before_ms * 1000 - after_ms * 1000:.0f} ms faster per request ---"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Integer-cents money on the billing hot path, before and after, plus a
+randomized drift check.
+
+    python benchmarks/bench_money.py [--products 500] [--bill-items 50] [--repeat 5] [--cases 20000]
+
+"before" reproduces the old Decimal code paths (Numeric columns read as
+Decimal, create_bill's Decimal(str(float)) conversions and Decimal sums,
+serialize_product's Decimal line math), "after" runs the current int-cents
+code on the same data.
+
+The drift check runs first and exits non-zero on any mismatch: random
+prices, quantities and discounts are billed through the int path and
+compared with an exact Decimal reference, then written to and read back
+from SQLite, both per row and as SUM() aggregates (what the rollups see).
+"""
+import argparse
+import pathlib
+import random
+import statistics
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from types import SimpleNamespace
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import Numeric, create_engine, func, insert, select, type_coerce  # noqa: E402
+from sqlalchemy.orm import Session, selectinload  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.core.money import from_cents, to_cents  # noqa: E402
+from app.core.responses import dumps  # noqa: E402
+from app.models.bill import Bill  # noqa: E402
+from app.models.component import Component  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.product_component import ProductComponent  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.routers.product import serialize_product  # noqa: E402
+
+
+def _seed(engine, products: int, rnd: random.Random) -> None:
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(id=1, first_name="Bench", last_name="User", email="bench@example.com",
+                    password_hash="x", employee_code="B001", role="user"))
+        db.execute(insert(Component), [
+            {"name": f"Component {i}", "brand_name": "ABB", "model": f"M-{i}",
+             "base_unit_price": rnd.randint(100, 500_000), "is_active": True}
+            for i in range(200)
+        ])
+        db.execute(insert(Product), [
+            {"starter_type": "DOL", "rating_kw": 1 + i % 40, "device_name": "Starter", "is_active": True}
+            for i in range(products)
+        ])
+        db.execute(insert(ProductComponent), [
+            {"product_id": p, "component_id": rnd.randint(1, 200), "quantity": rnd.randint(1, 4),
+             "unit_price_override": rnd.randint(100, 500_000) if rnd.random() < 0.2 else None}
+            for p in range(1, products + 1)
+            for _ in range(8)
+        ])
+        db.execute(insert(Bill), [
+            {"bill_number": f"BS-2025-B{i:06d}", "user_id": 1, "subtotal_amount": 123_450 + i,
+             "discount_amount": 1_000, "total_amount": 122_450 + i}
+            for i in range(20_000)
+        ])
+        db.commit()
+
+
+# DRIFT CHECK
+def _reference_cents(text: str) -> int:
+    return int((Decimal(text) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def check_drift(cases: int, rnd: random.Random) -> int:
+    failures = 0
+
+    def fail(msg):
+        nonlocal failures
+        failures += 1
+        if failures <= 10:
+            print(f"  DRIFT: {msg}")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    bills = []
+    for case in range(cases):
+        # Prices as a client sends them: JSON floats with up to two decimals
+        texts = [f"{rnd.randint(0, 10_000_000) / 100:.2f}" for _ in range(rnd.randint(1, 30))]
+        qtys = [rnd.randint(1, 50) for _ in texts]
+        discount_text = f"{rnd.randint(0, 5_000_000) / 100:.2f}"
+
+        units = [to_cents(float(t)) for t in texts]
+        for t, u in zip(texts, units):
+            if u != _reference_cents(t):
+                fail(f"to_cents({t}) = {u}")
+        subtotal = sum(u * q for u, q in zip(units, qtys))
+        total = max(subtotal - to_cents(float(discount_text)), 0)
+
+        exact_subtotal = sum(Decimal(t) * q for t, q in zip(texts, qtys))
+        exact_total = max(exact_subtotal - Decimal(discount_text), Decimal(0))
+        if Decimal(subtotal) / 100 != exact_subtotal or Decimal(total) / 100 != exact_total:
+            fail(f"case {case}: {subtotal}/{total} vs {exact_subtotal}/{exact_total}")
+        if from_cents(total) != float(exact_total):
+            fail(f"case {case}: from_cents({total}) = {from_cents(total)}")
+        bills.append({"bill_number": f"BS-2025-D{case:07d}", "user_id": 1,
+                      "subtotal_amount": subtotal, "discount_amount": subtotal - total, "total_amount": total})
+
+    with Session(engine) as db:
+        db.execute(insert(Bill), bills)
+        db.commit()
+        stored = db.execute(select(Bill.subtotal_amount, Bill.total_amount).order_by(Bill.id)).all()
+        for i, (b, (subtotal, total)) in enumerate(zip(bills, stored)):
+            if (subtotal, total) != (b["subtotal_amount"], b["total_amount"]):
+                fail(f"row {i}: stored {subtotal}/{total}, wrote {b['subtotal_amount']}/{b['total_amount']}")
+        summed = db.execute(select(func.sum(Bill.total_amount))).scalar()
+        if summed != sum(b["total_amount"] for b in bills):
+            fail(f"SUM(total_amount) = {summed}, expected {sum(b['total_amount'] for b in bills)}")
+
+    print(f"--- drift check: {cases} bills, {failures} mismatches ---")
+    return failures
+
+
+# BEFORE (the old Decimal code)
+def serialize_product_decimal(product) -> dict:
+    components = []
+    base = Decimal("0.00")
+    for pc in product.components:
+        unit_price = (
+            pc.unit_price_override if pc.unit_price_override is not None else pc.component.base_unit_price
+        )
+        line_total = unit_price * pc.quantity
+        base += line_total
+        components.append({
+            "id": pc.id, "quantity": pc.quantity, "unit_price": unit_price, "line_total": line_total,
+            "name": pc.component.name, "brand_name": pc.component.brand_name, "model": pc.component.model,
+        })
+    return {"id": product.id, "starter_type": product.starter_type, "rating_kw": product.rating_kw,
+            "display_name": f"{product.starter_type} {product.rating_kw} kW",
+            "base_price": base, "total_price": base, "components": components}
+
+
+def _plain_product(p, money):
+    """
+    Detached copy of a loaded product with money mapped through `money`
+    (both sides get the same plain attribute access, not ORM descriptors).
+    """
+    def convert(cents):
+        return None if cents is None else money(cents)
+
+    return SimpleNamespace(
+        id=p.id, starter_type=p.starter_type, rating_kw=p.rating_kw,
+        components=[
+            SimpleNamespace(
+                id=pc.id, quantity=pc.quantity, unit_price_override=convert(pc.unit_price_override),
+                component=SimpleNamespace(name=pc.component.name, brand_name=pc.component.brand_name,
+                                          model=pc.component.model, base_unit_price=convert(pc.component.base_unit_price)),
+            )
+            for pc in p.components
+        ],
+    )
+
+
+def bill_math_decimal(lines) -> tuple:
+    subtotal = Decimal("0.00")
+    items = []
+    for override, server_cents, quantity in lines:
+        if override is not None:
+            unit_price = Decimal(str(override))
+        else:
+            unit_price = Decimal(server_cents) / 100
+        line_total = unit_price * quantity
+        subtotal += line_total
+        items.append((unit_price, line_total))
+    discount = Decimal(str(12.5))
+    total = subtotal - discount
+    if total < 0:
+        total = Decimal("0.00")
+    return subtotal, total, items
+
+
+# AFTER
+def bill_math_cents(lines) -> tuple:
+    subtotal = 0
+    items = []
+    for override, server_cents, quantity in lines:
+        unit_price = override if override is not None else server_cents
+        line_total = unit_price * quantity
+        subtotal += line_total
+        items.append((unit_price, line_total))
+    total = max(subtotal - 1250, 0)
+    return subtotal, total, items
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def _row(name: str, before: float, after: float) -> None:
+    print(f"{name:<34}{before:>10.2f}{after:>10.2f}{before / after:>8.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--bill-items", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rnd = random.Random(44)
+    if check_drift(args.cases, rnd):
+        sys.exit(1)
+
+    engine = create_engine("sqlite://")
+    _seed(engine, args.products, rnd)
+
+    print(f"{'median ms':<34}{'before':>10}{'after':>10}{'gain':>9}")
+
+    # 1. Reading money columns (20k bills × 3 amounts)
+    as_numeric = [type_coerce(c, Numeric(12, 2)) for c in (Bill.subtotal_amount, Bill.discount_amount, Bill.total_amount)]
+    with Session(engine) as db:
+        _row(
+            "read 20k bills' amounts",
+            _time(lambda: db.execute(select(*as_numeric)).all(), args.repeat),
+            _time(lambda: db.execute(select(Bill.subtotal_amount, Bill.discount_amount, Bill.total_amount)).all(), args.repeat),
+        )
+
+        # 2. serialize_product + JSON for every bundle
+        products = (
+            db.query(Product)
+            .options(selectinload(Product.components).selectinload(ProductComponent.component))
+            .all()
+        )
+        decimal_products = [_plain_product(p, lambda c: Decimal(c).scaleb(-2)) for p in products]
+        cent_products = [_plain_product(p, int) for p in products]
+        _row(
+            f"serialize_product × {len(products)} + JSON",
+            _time(lambda: dumps([serialize_product_decimal(p) for p in decimal_products]), args.repeat),
+            _time(lambda: dumps([serialize_product(p) for p in cent_products]), args.repeat),
+        )
+        assert dumps([serialize_product_decimal(p) for p in decimal_products]) == dumps(
+            [serialize_product(p) for p in products]
+        ), "serialize_product output changed"
+
+    # 3. create_bill's line math, 1000 bills
+    lines = [
+        (round(rnd.randint(100, 500_000) / 100, 2) if rnd.random() < 0.3 else None,
+         rnd.randint(100, 5_000_000), rnd.randint(1, 5))
+        for _ in range(args.bill_items)
+    ]
+    cent_lines = [(to_cents(o) if o is not None else None, s, q) for o, s, q in lines]
+    _row(
+        f"create_bill math × 1000 ({args.bill_items} items)",
+        _time(lambda: [bill_math_decimal(lines) for _ in range(1000)], args.repeat),
+        _time(lambda: [bill_math_cents(cent_lines) for _ in range(1000)], args.repeat),
+    )
+    before_total, after_total = bill_math_decimal(lines)[1], bill_math_cents(cent_lines)[1]
+    assert Decimal(after_total) / 100 == before_total, "bill totals differ"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Throughput of the bill reconciler, and a check that it finds exactly the
+rows that were corrupted.
+
+    python benchmarks/bench_reconcile.py [--bills 200000] [--items 5] [--workers 1,4] [--chunk-size 50000]
+
+Seeds a throwaway SQLite database, corrupts a few bills and lines the ways
+the checks look for, then runs the reconciler once per --workers value.
+Also interrupts a run after its first chunk (with the second chunk's
+lines written but not checkpointed) and resumes it, which must report the
+same mismatches, each once.
+"""
+import argparse
+import os
+import pathlib
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def _seed(db_url: str, bills: int, items: int, rnd: random.Random) -> set[tuple[str, int]]:
+    env = {**os.environ, "DATABASE_URL": db_url}
+    subprocess.run([sys.executable, "migrate_db.py"], cwd=ROOT, env=env, check=True, capture_output=True)
+
+    from sqlalchemy import create_engine, insert, text
+    from sqlalchemy.orm import Session
+
+    import app.models  # noqa: F401
+    from app.models.bill import Bill, BillItem
+    from app.models.product import Product
+
+    engine = create_engine(db_url)
+    with Session(engine) as db:
+        db.execute(insert(Product), [{"starter_type": "DOL", "rating_kw": 1, "device_name": "DOL"}])
+        for start in range(1, bills + 1, 10_000):
+            bill_rows, item_rows = [], []
+            for bill_id in range(start, min(start + 10_000, bills + 1)):
+                lines = [(rnd.randint(100, 500_000), rnd.randint(1, 5)) for _ in range(items)]
+                subtotal = sum(u * q for u, q in lines)
+                discount = rnd.choice([0, 0, 1_000, subtotal + 1])
+                bill_rows.append({
+                    "id": bill_id, "bill_number": f"BS-2025-R{bill_id:08d}", "user_id": 1,
+                    "subtotal_amount": subtotal, "discount_amount": discount,
+                    "total_amount": max(subtotal - discount, 0),
+                })
+                item_rows += [
+                    {"bill_id": bill_id, "product_id": 1, "quantity": q, "unit_price": u, "line_total": u * q}
+                    for u, q in lines
+                ]
+            db.execute(insert(Bill), bill_rows)
+            db.execute(insert(BillItem), item_rows)
+        db.commit()
+
+        # Corruptions: an overridden line total, a stale subtotal, a wrong
+        # total and a bill without items
+        expected = set()
+        for bill_id in rnd.sample(range(1, bills + 1), 8):
+            kind = rnd.choice(["line_total", "subtotal", "total"])
+            if kind == "line_total":
+                db.execute(text(
+                    "UPDATE bill_items SET line_total = line_total + 1 "
+                    "WHERE id = (SELECT min(id) FROM bill_items WHERE bill_id = :id)"
+                ), {"id": bill_id})
+                expected |= {("line_total", bill_id), ("subtotal", bill_id)}
+            elif kind == "subtotal":
+                # Total stays consistent with the (wrong) subtotal
+                db.execute(text(
+                    "UPDATE bills SET subtotal_amount = subtotal_amount + 0.1, total_amount = CASE "
+                    "WHEN subtotal_amount + 0.1 > discount_amount THEN subtotal_amount + 0.1 - discount_amount "
+                    "ELSE 0 END WHERE id = :id"
+                ), {"id": bill_id})
+                expected.add(("subtotal", bill_id))
+            else:
+                db.execute(text("UPDATE bills SET total_amount = total_amount + 0.01 WHERE id = :id"),
+                           {"id": bill_id})
+                expected.add(("total", bill_id))
+        empty = bills // 2
+        db.execute(text("DELETE FROM bill_items WHERE bill_id = :id"), {"id": empty})
+        db.execute(text("UPDATE bills SET subtotal_amount = 0, discount_amount = 0, total_amount = 0 "
+                        "WHERE id = :id"), {"id": empty})
+        expected = {e for e in expected if e[1] != empty} | {("no_items", empty)}
+        db.commit()
+    return expected
+
+
+def _found(out: str) -> set[tuple[str, int]]:
+    import orjson
+
+    with open(out, "rb") as f:
+        return {(m["check"], m["bill_id"]) for m in map(orjson.loads, f)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bills", type=int, default=200_000)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--workers", default="1,4")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-reconcile-")
+    db_url = f"sqlite:///{tmp}/bench.db"
+    os.environ["DATABASE_URL"] = db_url
+    os.environ["LOG_LEVEL"] = "WARNING"
+    expected = _seed(db_url, args.bills, args.items, random.Random(48))
+
+    from app.services import reconcile
+
+    print(f"--- {args.bills} bills, {args.bills * args.items} items, chunks of {args.chunk_size} ---")
+    print(f"{'workers':<10}{'seconds':>10}{'items/s':>14}{'mismatches':>12}")
+    ok = True
+    for workers in (int(w) for w in args.workers.split(",")):
+        out = os.path.join(tmp, f"report-{workers}.jsonl")
+        t0 = time.perf_counter()
+        state = reconcile.reconcile(out, workers=workers, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - t0
+        print(f"{workers:<10}{elapsed:>10.2f}{state['items'] / elapsed:>14,.0f}{state['mismatches']:>12}")
+        ok &= _found(out) == expected
+
+    # Interrupted after the first chunk, then resumed
+    out = os.path.join(tmp, "report-resume.jsonl")
+    second = (args.chunk_size, 2 * args.chunk_size)
+    bills, items, first = reconcile.check_range("bills", 0, args.chunk_size)
+    with open(out, "wb") as f:
+        f.writelines(reconcile.dumps(m) + b"\n" for m in first)
+        report_bytes = f.tell()
+        # ...and died after writing the second chunk's lines, before its checkpoint
+        f.writelines(reconcile.dumps(m) + b"\n" for m in reconcile.check_range("bills", *second)[2])
+    reconcile._save_checkpoint(f"{out}.checkpoint", {
+        "source": "bills", "chunk_size": args.chunk_size, "done": [0],
+        "bills": bills, "items": items, "mismatches": len(first), "report_bytes": report_bytes,
+        "started_at": "",
+    })
+    state = reconcile.reconcile(out, workers=2, chunk_size=args.chunk_size, resume=True)
+    with open(out, "rb") as f:
+        lines = sum(1 for _ in f)
+    resumed_ok = (
+        _found(out) == expected
+        and lines == state["mismatches"] == len(expected)
+        and state["bills"] == args.bills
+    )
+    print(f"--- resume after the first chunk: {'same report' if resumed_ok else 'DIFFERENT report'} ---")
+
+    print(f"--- found {'exactly the' if ok else 'NOT the'} {len(expected)} planted mismatches ---")
+    if not (ok and resumed_ok):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Serialization share of a 10k-row list response, before and after the
+orjson response layer.
+
+    python benchmarks/bench_serialization.py [--rows 10000] [--repeat 5]
+
+Rows are loaded from an in-memory SQLite database so the query cost is real;
+"before" mirrors the old admin/my-bills path (ORM rows → float() loop →
+response_model validation → jsonable_encoder → json.dumps), "after" is the
+current one (column select → FastJSONResponse).
+"""
+import argparse
+import json
+import pathlib
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.models.bill import Bill  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.core.responses import FastJSONResponse  # noqa: E402
+from app.schemas.bill import BillOut  # noqa: E402
+
+
+def _seed(engine, rows: int) -> None:
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(
+            User(
+                id=1,
+                first_name="Bench",
+                last_name="User",
+                email="bench@example.com",
+                password_hash="x",
+                employee_code="B001",
+                role="user",
+            )
+        )
+        db.flush()
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        db.execute(
+            insert(Bill),
+            [
+                {
+                    "bill_number": f"BS-2025-B{i:06d}",
+                    "user_id": 1,
+                    "subtotal_amount": 123450 + i * 100,
+                    "discount_amount": 1000,
+                    "total_amount": 122450 + i * 100,
+                    "created_at": start + timedelta(minutes=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+
+
+def before(engine) -> tuple[float, float]:
+    t0 = time.perf_counter()
+    with Session(engine) as db:
+        bills = db.query(Bill).filter(Bill.user_id == 1).all()
+        t1 = time.perf_counter()
+        result = [
+            {
+                "id": b.id,
+                "bill_number": b.bill_number,
+                "subtotal_amount": float(b.subtotal_amount),
+                "discount_amount": float(b.discount_amount),
+                "total_amount": float(b.total_amount),
+                "created_at": b.created_at,
+            }
+            for b in bills
+        ]
+        adapter = TypeAdapter(list[BillOut])
+        validated = adapter.validate_python(result)
+        content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+        json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+    t2 = time.perf_counter()
+    return t2 - t0, t2 - t1
+
+
+def after(engine) -> tuple[float, float]:
+    t0 = time.perf_counter()
+    with Session(engine) as db:
+        rows = (
+            db.query(
+                Bill.id,
+                Bill.bill_number,
+                Bill.subtotal_amount,
+                Bill.discount_amount,
+                Bill.total_amount,
+                Bill.created_at,
+            )
+            .filter(Bill.user_id == 1)
+            .all()
+        )
+        t1 = time.perf_counter()
+        FastJSONResponse([r._asdict() for r in rows])
+    t2 = time.perf_counter()
+    return t2 - t0, t2 - t1
+
+
+def _report(name: str, samples: list[tuple[float, float]]) -> None:
+    total = statistics.median(s[0] for s in samples) * 1000
+    ser = statistics.median(s[1] for s in samples) * 1000
+    print(f"{name:<7} total {total:8.1f} ms   serialization {ser:8.1f} ms   share {ser / total:6.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    _seed(engine, args.rows)
+
+    _report("before", [before(engine) for _ in range(args.repeat)])
+    _report("after", [after(engine) for _ in range(args.repeat)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Shared fixtures: one migrated SQLite database per test session, an app
+client with the rate limits off, and users with bearer tokens.
+
+The settings are read at import time, so the environment is set here,
+before anything under app/ is imported.
+"""
+import itertools
+import os
+import tempfile
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix="billswift-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_TMP}/test.db",
+    "READ_DATABASE_URL": "",
+    "LOG_LEVEL": "WARNING",
+    "SCHEDULER_ENABLED": "false",
+    "WARMUP_ENABLED": "false",
+    "EVENT_BACKEND": "local",
+    "INVOICE_CACHE_DIR": f"{_TMP}/invoice_cache",
+    "RECONCILE_REPORT_DIR": f"{_TMP}/reconcile_reports",
+})
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.auth.jwt_handler import create_access_token  # noqa: E402
+from app.auth.security import hash_password  # noqa: E402
+from app.db.migrate import migrate  # noqa: E402
+from app.db.seed import create_default_admin  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app, limiter  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.routers.auth import limiter as auth_limiter  # noqa: E402
+from app.routers.bill import limiter as bill_limiter  # noqa: E402
+
+TMP_DIR = _TMP
+
+_codes = itertools.count(1)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    migrate(engine)
+    create_default_admin()
+    for each in (limiter, auth_limiter, bill_limiter):
+        each.enabled = False
+    yield engine
+
+
+@pytest.fixture
+def client():
+    # Not entered as a context manager: no lifespan, so no scheduler,
+    # event listener or warm-up thread
+    return TestClient(app)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def admin(db):
+    return db.query(User).filter(User.email == "admin@billswift.com").one()
+
+
+@pytest.fixture
+def make_user(db):
+    def make(role: str = "user", approved: bool = True, team: str | None = "Sales") -> User:
+        n = next(_codes)
+        user = User(
+            first_name="Test",
+            last_name=f"User{n}",
+            email=f"user{n}@example.com",
+            password_hash=hash_password("secret123"),
+            employee_code=f"T{n:05d}",
+            team=team,
+            role=role,
+            is_approved=approved,
+            is_active=approved,
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+def auth():
+    def headers(user: User) -> dict:
+        return {"Authorization": f"Bearer {create_access_token(user)}"}
+
+    return headers
+
+
+@pytest.fixture
+def make_product(client, admin, auth):
+    """A bundle of fresh components, one line per (price, quantity)."""
+    def make(*lines: tuple[float, int], starter_type: str = "DOL", rating_kw: float = 5.5) -> dict:
+        components = []
+        for price, quantity in lines:
+            n = next(_codes)
+            response = client.post(
+                "/admin/components/",
+                json={"name": f"Part {n}", "brand_name": "Test", "base_unit_price": price},
+                headers=auth(admin),
+            )
+            assert response.status_code == 200, response.text
+            components.append({"component_id": response.json()["id"], "quantity": quantity})
+        response = client.post(
+            "/products/",
+            json={"starter_type": starter_type, "rating_kw": rating_kw, "components": components},
+            headers=auth(admin),
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return make
+
+
+@pytest.fixture
+def make_bill(client, auth):
+    """POST /billing/ as `user`; lines are (product id, quantity)."""
+    def make(user: User, *lines: tuple[int, int], discount_amount: float = 0, notes: str | None = None) -> dict:
+        response = client.post(
+            "/billing/",
+            json={
+                "items": [{"product_id": pid, "quantity": qty} for pid, qty in lines],
+                "discount_amount": discount_amount,
+                "notes": notes,
+            },
+            headers=auth(user),
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return make
@@ -0,0 +1,84 @@
+"""
+Bill archive (app/services/archive.py): id uniqueness across the hot and
+archive tables, and the admin search over archived years.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import text, update
+
+from app.db.migrate import migrate
+from app.db.session import _make_engine
+from app.models.bill import Bill
+from app.services.archive import archive_year
+from conftest import TMP_DIR
+
+
+def test_sqlite_ids_are_not_reused_after_archival():
+    engine = _make_engine(f"sqlite:///{TMP_DIR}/ids.db")
+    migrate(engine, target=11)
+    with engine.begin() as conn:
+        for i in (1, 2, 3):
+            conn.execute(text(
+                "INSERT INTO bills (id, bill_number, user_id, subtotal_amount, discount_amount, total_amount, notes) "
+                f"VALUES ({i}, 'BS-2026-{i}', 1, 0, 0, 0, 'hot bill {i}')"
+            ))
+        # Archived earlier, with the highest id handed out so far
+        conn.execute(text(
+            "INSERT INTO bills_archive (created_at, id, bill_number, user_id, subtotal_amount, discount_amount, total_amount) "
+            "VALUES ('2020-06-01 00:00:00', 9, 'BS-2020-9', 1, 0, 0, 0)"
+        ))
+    migrate(engine)
+
+    def insert(n: int) -> int:
+        with engine.begin() as conn:
+            return conn.execute(text(
+                "INSERT INTO bills (bill_number, user_id, subtotal_amount, discount_amount, total_amount, notes) "
+                f"VALUES ('BS-2026-new{n}', 1, 0, 0, 0, 'new bill {n}') RETURNING id"
+            )).scalar()
+
+    assert insert(1) == 10
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM bills WHERE id = 10"))
+    assert insert(2) == 11
+
+    with engine.connect() as conn:
+        # Indexes and the notes full-text triggers came back with the table
+        indexes = conn.execute(text("SELECT name FROM sqlite_master WHERE tbl_name = 'bills' AND type = 'index'")).scalars().all()
+        assert {"ix_bills_bill_number", "ix_bills_created_at", "ix_bills_total_amount_id"} <= set(indexes)
+        assert conn.execute(text("SELECT rowid FROM bills_notes_fts WHERE bills_notes_fts MATCH 'new'")).scalars().all() == [11]
+        assert conn.execute(text("PRAGMA integrity_check")).scalar() == "ok"
+    engine.dispose()
+
+
+def test_admin_search_includes_archive_on_request(client, db, admin, auth, make_user, make_product, make_bill):
+    user = make_user()
+    product = make_product((10.0, 1))
+    old = make_bill(user, (product["id"], 1), notes="archived pump order")
+    new = make_bill(user, (product["id"], 2), notes="current pump order")
+    db.execute(update(Bill).where(Bill.id == old["id"]).values(created_at=datetime(2020, 6, 1, tzinfo=timezone.utc)))
+    db.commit()
+    assert archive_year(2020) == 1
+
+    def search(**params):
+        response = client.get("/admin/billing/search", params={"email": user.email, **params}, headers=auth(admin))
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    current = search()
+    assert [b["id"] for b in current["items"]] == [new["id"]]
+    assert 2020 in current["archived_years_excluded"]
+
+    both = search(include_archived="true")
+    assert [b["id"] for b in both["items"]] == [new["id"], old["id"]]
+    assert both["archived_years_excluded"] == []
+    assert both["items"][1]["bill_number"] == old["bill_number"]
+
+    # Keyset pages run across both tables
+    first = search(include_archived="true", limit=1)
+    assert [b["id"] for b in first["items"]] == [new["id"]]
+    rest = search(include_archived="true", limit=1, cursor=first["next_cursor"])
+    assert [b["id"] for b in rest["items"]] == [old["id"]]
+    assert rest["next_cursor"] is None
+
+    assert [b["id"] for b in search(include_archived="true", q="archived")["items"]] == [old["id"]]
+    assert [b["id"] for b in search(include_archived="true", bill_number=old["bill_number"])["items"]] == [old["id"]]
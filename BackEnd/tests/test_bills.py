@@ -0,0 +1,43 @@
+"""
+Bills (app/routers/bill.py, app/routers/admin_bill.py) and the reports
+over them.
+"""
+_MONEY = {"subtotal_amount", "discount_amount", "total_amount", "unit_price", "line_total", "revenue", "base_unit_price"}
+
+
+def _money_values(data):
+    if isinstance(data, list):
+        for each in data:
+            yield from _money_values(each)
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            if key in _MONEY:
+                yield key, value
+            else:
+                yield from _money_values(value)
+
+
+def test_money_is_always_a_float(client, admin, auth, make_user, make_product, make_bill):
+    user = make_user()
+    product = make_product((10.0, 1))
+    # Whole amounts: SQLite hands these back as integers unless cast
+    created = make_bill(user, (product["id"], 3), discount_amount=5)
+    responses = {"POST /billing/": created}
+    for path, who in [
+        ("/billing/my-bills", user),
+        (f"/billing/{created['id']}", user),
+        ("/admin/billing/all-bills", admin),
+        ("/admin/billing/search", admin),
+        ("/admin/reports/daily", admin),
+        ("/admin/reports/products", admin),
+        ("/components/", user),
+    ]:
+        response = client.get(path, headers=auth(who))
+        assert response.status_code == 200, (path, response.text)
+        responses[path] = response.json()
+
+    for path, body in responses.items():
+        values = list(_money_values(body))
+        assert values, path
+        assert all(isinstance(v, float) for _, v in values), (path, values)
+    assert created["discount_amount"] == 5.0
@@ -0,0 +1,123 @@
+"""
+Randomized checks of the integer-cents money handling (app/core/money.py,
+app/schemas/types.py, app/db/types.py).
+
+    python -m pytest -q tests
+
+Each run uses a fresh seed, printed on failure; set MONEY_TEST_SEED to
+replay one.
+"""
+import math
+import os
+import random
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, func, insert, select
+from sqlalchemy.exc import StatementError
+
+from app.core.money import MAX_CENTS, from_cents, to_cents
+from app.db.types import Cents
+from app.schemas.types import MoneyInput
+
+CASES = 5000
+SEED = int(os.getenv("MONEY_TEST_SEED", random.randrange(2**32)))
+
+
+@pytest.fixture
+def rnd():
+    return random.Random(SEED)
+
+
+def _reference(value) -> int:
+    """Exact half-up cents of what the client wrote."""
+    text = repr(value) if isinstance(value, float) else str(value)
+    return int(Decimal(text).scaleb(2).to_integral_value(ROUND_HALF_UP))
+
+
+def _amount(rnd: random.Random):
+    """A random valid amount, in one of the shapes clients send."""
+    cents = rnd.randint(-MAX_CENTS // 1000, MAX_CENTS // 1000)
+    decimals = rnd.choice([0, 1, 2, 3, 6])
+    units = Decimal(cents).scaleb(-2) + Decimal(rnd.randint(0, 9999)).scaleb(-6) * (decimals > 2)
+    units = units.quantize(Decimal(1).scaleb(-decimals))
+    return rnd.choice([float(units), str(units), units, int(units) if decimals == 0 else float(units)])
+
+
+class _Body(BaseModel):
+    amount: MoneyInput
+
+
+def test_to_cents_matches_decimal_reference(rnd):
+    for _ in range(CASES):
+        value = _amount(rnd)
+        assert to_cents(value) == _reference(value), (SEED, value)
+
+
+def test_cents_round_trip_through_units(rnd):
+    for _ in range(CASES):
+        cents = rnd.randint(-MAX_CENTS, MAX_CENTS)
+        units = from_cents(cents)
+        assert to_cents(units) == cents, (SEED, cents)
+        assert to_cents(str(Decimal(cents).scaleb(-2))) == cents, (SEED, cents)
+
+
+def _garbage(rnd: random.Random):
+    alphabet = "0123456789.-+eE, abcxyz_"
+    return rnd.choice([
+        None,
+        True,
+        False,
+        math.nan,
+        math.inf,
+        -math.inf,
+        "NaN",
+        "-Infinity",
+        "sNaN",
+        "",
+        "1e400",
+        f"{rnd.randint(1, 9)}e{rnd.randint(13, 10**9)}",
+        "".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 8))) + "x",
+        [rnd.random()],
+        {"amount": 1},
+        b"12",
+        rnd.choice([1, -1]) * (MAX_CENTS + 1 + rnd.randint(0, 10**6)) / 100,
+    ])
+
+
+def test_invalid_input_raises_value_error(rnd):
+    for _ in range(CASES):
+        value = _garbage(rnd)
+        with pytest.raises(ValueError):
+            to_cents(value)
+        # ...which request validation reports as a 422, not a 500
+        with pytest.raises(ValidationError):
+            _Body(amount=value)
+
+
+def test_money_input_validates_to_cents(rnd):
+    for _ in range(CASES):
+        value = _amount(rnd)
+        assert _Body(amount=value).amount == _reference(value), (SEED, value)
+
+
+def test_cents_column_round_trip_and_sums(rnd):
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    table = Table("money", metadata, Column("id", Integer, primary_key=True), Column("amount", Cents()))
+    metadata.create_all(engine)
+
+    # Per-row and SUM() magnitudes stay inside what SQLite's float
+    # arithmetic carries exactly at two decimals
+    values = [rnd.randint(-10**9, 10**9) for _ in range(CASES)]
+    with engine.begin() as conn:
+        conn.execute(insert(table), [{"amount": v} for v in values])
+        assert conn.execute(select(table.c.amount).order_by(table.c.id)).scalars().all() == values
+        total = conn.execute(select(func.sum(table.c.amount))).scalar()
+    assert total == sum(values), SEED
+
+    # Units that were never converted are refused, not stored 100x off
+    with pytest.raises(StatementError) as error, engine.begin() as conn:
+        conn.execute(insert(table), [{"amount": 1.5}])
+    assert isinstance(error.value.orig, TypeError)
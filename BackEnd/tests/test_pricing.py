@@ -0,0 +1,34 @@
+"""
+Bundle price matrix cache (app/services/pricing.py).
+"""
+from app.models.product_component import ProductComponent
+from app.schemas.quote import QuoteConfiguration
+from app.services import pricing
+
+
+def _bundle_price(matrix, product_id: int) -> float:
+    return pricing.quote(matrix, [QuoteConfiguration(product_id=product_id)])[0]["unit_price"]
+
+
+def test_warm_rebuilds_only_after_catalog_changes(db, make_product, monkeypatch):
+    product = make_product((12.5, 2))
+    builds = []
+    build = pricing.build_price_matrix
+    monkeypatch.setattr(pricing, "build_price_matrix", lambda *a, **kw: builds.append(1) or build(*a, **kw))
+
+    pricing.invalidate_price_matrix()
+    first = pricing.warm_price_matrix(db)
+    second = pricing.warm_price_matrix(db)
+    assert len(builds) == 1
+    assert second.indptr is first.indptr
+    assert _bundle_price(second, product["id"]) == 25.0
+
+    # A write from another worker: no invalidate_price_matrix() here, the
+    # catalog version alone has to trigger the rebuild
+    line = db.query(ProductComponent).filter(ProductComponent.product_id == product["id"]).one()
+    line.component.base_unit_price = 2000
+    db.commit()
+    third = pricing.warm_price_matrix(db)
+    assert len(builds) == 2
+    assert third.catalog_version > first.catalog_version
+    assert _bundle_price(third, product["id"]) == 40.0
@@ -0,0 +1,32 @@
+"""
+Product bundles (app/routers/product.py).
+"""
+from app.models.product import Product
+from app.models.product_component import ProductComponent
+
+
+def test_zero_override_prices_the_line_free(client, db, admin, auth, make_product):
+    bundle = make_product((40.0, 2), (10.0, 1))
+    lines = (
+        db.query(ProductComponent)
+        .filter(ProductComponent.product_id == bundle["id"])
+        .order_by(ProductComponent.id)
+        .all()
+    )
+    payload = {
+        "starter_type": "DOL",
+        "rating_kw": 5.5,
+        "components": [
+            {"component_id": lines[0].component_id, "quantity": 2, "unit_price_override": 0},
+            {"component_id": lines[1].component_id, "quantity": 1},
+        ],
+    }
+    response = client.put(f"/products/{bundle['id']}", json=payload, headers=auth(admin))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [c["line_total"] for c in body["components"]] == [0.0, 10.0]
+    assert body["total_price"] == 10.0
+
+    db.expire_all()
+    assert [pc.unit_price_override for pc in db.get(Product, bundle["id"]).components] == [0, None]
+    assert db.get(Product, bundle["id"]).total_price == 1000
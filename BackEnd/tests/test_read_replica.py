@@ -0,0 +1,110 @@
+"""
+Read routing (app/db/session.py): read-your-writes stickiness, the lag
+fallback, and authentication on the read session.
+"""
+import shutil
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.db import session as db_session
+from conftest import TMP_DIR
+
+
+def _request(header: str | None = None, cookie: str | None = None) -> Request:
+    headers = []
+    if header is not None:
+        headers.append((db_session.READ_AFTER_HEADER.lower().encode(), header.encode()))
+    if cookie is not None:
+        headers.append((b"cookie", f"{db_session.READ_AFTER_COOKIE}={cookie}".encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+
+
+@pytest.mark.parametrize("header, cookie, sticky", [
+    (None, None, False),
+    ("{now}", None, True),
+    (None, "{now}", True),
+    ("{recent}", None, True),
+    # Past the window, or so far ahead it can only be a bad clock / forged
+    ("{expired}", None, False),
+    (None, "{expired}", False),
+    ("{future}", None, False),
+    ("junk", None, False),
+    (None, "", False),
+    # The header wins over the cookie
+    ("{now}", "{expired}", True),
+])
+def test_is_sticky(header, cookie, sticky):
+    now = time.time()
+    times = {
+        "now": f"{now:.3f}",
+        "recent": f"{now - settings.READ_STICKY_SECONDS / 2:.3f}",
+        "expired": f"{now - settings.READ_STICKY_SECONDS - 1:.3f}",
+        "future": f"{now + settings.READ_STICKY_SECONDS + 60:.3f}",
+    }
+    header = header.format(**times) if header is not None else None
+    cookie = cookie.format(**times) if cookie is not None else None
+    assert db_session._is_sticky(_request(header, cookie)) is sticky
+
+
+@pytest.fixture
+def replica(database, monkeypatch):
+    """A second SQLite file, copied from the primary, as the read replica."""
+    path = f"{TMP_DIR}/replica.db"
+    shutil.copyfile(db_session.engine.url.database, path)
+    replica_engine = db_session._make_engine(f"sqlite:///{path}")
+    monkeypatch.setattr(db_session, "read_engine", replica_engine)
+    monkeypatch.setattr(db_session, "ReadSessionLocal", sessionmaker(bind=replica_engine, autoflush=False))
+    monkeypatch.setattr(db_session, "replica_lag_seconds", lambda: 0.0)
+    yield replica_engine
+    replica_engine.dispose()
+
+
+def _bind(request: Request):
+    sessions = db_session.get_read_db(request)
+    db = next(sessions)
+    try:
+        return db.get_bind()
+    finally:
+        sessions.close()
+
+
+def test_read_db_uses_the_replica(replica):
+    assert _bind(_request()) is replica
+
+
+def test_read_db_falls_back_to_primary_when_lagging(replica, monkeypatch):
+    monkeypatch.setattr(db_session, "replica_lag_seconds", lambda: settings.READ_REPLICA_MAX_LAG_SECONDS + 1)
+    assert _bind(_request()) is db_session.engine
+
+
+def test_read_db_sticks_to_primary_after_a_write(replica):
+    assert _bind(_request(header=f"{time.time():.3f}")) is db_session.engine
+
+
+@pytest.fixture
+def primary_checkouts():
+    checkouts = []
+
+    def count(*_):
+        checkouts.append(1)
+
+    event.listen(db_session.engine, "checkout", count)
+    yield checkouts
+    event.remove(db_session.engine, "checkout", count)
+
+
+def test_replica_read_route_never_opens_the_primary(client, admin, auth, replica, primary_checkouts):
+    response = client.get("/admin/components/", headers=auth(admin))
+    assert response.status_code == 200, response.text
+    assert primary_checkouts == []
+
+
+def test_user_not_yet_on_the_replica_authenticates_on_primary(client, make_user, auth, replica):
+    user = make_user()  # created after the replica copy
+    response = client.get("/products/", headers=auth(user))
+    assert response.status_code == 200, response.text
@@ -0,0 +1,60 @@
+"""
+Bill integrity reconciler (app/services/reconcile.py): an interrupted run
+resumed from its checkpoint reports every mismatch exactly once.
+"""
+import orjson
+import pytest
+from sqlalchemy import text
+
+from app.services import reconcile
+
+
+class _Crash(Exception):
+    pass
+
+
+def _report(path) -> list[tuple[str, int]]:
+    with open(path, "rb") as f:
+        return [(m["check"], m["bill_id"]) for m in map(orjson.loads, f)]
+
+
+def test_resume_after_interruption(db, tmp_path, monkeypatch, make_user, make_product, make_bill):
+    user = make_user()
+    product = make_product((10.0, 1))
+    line, total, empty, clean = (make_bill(user, (product["id"], 2))["id"] for _ in range(4))
+    db.execute(text(
+        "UPDATE bill_items SET line_total = line_total + 0.01 "
+        "WHERE id = (SELECT min(id) FROM bill_items WHERE bill_id = :id)"
+    ), {"id": line})
+    db.execute(text("UPDATE bills SET total_amount = total_amount + 0.01 WHERE id = :id"), {"id": total})
+    db.execute(text("DELETE FROM bill_items WHERE bill_id = :id"), {"id": empty})
+    db.execute(text("UPDATE bills SET subtotal_amount = 0, total_amount = 0 WHERE id = :id"), {"id": empty})
+    db.commit()
+    expected = {("line_total", line), ("subtotal", line), ("total", total), ("no_items", empty)}
+
+    out = tmp_path / "report.jsonl"
+    save = reconcile._save_checkpoint
+
+    def save_or_crash(path, state):
+        # Dies after the `total` chunk's lines are written and fsynced,
+        # before its checkpoint: the resumed run checks that chunk again
+        if state["done"] and state["done"][-1] == total:
+            raise _Crash
+        save(path, state)
+
+    monkeypatch.setattr(reconcile, "_save_checkpoint", save_or_crash)
+    # One worker, one bill per chunk: chunks finish in id order
+    with pytest.raises(_Crash):
+        reconcile.reconcile(str(out), workers=1, chunk_size=1)
+    interrupted = _report(out)
+    assert ("total", total) in interrupted and ("no_items", empty) not in interrupted
+
+    monkeypatch.setattr(reconcile, "_save_checkpoint", save)
+    state = reconcile.reconcile(str(out), workers=1, chunk_size=1, resume=True)
+
+    found = _report(out)
+    assert len(found) == len(set(found)), "duplicate report lines"
+    assert set(found) == expected, "missing or extra report lines"
+    assert state["mismatches"] == len(found)
+    assert state["bills"] == db.execute(text("SELECT count(*) FROM bills")).scalar()
+    assert clean not in {bill_id for _, bill_id in found}
@@ -0,0 +1,78 @@
+"""
+Daily sales rollups (app/services/rollups.py) kept in step with bills as
+they are created and deleted.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from app.models.bill import Bill, BillItem
+from app.models.report import DailyProductSales, DailyUserSales
+from app.services.rollups import bill_day, rebuild_range
+
+
+def _recomputed(db, user_id: int, product_ids: list[int]):
+    users = defaultdict(Counter)
+    for bill in db.query(Bill).filter(Bill.user_id == user_id):
+        users[bill_day(bill.created_at)].update(
+            bills_count=1,
+            subtotal_amount=bill.subtotal_amount,
+            discount_amount=bill.discount_amount,
+            total_amount=bill.total_amount,
+        )
+    products = defaultdict(Counter)
+    for item in db.query(BillItem).filter(BillItem.product_id.in_(product_ids)):
+        products[(bill_day(item.bill.created_at), item.product_id)].update(units=item.quantity, revenue=item.line_total)
+    return users, products
+
+
+def _rollups(db, user_id: int, product_ids: list[int]):
+    db.expire_all()
+    users = {
+        r.day: Counter(
+            bills_count=r.bills_count,
+            subtotal_amount=r.subtotal_amount,
+            discount_amount=r.discount_amount,
+            total_amount=r.total_amount,
+        )
+        for r in db.query(DailyUserSales).filter(DailyUserSales.user_id == user_id)
+    }
+    products = {
+        (r.day, r.product_id): Counter(units=r.units, revenue=r.revenue)
+        for r in db.query(DailyProductSales).filter(DailyProductSales.product_id.in_(product_ids))
+    }
+    # A day whose bills were all deleted keeps a row of zeros
+    return (
+        {k: v for k, v in users.items() if any(v.values())},
+        {k: v for k, v in products.items() if any(v.values())},
+    )
+
+
+def test_rollups_match_bills_after_creates_and_deletes(client, db, admin, auth, make_user, make_product, make_bill):
+    user = make_user(team="Rollups")
+    pump = make_product((120.5, 1), (9.99, 3))["id"]
+    valve = make_product((45.25, 2))["id"]
+    products = [pump, valve]
+
+    bills = [
+        make_bill(user, (pump, 1)),
+        make_bill(user, (pump, 2), (valve, 1), discount_amount=10),
+        # The same bundle twice on one bill
+        make_bill(user, (valve, 1), (valve, 3), notes="split lines"),
+        make_bill(user, (pump, 1), (valve, 2), discount_amount=0.05),
+    ]
+    assert _rollups(db, user.id, products) == _recomputed(db, user.id, products)
+
+    for bill in bills[1:3]:
+        response = client.delete(f"/admin/billing/{bill['id']}", headers=auth(admin))
+        assert response.status_code == 200, response.text
+    assert _rollups(db, user.id, products) == _recomputed(db, user.id, products)
+
+    make_bill(user, (valve, 1))
+    expected = _recomputed(db, user.id, products)
+    assert _rollups(db, user.id, products) == expected
+    assert sum(c["bills_count"] for c in expected[0].values()) == 3
+
+    # The backfill rebuilds the same rows from the raw bills
+    days = sorted(expected[0])
+    rebuild_range(days[0], days[-1] + timedelta(days=1))
+    assert _rollups(db, user.id, products) == expected
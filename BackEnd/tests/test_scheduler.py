@@ -0,0 +1,131 @@
+"""
+Cron parsing and the leader lease of the in-process scheduler
+(app/core/scheduler.py).
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import scheduler as scheduler_module
+from app.core.scheduler import Cron, Job, LeaseLock, Scheduler
+
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+# CRON
+def test_cron_fields():
+    cron = Cron("*/15 2-4 1,15 * 1-5/2")
+    assert cron.minutes == {0, 15, 30, 45}
+    assert cron.hours == {2, 3, 4}
+    assert cron.days == {1, 15}
+    assert cron.months == set(range(1, 13))
+    assert cron.weekdays == {1, 3, 5}
+    assert Cron("0 0 * * 7").weekdays == {0}
+    assert Cron("5/20 * * * *").minutes == {5, 25, 45}
+
+
+@pytest.mark.parametrize("expr", ["* * * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "5-2 * * * *", "x * * * *"])
+def test_cron_rejects_bad_expressions(expr):
+    with pytest.raises(ValueError):
+        Cron(expr)
+
+
+@pytest.mark.parametrize("expr, after, expected", [
+    ("15 3 * * *", _utc(2026, 1, 1, 3, 15), _utc(2026, 1, 2, 3, 15)),
+    ("15 3 * * *", _utc(2026, 1, 1, 3, 14, 59), _utc(2026, 1, 1, 3, 15)),
+    ("*/10 * * * *", _utc(2026, 1, 1, 23, 55), _utc(2026, 1, 2, 0, 0)),
+    # 2026-01-04 is a Sunday
+    ("0 4 * * 0", _utc(2026, 1, 1), _utc(2026, 1, 4, 4, 0)),
+    ("0 4 * * 7", _utc(2026, 1, 1), _utc(2026, 1, 4, 4, 0)),
+    # Day and weekday both restricted: either matches
+    ("0 0 10 * 0", _utc(2026, 1, 1), _utc(2026, 1, 4, 0, 0)),
+    ("0 0 10 * 0", _utc(2026, 1, 5), _utc(2026, 1, 10, 0, 0)),
+    ("0 0 29 2 *", _utc(2026, 3, 1), _utc(2028, 2, 29, 0, 0)),
+    ("30 2 1 1 *", _utc(2026, 12, 31, 23, 0), _utc(2027, 1, 1, 2, 30)),
+])
+def test_cron_next_after(expr, after, expected):
+    assert Cron(expr).next_after(after) == expected
+
+
+def test_cron_next_after_converts_to_utc():
+    plus_two = timezone(timedelta(hours=2))
+    assert Cron("0 * * * *").next_after(datetime(2026, 1, 1, 5, 30, tzinfo=plus_two)) == _utc(2026, 1, 1, 4, 0)
+
+
+def test_cron_that_never_matches():
+    with pytest.raises(ValueError):
+        Cron("0 0 31 2 *").next_after(_utc(2026, 1, 1))
+
+
+# LEASES
+def _lock_row(db, name):
+    from app.models.scheduler import SchedulerLock
+
+    db.expire_all()
+    return db.get(SchedulerLock, name)
+
+
+def test_lease_contention(db):
+    a, b = LeaseLock("worker-a"), LeaseLock("worker-b")
+    a.ensure(["test.contention"])
+    b.ensure(["test.contention"])
+
+    now = datetime.now(timezone.utc)
+    assert a.acquire("test.contention", now, now + timedelta(minutes=5))
+    assert not b.acquire("test.contention", now, now + timedelta(minutes=5))
+    # The owner may take its own lease again (next slot)
+    assert a.acquire("test.contention", now, now + timedelta(minutes=10))
+    assert not b.renew("test.contention", now + timedelta(hours=1))
+    assert _lock_row(db, "test.contention").owner == "worker-a"
+
+    # Once it runs out the other worker gets it, and the first one cannot renew
+    later = now + timedelta(minutes=11)
+    assert b.acquire("test.contention", later, later + timedelta(minutes=5))
+    assert not a.renew("test.contention", later + timedelta(hours=1))
+    assert _lock_row(db, "test.contention").owner == "worker-b"
+
+
+def test_long_leader_run_keeps_its_lease(db, monkeypatch):
+    monkeypatch.setattr(scheduler_module.settings, "SCHEDULER_LEASE_SECONDS", 0.3)
+    runner = Scheduler()
+    other = LeaseLock("worker-other")
+    runner._leases.ensure(["test.long"])
+
+    now = datetime.now(timezone.utc)
+    slot_end = now + timedelta(seconds=0.2)
+    contended = []
+
+    def long_job():
+        # Well past the slot: only the renewals keep the lease
+        time.sleep(0.7)
+        at = datetime.now(timezone.utc)
+        contended.append(other.acquire("test.long", at, at + timedelta(minutes=1)))
+
+    job = Job("test.long", long_job, every=0.2, cron=None, leader=True)
+    job.running = True
+    runner._run(job, now, slot_end)
+    assert contended == [False]
+    assert job.runs == 1 and not job.running
+
+    # Finished: cut back to the slot's end, so the next slot is free
+    at = datetime.now(timezone.utc)
+    assert other.acquire("test.long", at, at + timedelta(minutes=1))
+
+
+def test_lost_lease_skips_the_run(db):
+    runner = Scheduler()
+    holder = LeaseLock("worker-holder")
+    holder.ensure(["test.taken"])
+    now = datetime.now(timezone.utc)
+    assert holder.acquire("test.taken", now, now + timedelta(minutes=5))
+
+    ran = threading.Event()
+    job = Job("test.taken", ran.set, every=60, cron=None, leader=True)
+    job.running = True
+    runner._run(job, now, now + timedelta(seconds=60))
+    assert not ran.is_set()
+    assert job.skipped == 1 and job.runs == 0 and not job.running
@@ -0,0 +1,20 @@
+"""
+Cold-start budget: heavy imports must stay out of `import app.main`
+(see app/core/startup_profile.py for the per-module breakdown).
+"""
+import statistics
+
+from app.core.config import settings
+from app.core.startup_profile import import_wall_ms
+
+RUNS = 5
+
+
+def test_import_time_within_budget():
+    samples = import_wall_ms(RUNS)
+    median = statistics.median(samples)
+    assert median <= settings.STARTUP_IMPORT_BUDGET_MS, (
+        f"import app.main: median {median:.0f} ms over {RUNS} runs, "
+        f"budget {settings.STARTUP_IMPORT_BUDGET_MS:.0f} ms; "
+        "run python -m app.core.startup_profile to see which modules"
+    )
@@ -0,0 +1,31 @@
+"""
+Admin user directory (app/routers/user_admin.py).
+"""
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/admin/users/pending", "/admin/users/all"])
+def test_listing_is_a_bare_list_by_default(client, admin, auth, make_user, path):
+    team = f"Listing {path}"
+    make_user(approved=False, team=team)
+    response = client.get(path, params={"team": team}, headers=auth(admin))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert isinstance(body, list) and len(body) == 1
+    assert body[0]["team"] == team
+
+
+@pytest.mark.parametrize("path", ["/admin/users/pending", "/admin/users/all"])
+def test_pages_are_opt_in(client, admin, auth, make_user, path):
+    team = f"Paging {path}"
+    ids = [make_user(approved=False, team=team).id for _ in range(3)]
+
+    first = client.get(path, params={"team": team, "paginate": 1, "limit": 2}, headers=auth(admin)).json()
+    assert [u["id"] for u in first["items"]] == ids[:2]
+    assert first["total"] == 3
+    assert first["next_cursor"] == ids[1]
+
+    # A cursor alone means pages too
+    rest = client.get(path, params={"team": team, "cursor": first["next_cursor"]}, headers=auth(admin)).json()
+    assert [u["id"] for u in rest["items"]] == ids[2:]
+    assert rest["next_cursor"] is None
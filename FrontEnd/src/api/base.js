@@ -1,8 +1,22 @@
 export const API_URL = "http://127.0.0.1:8000";
 import axios from "axios";
 
+// Read-your-writes: after a write the API returns X-Read-After; sending it
+// back keeps our next reads on the primary database, whichever server
+// worker answers them.
+let readAfter = null;
+
+axios.interceptors.request.use((config) => {
+  if (readAfter) config.headers["X-Read-After"] = readAfter;
+  return config;
+});
+
 axios.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const value = response.headers?.["x-read-after"];
+    if (value) readAfter = value;
+    return response;
+  },
   (error) => {
     if (error.response?.status === 403 && error.response?.data?.detail === "ACCOUNT_DEACTIVATED") {
       localStorage.clear();
@@ -259,11 +259,18 @@ const AddBill = () => {
   const handleCreateBill = async () => {
     if (billBundles.length === 0 || isReadOnly) return;
     try {
-      const items = billBundles.map((b) => ({
-        product_id: b.productId,
-        quantity: 1,
-        override_price: b.totalAfterDiscount,
-      }));
+      // Prices are set by the server; component discounts go up as one
+      // bundle discount and the shown price is checked against its quote
+      const items = billBundles.map((b) => {
+        const listPrice = b.components.reduce((s, c) => s + Number(c.quantity || 0) * Number(c.base_price), 0);
+        const shownPrice = Math.round(b.totalAfterDiscount * 100) / 100;
+        return {
+          product_id: b.productId,
+          quantity: 1,
+          discount_percent: listPrice > 0 ? (1 - shownPrice / listPrice) * 100 : 0,
+          expected_price: shownPrice,
+        };
+      });
       const res = await axios.post(
         `${API_URL}/billing`,
         { items, discount_amount: billDiscountAmount },
@@ -272,7 +279,8 @@ const AddBill = () => {
       generateExcel(res.data.bill_number);
       navigate("/view-bills");
     } catch (err) {
-      alert("Failed to generate order");
+      const detail = err.response?.data?.detail;
+      alert(detail?.message || (typeof detail === "string" ? detail : "Failed to generate order"));
     }
   };
 
@@ -39,6 +39,54 @@ const AdminDashboard = () => {
       );
   }, [token, role, navigate]);
 
+  // Live updates instead of polling: apply each event to the counters
+  useEffect(() => {
+    if (!token || role !== "admin") return;
+
+    const source = new EventSource(
+      `${API_URL}/admin/events/stream?token=${encodeURIComponent(token)}`
+    );
+    const bump = (changes) =>
+      setStats((prev) => {
+        const next = { ...prev };
+        for (const [key, delta] of Object.entries(changes)) {
+          next[key] = Math.max(0, (next[key] || 0) + delta);
+        }
+        return next;
+      });
+
+    source.addEventListener("user.signup", () =>
+      bump({ pending_users: 1, total_users: 1 })
+    );
+    source.addEventListener("user.approved", () => bump({ pending_users: -1 }));
+    // dashboard-stats counts every inactive user as pending
+    source.addEventListener("user.status", (e) =>
+      bump({ pending_users: JSON.parse(e.data).is_active ? -1 : 1 })
+    );
+    source.addEventListener("users.approved", (e) =>
+      bump({ pending_users: -JSON.parse(e.data).ids.length })
+    );
+    source.addEventListener("users.status", (e) => {
+      const { ids, is_active } = JSON.parse(e.data);
+      bump({ pending_users: is_active ? -ids.length : ids.length });
+    });
+    source.addEventListener("bill.created", () => bump({ bills_count: 1 }));
+    source.addEventListener("bill.deleted", () => bump({ bills_count: -1 }));
+    source.addEventListener("product.created", () => bump({ products_count: 1 }));
+    source.addEventListener("product.deleted", () => bump({ products_count: -1 }));
+    // Missed events: refetch the counters once
+    source.addEventListener("resync", () =>
+      axios
+        .get(`${API_URL}/admin/users/dashboard-stats`, {
+          headers: { Authorization: `Bearer ${token}` },
+        })
+        .then((res) => setStats(res.data))
+        .catch(() => {})
+    );
+
+    return () => source.close();
+  }, [token, role]);
+
   return (
     <div className="flex flex-col md:flex-row min-h-screen bg-[#0a0a0a]/80 text-white border-2 border-white/20 rounded-lg overflow-hidden mt-10 mx-2 md:mx-4">
       {/* 2. PASS STATE PROPS TO SIDEBAR */}
@@ -17,24 +17,55 @@ const PendingUsers = () => {
 
   const navigate = useNavigate();
 
-  const [allUsers, setAllUsers] = useState([]);
+  const [pendingUsers, setPendingUsers] = useState([]);
+  const [employees, setEmployees] = useState([]);
+  const [totalEmployees, setTotalEmployees] = useState(0);
+  const [teams, setTeams] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [sidebarOpen, setSidebarOpen] = useState(false);
   const toggleSidebar = () => setSidebarOpen(!sidebarOpen);
   const [searchQuery, setSearchQuery] = useState("");
+  const [debouncedQuery, setDebouncedQuery] = useState("");
   const [teamFilter, setTeamFilter] = useState("All Teams");
-  const [currentPage, setCurrentPage] = useState(1);
+  // Keyset pagination: cursor of every page visited so far (page 1 = null)
+  const [cursors, setCursors] = useState([null]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const currentPage = cursors.length;
   const recordsPerPage = 25;
 
   const token = localStorage.getItem("token");
+  const headers = { Authorization: `Bearer ${token}` };
 
-  const fetchData = async () => {
+  const fetchPending = async () => {
+    try {
+      const res = await axios.get(`${API_URL}/admin/users/pending`, {
+        params: { paginate: 1, limit: 200 },
+        headers,
+      });
+      setPendingUsers(res.data.items);
+    } catch (err) {
+      setError(err.response?.data?.detail || "Failed to fetch users");
+    }
+  };
+
+  const fetchEmployees = async () => {
+    setLoading(true);
     try {
       const res = await axios.get(`${API_URL}/admin/users/all`, {
-        headers: { Authorization: `Bearer ${token}` },
+        params: {
+          paginate: 1,
+          status: "approved",
+          limit: recordsPerPage,
+          q: debouncedQuery || undefined,
+          team: teamFilter === "All Teams" ? undefined : teamFilter,
+          cursor: cursors[cursors.length - 1] ?? undefined,
+        },
+        headers,
       });
-      setAllUsers(res.data);
+      setEmployees(res.data.items);
+      setTotalEmployees(res.data.total);
+      setNextCursor(res.data.next_cursor);
     } catch (err) {
       setError(err.response?.data?.detail || "Failed to fetch users");
     } finally {
@@ -42,57 +73,65 @@ const PendingUsers = () => {
     }
   };
 
+  const fetchData = () => {
+    fetchPending();
+    fetchEmployees();
+  };
+
   useEffect(() => {
     const role = localStorage.getItem("role");
     if (!token) return navigate("/login");
     if (role !== "admin") return navigate("/unauthorized");
-    fetchData();
+    fetchPending();
+    axios
+      .get(`${API_URL}/admin/users/teams`, { headers })
+      .then((res) => setTeams(res.data.map((t) => t.team)))
+      .catch(() => {});
   }, [token, navigate]);
 
+  // Search as you type, without a request per keystroke
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedQuery(searchQuery.trim()), 300);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
+
+  useEffect(() => {
+    setCursors([null]);
+  }, [debouncedQuery, teamFilter]);
+
+  useEffect(() => {
+    if (token) fetchEmployees();
+  }, [cursors]);
+
   const approveUser = async (id) => {
     try {
       await axios.put(`${API_URL}/admin/users/${id}/approve`, null, {
-        headers: { Authorization: `Bearer ${token}` },
+        headers,
       });
       fetchData();
-      setAllUsers(
-        allUsers.map((u) => (u.id === id ? { ...u, is_active: !currentStatus } : u))
-      );
     } catch (err) {
       alert("Approval failed");
     }
   };
 
-// Pending = Not active AND doesn't have an employee code yet (new signup)
-  const pendingUsers = allUsers.filter((u) => !u.is_active && !u.employee_code);
-
-  // Registered = Has an employee code (was once approved), regardless of current toggle status
-  const registeredEmployeesList = allUsers.filter((u) => u.employee_code);
-
-  const uniqueTeams = useMemo(() => {
-    const teams = allUsers.map((u) => u.team).filter(Boolean);
-    return ["All Teams", ...new Set(teams)];
-  }, [allUsers]);
+  const approveAll = async () => {
+    try {
+      const res = await axios.post(
+        `${API_URL}/admin/users/bulk-approve`,
+        { user_ids: pendingUsers.map((u) => u.id) },
+        { headers }
+      );
+      const failed = res.data.results.filter((r) => r.outcome === "not_found");
+      if (failed.length) alert(`${failed.length} user(s) no longer exist`);
+      fetchData();
+    } catch (err) {
+      alert("Approval failed");
+    }
+  };
 
-  const filteredEmployees = useMemo(() => {
-    return registeredEmployeesList.filter((u) => {
-      const matchesSearch =
-        `${u.first_name} ${u.last_name}`
-          .toLowerCase()
-          .includes(searchQuery.toLowerCase()) ||
-        u.employee_code?.toLowerCase().includes(searchQuery.toLowerCase());
-      const matchesTeam = teamFilter === "All Teams" || u.team === teamFilter;
-      return matchesSearch && matchesTeam;
-    });
-  }, [registeredEmployeesList, searchQuery, teamFilter]);
+  const uniqueTeams = useMemo(() => ["All Teams", ...teams], [teams]);
 
-  const indexOfLastRecord = currentPage * recordsPerPage;
-  const indexOfFirstRecord = indexOfLastRecord - recordsPerPage;
-  const currentRecords = filteredEmployees.slice(
-    indexOfFirstRecord,
-    indexOfLastRecord
-  );
-  const totalPages = Math.ceil(filteredEmployees.length / recordsPerPage);
+  const totalPages = Math.max(1, Math.ceil(totalEmployees / recordsPerPage));
 
   const toggleUserStatus = async (id, currentStatus) => {
     try {
@@ -102,7 +141,7 @@ const PendingUsers = () => {
         { is_active: !currentStatus },
         { headers: { Authorization: `Bearer ${token}` } }
       );
-      setAllUsers(prev => prev.map(u => u.id === id ? { ...u, is_active: !currentStatus } : u))
+      setEmployees(prev => prev.map(u => u.id === id ? { ...u, is_active: !currentStatus } : u))
     } catch (err) {
       alert("Status update failed");
     }
@@ -124,9 +163,19 @@ const PendingUsers = () => {
               Track and authorize users.
             </p>
 
-            <h2 className="text-lg md:text-xl font-bold mb-6 flex items-center gap-2 text-red-500 uppercase tracking-wider">
-              <FiUserPlus /> Pending Requests
-            </h2>
+            <div className="flex items-center justify-between gap-4 mb-6">
+              <h2 className="text-lg md:text-xl font-bold flex items-center gap-2 text-red-500 uppercase tracking-wider">
+                <FiUserPlus /> Pending Requests
+              </h2>
+              {pendingUsers.length > 1 && (
+                <button
+                  onClick={approveAll}
+                  className="bg-green-600 hover:bg-green-500 px-4 py-1.5 rounded-lg text-[10px] font-bold transition-all active:scale-95 whitespace-nowrap"
+                >
+                  APPROVE ALL ({pendingUsers.length}) ✔
+                </button>
+              )}
+            </div>
 
             {pendingUsers.length === 0 ? (
               <div className="bg-white/5 border border-white/10 p-6 rounded-2xl text-center text-gray-500 italic">
@@ -198,10 +247,7 @@ const PendingUsers = () => {
                     placeholder="Search Name or Code..."
                     className="bg-black/40 border border-white/10 rounded-xl px-4 py-3 pl-10 text-sm focus:border-green-500 outline-none transition-all w-full"
                     value={searchQuery}
-                    onChange={(e) => {
-                      setSearchQuery(e.target.value);
-                      setCurrentPage(1);
-                    }}
+                    onChange={(e) => setSearchQuery(e.target.value)}
                   />
                 </div>
 
@@ -210,10 +256,7 @@ const PendingUsers = () => {
                   <select
                     className="bg-black/40 border border-white/10 rounded-xl px-4 py-3 pl-10 text-sm focus:border-green-500 outline-none transition-all appearance-none cursor-pointer w-full"
                     value={teamFilter}
-                    onChange={(e) => {
-                      setTeamFilter(e.target.value);
-                      setCurrentPage(1);
-                    }}
+                    onChange={(e) => setTeamFilter(e.target.value)}
                   >
                     {uniqueTeams.map((team) => (
                       <option key={team} value={team} className="bg-[#0a0a0a]">
@@ -243,7 +286,7 @@ const PendingUsers = () => {
                     </tr>
                   </thead>
                   <tbody className="divide-y divide-white/5">
-                    {currentRecords.map((user) => (
+                    {employees.map((user) => (
                       <tr
                         key={user.id}
                         className="hover:bg-white/5 transition-colors"
@@ -296,14 +339,14 @@ const PendingUsers = () => {
                     <div className="flex gap-2">
                       <button
                         disabled={currentPage === 1}
-                        onClick={() => setCurrentPage((p) => p - 1)}
+                        onClick={() => setCursors((c) => c.slice(0, -1))}
                         className="p-2 rounded-lg bg-white/5 hover:bg-white/10 disabled:opacity-20 transition-all active:scale-90"
                       >
                         <FiChevronLeft />
                       </button>
                       <button
-                        disabled={currentPage === totalPages}
-                        onClick={() => setCurrentPage((p) => p + 1)}
+                        disabled={!nextCursor}
+                        onClick={() => setCursors((c) => [...c, nextCursor])}
                         className="flex items-center gap-2 px-4 py-2 rounded-lg bg-green-600/20 text-green-400 text-xs font-bold hover:bg-green-600 hover:text-white transition-all active:scale-95"
                       >
                         NEXT <FiChevronRight />
@@ -314,7 +357,7 @@ const PendingUsers = () => {
               </div>
             )}
 
-            {!loading && filteredEmployees.length === 0 && (
+            {!loading && employees.length === 0 && (
               <div className="text-center py-20 bg-white/5 rounded-2xl border border-dashed border-white/10 mt-4">
                 <p className="text-gray-500 text-sm">No employees found.</p>
               </div>
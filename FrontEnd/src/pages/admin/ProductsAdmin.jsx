@@ -39,7 +39,8 @@ const ProductsAdmin = () => {
     if (role !== "admin") return navigate("/unauthorized");
 
     axios
-      .get(`${API_URL}/products/`, { headers: authHeaders })
+      // Inactive bundles too, so they can still be edited and reactivated here
+      .get(`${API_URL}/products/`, { params: { active_only: false }, headers: authHeaders })
       .then((res) => setProducts(res.data || []))
       .catch(() => navigate("/login"));
   }, []);